@@ -12,17 +12,18 @@ from typing import Dict
 # Add src directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from core.players_data import players, points_system
-from core.analysis import calculate_player_score
+from core.players_data import get_player, load_dataset, points_system
+from core.aggregation import APP_STATS_COLUMNS, RADAR_METRICS, aggregate_player_stats, rank_scores
+from core.score_cache import LRUCache, fingerprint_players
 from handlers.csv_handler import (
     create_csv_template, 
     create_simple_template,
     create_sample_csv_content,
-    validate_csv_format, 
-    process_uploaded_data,
     create_data_info_panel,
     validate_and_preview_data,
-    diagnose_csv_issues
+    diagnose_csv_issues,
+    ingest_csv_stream,
+    MAX_UPLOAD_SIZE_BYTES,
 )
 from handlers.builtin_data_handler import load_verified_builtin_players
 
@@ -301,9 +302,15 @@ if data_source == "🔧 Create Sample Data":
     if 'sample_players' in st.session_state:
         custom_players = st.session_state['sample_players']
 
+@st.cache_resource
+def get_verified_players():
+    """Verified built-in players, loaded once per process so reruns reuse one object."""
+    return load_verified_builtin_players()
+
+
 if data_source == "✅ Verified Built-in Dataset":
     st.sidebar.markdown("#### ✅ Verified Repository Dataset")
-    verified_players = load_verified_builtin_players()
+    verified_players = get_verified_players()
     if verified_players:
         custom_players = verified_players
         st.sidebar.success(f"✅ Loaded {len(verified_players)} verified players from built-in dataset.")
@@ -353,8 +360,14 @@ if data_source == "📊 Upload Custom CSV":
     if st.sidebar.button("📖 Data Format Guide"):
         st.session_state.show_guide = True
         
+    # Large files skip the in-memory preview and are only streamed in chunks below
+    if uploaded_file is not None and uploaded_file.size > MAX_UPLOAD_SIZE_BYTES:
+        st.sidebar.info(
+            f"📦 Large file ({uploaded_file.size / (1024 * 1024):.1f} MB): "
+            "it will be validated and loaded in chunks without a preview."
+        )
     # Show preview if file is uploaded
-    if uploaded_file is not None:
+    elif uploaded_file is not None:
         success, preview_df, message = validate_and_preview_data(uploaded_file)
         
         if success:
@@ -405,87 +418,71 @@ if data_source == "📊 Upload Custom CSV":
 st.sidebar.markdown("---")
 
 # Calculate scores
+@st.cache_resource
+def get_default_players():
+    """Default columnar dataset, memory-mapped from the compiled cache once per process."""
+    return load_dataset()
+
+
+@st.cache_resource
+def get_score_cache() -> LRUCache:
+    """Process-wide score cache shared across reruns and sessions."""
+    return LRUCache(max_entries=8)
+
+
 def calculate_all_scores(custom_players=None):
-    player_scores = {}
-    detailed_stats = {}
-    
+    """
+    Return (scores_df, stats_df), reusing cached results for identical data.
+
+    Results are keyed on a content fingerprint of the player data and the
+    points system, so default, verified, uploaded and sample data each get
+    their own entry and widget-only reruns skip rescoring entirely.
+    """
     # Use custom players if provided, otherwise use default
-    data_source = custom_players if custom_players else players
-    
-    for player_name, data in data_source.items():
-        score = calculate_player_score(data, points_system)
-        player_scores[player_name] = score
-        
-        # Calculate detailed stats
-        stats = {
-            'Career Goals': data.get('career_goals', 0),
-            'La Liga Titles': data.get('total_la_liga_titles', 0),
-            'Champions League Titles': data.get('total_champions_league_titles', 0),
-            'Ballon d\'Or Wins': data.get('career_awards', []).count('Ballon d\'Or Win'),
-            'Total Score': score
-        }
-        
-        # Count season achievements
-        golden_boots = 0
-        seasons_20_goals = 0
-        seasons_10_assists = 0
-        cup_final_wins = 0
-        cl_top_scorer = 0
-        
-        for season in data.get('seasons', []):
-            if 'La Liga Golden Boot' in season.get('awards', []):
-                golden_boots += 1
-            if season.get('goals', 0) >= 20:
-                seasons_20_goals += 1
-            if season.get('assists', 0) >= 10:
-                seasons_10_assists += 1
-            if season.get('cup_final_winner', False):
-                cup_final_wins += 1
-            cl_achievements = season.get('cl_achievements', [])
-            cl_top_scorer += cl_achievements.count('CL Top Scorer')
-        
-        stats.update({
-            'La Liga Golden Boots': golden_boots,
-            '20+ Goal Seasons': seasons_20_goals,
-            '10+ Assist Seasons': seasons_10_assists,
-            'Cup Final Wins': cup_final_wins,
-            'CL Top Scorer Awards': cl_top_scorer
-        })
-        
-        detailed_stats[player_name] = stats
-    
-    # Create DataFrames
-    scores_df = pd.DataFrame(list(player_scores.items()), columns=['Player', 'Score'])
-    scores_df = scores_df.sort_values(by='Score', ascending=False).reset_index(drop=True)
-    
-    stats_df = pd.DataFrame.from_dict(detailed_stats, orient='index')
-    stats_df.reset_index(inplace=True)
-    stats_df.rename(columns={'index': 'Player'}, inplace=True)
-    
+    data_source = custom_players if custom_players else get_default_players()
+
+    key = fingerprint_players(data_source, points_system)
+    scores_df, stats_df = get_score_cache().get_or_compute(
+        key, lambda: _compute_all_scores(data_source)
+    )
+    # Hand out copies so callers can't mutate the cached frames
+    return scores_df.copy(), stats_df.copy()
+
+
+def _compute_all_scores(data_source):
+    stats_df = aggregate_player_stats(data_source, points_system)[APP_STATS_COLUMNS]
+    scores_df = rank_scores(stats_df)
     return scores_df, stats_df
 
 # Process data based on source
 if uploaded_file is not None:
-    try:
-        # Read uploaded CSV
-        uploaded_df = pd.read_csv(uploaded_file)
-        
-        # Validate format
-        is_valid, message = validate_csv_format(uploaded_df)
-        
-        if is_valid:
-            # Process the uploaded data
-            custom_players = process_uploaded_data(uploaded_df)
-            st.sidebar.success(f"✅ Successfully loaded {len(custom_players)} players from CSV!")
-            
-            # Option to download results later
-            st.sidebar.markdown("📥 **Analysis results will be available for download below**")
-        else:
-            st.sidebar.error(f"❌ Invalid CSV format: {message}")
-            st.sidebar.info("Please download and use the template format.")
-    
-    except Exception as e:
-        st.sidebar.error(f"❌ Error reading CSV: {str(e)}")
+    # Reruns reuse the ingested upload (and the same players object, so the
+    # score cache's fingerprint memo hits) until a different file is uploaded
+    upload_key = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+    cached_upload = st.session_state.get('uploaded_players')
+    if cached_upload is not None and cached_upload[0] == upload_key:
+        is_valid, streamed_players, message = cached_upload[1]
+    else:
+        # Stream the upload in chunks: validate and convert each chunk as it is read
+        progress_bar = st.sidebar.progress(0.0, text="Loading CSV...")
+
+        def _report_progress(rows_done, bytes_read, total_bytes):
+            fraction = min(bytes_read / total_bytes, 1.0) if total_bytes else 0.0
+            progress_bar.progress(fraction, text=f"Loaded {rows_done:,} rows...")
+
+        is_valid, streamed_players, message = ingest_csv_stream(uploaded_file, progress=_report_progress)
+        progress_bar.empty()
+        st.session_state['uploaded_players'] = (upload_key, (is_valid, streamed_players, message))
+
+    if is_valid:
+        custom_players = streamed_players
+        st.sidebar.success(f"✅ Successfully loaded {len(custom_players)} players from CSV!")
+
+        # Option to download results later
+        st.sidebar.markdown("📥 **Analysis results will be available for download below**")
+    else:
+        st.sidebar.error(f"❌ Invalid CSV format: {message}")
+        st.sidebar.info("Please download and use the template format.")
         custom_players = None
 
 # Get data (use custom data if available)
@@ -556,9 +553,7 @@ elif chart_type == "Radar Chart":
     
     if selected_players:
         # Prepare radar chart data
-        radar_metrics = ['Career Goals', 'La Liga Titles', 'Champions League Titles',
-                        'Ballon d\'Or Wins', 'La Liga Golden Boots', '20+ Goal Seasons',
-                        '10+ Assist Seasons', 'Cup Final Wins', 'CL Top Scorer Awards']
+        radar_metrics = RADAR_METRICS
         
         filtered_stats = stats_df[stats_df['Player'].isin(selected_players)]
         
@@ -691,8 +686,8 @@ elif chart_type == "Season Analysis":
     season_player = st.selectbox("Select a player for season analysis:", scores_df['Player'].tolist())
     
     if season_player:
-        player_data_source = custom_players if custom_players else players
-        player_data = player_data_source[season_player]
+        # Built-in data: read just this player's line from the NDJSON copy
+        player_data = custom_players[season_player] if custom_players else get_player(season_player)
         seasons_data = []
         
         for season in player_data['seasons']:
@@ -14,82 +14,17 @@ from pathlib import Path
 # Add src directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from core.players_data import players, points_system
-from core.analysis import calculate_player_score
+from core.players_data import load_dataset, points_system
+from core.aggregation import STATIC_STATS_COLUMNS, aggregate_player_stats, rank_scores
 
 def calculate_all_scores():
     """Calculate scores for all players with accurate data"""
-    player_scores = {}
-    detailed_stats = {}
-    
-    for player_name, data in players.items():
-        score = calculate_player_score(data, points_system)
-        player_scores[player_name] = score
-        
-        # Calculate detailed stats with proper aggregation
-        stats = {
-            'Career Goals': data.get('career_goals', 0),
-            'La Liga Titles': data.get('total_la_liga_titles', 0),
-            'Champions League Titles': data.get('total_champions_league_titles', 0),
-            'Ballon d\'Or Wins': data.get('career_awards', []).count('Ballon d\'Or Win'),
-            'Total Score': score
-        }
-        
-        # Count season achievements properly
-        golden_boots = 0
-        seasons_20_goals = 0
-        seasons_10_assists = 0
-        cup_final_wins = 0
-        cl_top_scorer = 0
-        la_liga_best_player = 0
-        total_season_goals = 0
-        total_season_assists = 0
-        
-        for season in data.get('seasons', []):
-            # Count awards
-            if 'La Liga Golden Boot' in season.get('awards', []):
-                golden_boots += 1
-            if 'La Liga Best Player Award' in season.get('awards', []):
-                la_liga_best_player += 1
-                
-            # Count achievements
-            if season.get('goals', 0) >= 20:
-                seasons_20_goals += 1
-            if season.get('assists', 0) >= 10:
-                seasons_10_assists += 1
-            if season.get('cup_final_winner', False):
-                cup_final_wins += 1
-                
-            # Count CL achievements
-            cl_achievements = season.get('cl_achievements', [])
-            cl_top_scorer += cl_achievements.count('CL Top Scorer')
-            
-            # Sum totals
-            total_season_goals += season.get('goals', 0)
-            total_season_assists += season.get('assists', 0)
-        
-        stats.update({
-            'La Liga Golden Boots': golden_boots,
-            'La Liga Best Player Awards': la_liga_best_player,
-            '20+ Goal Seasons': seasons_20_goals,
-            '10+ Assist Seasons': seasons_10_assists,
-            'Cup Final Wins': cup_final_wins,
-            'CL Top Scorer Awards': cl_top_scorer,
-            'Season Goals (Sample)': total_season_goals,
-            'Season Assists (Sample)': total_season_assists
-        })
-        
-        detailed_stats[player_name] = stats
-    
-    # Create DataFrames
-    scores_df = pd.DataFrame(list(player_scores.items()), columns=['Player', 'Score'])
-    scores_df = scores_df.sort_values(by='Score', ascending=False).reset_index(drop=True)
+    # One vectorised pass over the columnar dataset (served from the compiled cache)
+    stats_df = aggregate_player_stats(load_dataset(), points_system)[STATIC_STATS_COLUMNS]
+
+    scores_df = rank_scores(stats_df)
     scores_df['Rank'] = scores_df.index + 1
     
-    stats_df = pd.DataFrame.from_dict(detailed_stats, orient='index')
-    stats_df.reset_index(inplace=True)
-    stats_df.rename(columns={'index': 'Player'}, inplace=True)
-    
     return scores_df, stats_df
 
 def create_bar_chart(scores_df):
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmarks — Measures load-path costs for the app and static site.
+
+Each measurement runs in a fresh Python interpreter so module caches and
+already-imported packages don't hide cold-start costs.
+
+Usage:
+    python scripts/benchmark.py import              # Import time of core.players_data
+    python scripts/benchmark.py import --eager      # ...plus materialising `players` (old behaviour)
+    python scripts/benchmark.py import --repeat 10
+    python scripts/benchmark.py formats             # Size + load time of each dataset file format
+    python scripts/benchmark.py formats --scale 20  # ...with the player list replicated 20x
+
+For a per-module breakdown, Python's own profiler also works:
+    python -X importtime -c "import sys; sys.path.insert(0, 'src'); import core.players_data"
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+DATASET_JSON = PROJECT_ROOT / "data" / "processed" / "la_liga_all_players.json"
+
+
+def _time_in_subprocess(code: str) -> float:
+    """Run ``code`` in a fresh interpreter; it must print elapsed seconds on its last line."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<40} median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms   ({len(samples)} runs)"
+    )
+
+
+def bench_import(repeat: int, eager: bool) -> None:
+    """
+    Time `import core.players_data` from a clean interpreter, optionally forcing the players load.
+
+    Nothing is imported before the clock starts, so heavy dependencies the module
+    pulls in (pandas, pyarrow) count towards its import time.
+    """
+    touch = "len(m.players)" if eager else "None"
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(SRC_DIR)!r})\n"
+        "t = time.perf_counter()\n"
+        "import core.players_data as m\n"
+        f"{touch}\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    label = "import core.players_data" + (" + players" if eager else "")
+    _report(label, [_time_in_subprocess(code) for _ in range(repeat)])
+
+
+def _time_call(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_formats(repeat: int, scale: int) -> None:
+    """Compare file size, write time and load time of each dataset file format."""
+    sys.path.insert(0, str(SRC_DIR))
+    from core.dataset_io import DATASET_FORMATS, read_dataset_json, write_dataset_json
+
+    document = read_dataset_json(DATASET_JSON)
+    players = {
+        (name if copy == 0 else f"{name} #{copy}"): profile
+        for copy in range(scale)
+        for name, profile in document["players"].items()
+    }
+    metadata = {**document["metadata"], "total_players": len(players)}
+    print(f"{len(players)} players (x{scale})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for fmt in DATASET_FORMATS:
+            path = Path(tmp) / f"players.{fmt}"
+            write = _time_call(lambda: write_dataset_json(path, metadata, players, fmt=fmt), repeat)
+            load = _time_call(lambda: read_dataset_json(path), repeat)
+            size = path.stat().st_size
+            baseline = baseline or (size, statistics.median(load))
+            print(
+                f"{fmt:<8} {size / 1024:10.1f} KiB ({size / baseline[0]:5.1%})   "
+                f"write {statistics.median(write) * 1000:8.1f} ms   "
+                f"load {statistics.median(load) * 1000:8.1f} ms ({statistics.median(load) / baseline[1]:5.1%})"
+            )
+
+        # The pre-streaming writer, for reference
+        path = Path(tmp) / "players.dump"
+        def dump():
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"metadata": metadata, "players": players}, f, indent=2, ensure_ascii=False)
+        _report("json.dump(indent=2) write", _time_call(dump, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset load paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="Import time of core.players_data")
+    p_import.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters")
+    p_import.add_argument(
+        "--eager", action="store_true",
+        help="Also materialise `players` (equivalent to the old load-on-import behaviour)",
+    )
+
+    p_formats = sub.add_parser("formats", help="Size and load time of each dataset file format")
+    p_formats.add_argument("--repeat", type=int, default=5, help="Timed runs per format")
+    p_formats.add_argument("--scale", type=int, default=1, help="Replicate the player list N times")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        bench_import(args.repeat, args.eager)
+    elif args.command == "formats":
+        bench_formats(args.repeat, args.scale)
+
+
+if __name__ == "__main__":
+    main()
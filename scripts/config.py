@@ -18,6 +18,7 @@ RAW_FBREF_DIR = DATA_DIR / "raw" / "fbref"
 RAW_WIKI_DIR = DATA_DIR / "raw" / "wikipedia"
 PROCESSED_DIR = DATA_DIR / "processed"
 FINAL_JSON = PROCESSED_DIR / "la_liga_all_players.json"
+CACHE_DIR = DATA_DIR / "cache"  # Rebuildable pipeline intermediates (git-ignored)
 
 # Ensure dirs exist
 for d in [RAW_FBREF_DIR, RAW_WIKI_DIR, PROCESSED_DIR]:
@@ -66,9 +67,14 @@ WIKI_URLS = {
 }
 
 # ──────────────────────── Scraper settings ────────────────────────
-REQUEST_DELAY_SECONDS = 4        # Delay between FBref page loads
+REQUEST_DELAY_SECONDS = 4        # Back-off after a failed FBref page load (x attempt number)
+FBREF_REQUESTS_PER_MINUTE = 10   # Page-load budget shared by all FBref fetch workers
+FBREF_FETCH_WORKERS = 2          # Concurrent FBref fetch workers (one browser each)
+FBREF_DRIVER_MAX_PAGES = 25      # Restart a browser after this many page loads
 SELENIUM_PAGE_TIMEOUT = 30       # Max seconds to wait for page load
 MAX_RETRIES = 3
+WIKI_MAX_CONCURRENT_PER_HOST = 5  # Wikipedia pages fetched at once (one per award category)
+WIKI_MIN_REQUEST_INTERVAL = 0.1   # Seconds between Wikipedia request starts
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
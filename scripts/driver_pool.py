@@ -0,0 +1,150 @@
+"""
+A small pool of reusable browser drivers (or any costly client objects).
+
+Starting headless Chrome takes seconds, so the FBref scraper keeps a few
+drivers alive and lends them out one page at a time:
+
+  - drivers are created lazily, up to ``size`` of them;
+  - an idle driver is health-checked before it is handed out again, and a dead
+    one is replaced;
+  - a driver is retired after ``max_pages`` page loads (long-lived Chrome
+    sessions grow in memory and get flagged more often) or when a page load
+    failed and the driver no longer passes its health check.
+
+A retry after a failed page therefore reuses a live driver instead of paying
+for a new browser, and only a crashed one is restarted.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """
+    Thread-safe pool of drivers.
+
+    Args:
+        factory: Creates a new driver
+        size: Maximum number of drivers alive at once
+        max_pages: Retire a driver after this many checkouts (None: never)
+        is_alive: Health check, called before an idle driver is reused and after
+                  a failed checkout; defaults to "always alive"
+        quit: Shuts a driver down; defaults to calling ``driver.quit()``
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 2,
+        max_pages: Optional[int] = None,
+        is_alive: Optional[Callable[[Any], bool]] = None,
+        quit: Optional[Callable[[Any], None]] = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.is_alive = is_alive or (lambda driver: True)
+        self._quit = quit or (lambda driver: driver.quit())
+        self._idle: List[Any] = []
+        self._pages: Dict[int, int] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.created = 0
+        self.retired = 0
+
+    def _alive(self, driver: Any) -> bool:
+        try:
+            return bool(self.is_alive(driver))
+        except Exception:
+            return False
+
+    def _retire(self, driver: Any, why: str) -> None:
+        log.info(f"Retiring driver ({why})")
+        self._pages.pop(id(driver), None)
+        self.retired += 1
+        try:
+            self._quit(driver)
+        except Exception as e:
+            log.warning(f"  Error while quitting driver: {e}")
+
+    def _checkout(self) -> Any:
+        while True:
+            with self._cond:
+                while not self._closed and not self._idle and self._live >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if not self._idle:
+                    self._live += 1
+                    break
+                driver = self._idle.pop()
+            if self._alive(driver):
+                return driver
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            self._retire(driver, "failed health check")
+
+        # Start a new driver outside the lock; it can take seconds
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._pages[id(driver)] = 0
+            self.created += 1
+        return driver
+
+    def _checkin(self, driver: Any, failed: bool) -> None:
+        pages = self._pages.get(id(driver), 0) + 1
+        self._pages[id(driver)] = pages
+        why = None
+        if self.max_pages is not None and pages >= self.max_pages:
+            why = f"{pages} pages served"
+        elif failed and not self._alive(driver):
+            why = "crashed"
+        with self._cond:
+            if why is None and not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+            self._live -= 1
+            self._cond.notify()
+        self._retire(driver, why or "pool closed")
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver for one page load."""
+        driver = self._checkout()
+        try:
+            yield driver
+        except BaseException:
+            self._checkin(driver, failed=True)
+            raise
+        self._checkin(driver, failed=False)
+
+    def close(self) -> None:
+        """Quit every idle driver; drivers still checked out are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._retire(driver, "pool closed")
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,216 @@
+"""
+Single-pass extractor for FBref ``stats_table`` player tables.
+
+The generic path (``pd.read_html(header=[0, 1])``, flatten the MultiIndex, then
+``_clean_player_stats``) builds every cell as a Python object several times and
+filters the header rows FBref repeats every 25 players only after parsing.
+This module walks the table once with lxml instead:
+
+  - column names come from the ``thead`` (over-header group + label, flattened
+    the way the generic path does it) and are standardised with the same rules;
+  - body cells are placed by their ``data-stat`` attribute, so a row with a
+    missing cell can't shift the columns after it;
+  - repeated header rows (``class="thead"``) and rows without a player are
+    skipped while walking, not filtered afterwards;
+  - each column is typed once at the end: the key counts become ints (0 for
+    blanks), other numeric columns ints/floats, everything else strings.
+
+The result is the cleaned schema ``scrape_fbref._clean_player_stats`` produces.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+from lxml import etree
+
+# Columns the cleaned schema stores as ints (non-numeric values become 0)
+INT_COLUMNS = ("goals", "assists", "matches_played", "starts", "minutes", "age")
+
+_SKIP_ROW_CLASSES = {"thead", "over_header", "spacer"}
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")  # as pandas.read_html collapses cell text
+_RE_NUMBER = re.compile(r"-?\d{1,3}(,\d{3})+(\.\d+)?")
+
+
+def standard_column_names(columns) -> Dict[str, str]:
+    """Rename map from FBref's flattened column names to the cleaned schema's."""
+    rename_map = {}
+    for col in columns:
+        cl = col.lower()
+        if cl == "player":
+            rename_map[col] = "player"
+        elif cl == "squad":
+            rename_map[col] = "team"
+        elif cl == "pos":
+            rename_map[col] = "position"
+        elif cl == "nation":
+            rename_map[col] = "nationality"
+        elif cl in ("age",):
+            rename_map[col] = "age"
+        elif "mp" in cl and "match" not in cl:
+            rename_map[col] = "matches_played"
+        elif cl in ("starts",):
+            rename_map[col] = "starts"
+        elif cl in ("min",):
+            rename_map[col] = "minutes"
+        elif cl.endswith("gls") or cl == "goals" or cl == "performance_gls":
+            if "gls" in cl and "performance" in cl.lower():
+                rename_map[col] = "goals"
+            elif cl in ("gls", "goals"):
+                rename_map[col] = "goals"
+        elif cl.endswith("ast") or cl == "assists" or cl == "performance_ast":
+            # Like goals: skip the per-90 rate ("Per 90 Minutes_Ast")
+            if "ast" in cl and "performance" in cl.lower():
+                rename_map[col] = "assists"
+            elif cl in ("ast", "assists"):
+                rename_map[col] = "assists"
+
+    # If there is no goals/assists column under a standard name, take the first
+    # column that looks like one
+    renamed = [rename_map.get(col, col) for col in columns]
+    for target, needles in (("goals", ("Gls", "gls")), ("assists", ("Ast", "ast"))):
+        if target not in renamed:
+            for i, col in enumerate(columns):
+                if any(needle in renamed[i] for needle in needles):
+                    rename_map[col] = renamed[i] = target
+                    break
+    return rename_map
+
+
+def _classes(element) -> set:
+    return set((element.get("class") or "").split())
+
+
+def _text(cell) -> str:
+    text = "".join(cell.itertext()) if len(cell) else cell.text
+    if not text:
+        return ""
+    if "  " in text or not text.isprintable():
+        text = _RE_WHITESPACE.sub(" ", text)
+    return text.strip()
+
+
+def _parse(markup: str):
+    # Plain etree elements: lxml.html's per-element class lookup costs more than the parse
+    return etree.fromstring(markup, etree.HTMLParser())
+
+
+def _header_names(thead) -> Optional[List[tuple]]:
+    """(data-stat, label, flattened name) per column, or None if the header isn't FBref-shaped."""
+    rows = thead.findall("tr")
+    labels_row = next((tr for tr in reversed(rows) if "over_header" not in _classes(tr)), None)
+    if labels_row is None:
+        return None
+    labels = [(cell.get("data-stat") or "", _text(cell)) for cell in labels_row if cell.tag in ("th", "td")]
+    if not labels:
+        return None
+
+    groups = [""] * len(labels)
+    over = next((tr for tr in rows if "over_header" in _classes(tr)), None)
+    if over is not None:
+        groups = []
+        for cell in over:
+            if cell.tag in ("th", "td"):
+                groups.extend([_text(cell)] * int(cell.get("colspan") or 1))
+        if len(groups) != len(labels):
+            return None
+
+    names, seen = [], {}
+    for (stat, label), group in zip(labels, groups):
+        name = f"{group}_{label}" if group else label
+        # Duplicate names get pandas-style ".1" suffixes
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append((stat, label, name))
+    return names
+
+
+def _find_table(root):
+    if root is None:
+        return None
+    if root.tag == "table":
+        return root
+    tables = root.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " stats_table ")]')
+    if not tables:
+        tables = root.xpath("//table")
+    return tables[0] if tables else None
+
+
+def stats_table_html(page_html: str) -> Optional[str]:
+    """The HTML of the first ``stats_table`` on a page, or None."""
+    table = _find_table(_parse(page_html))
+    if table is None or "stats_table" not in _classes(table):
+        return None
+    return etree.tostring(table, encoding="unicode", with_tail=False)
+
+
+def _typed(values, as_int: bool) -> pd.Series:
+    if as_int:
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").fillna(0).astype(int)
+    numbers = [v.replace(",", "") if v is not None and _RE_NUMBER.fullmatch(v) else v for v in values]
+    try:
+        return pd.Series(pd.to_numeric(numbers))
+    except (ValueError, TypeError):
+        return pd.Series(numbers)
+
+
+def extract_player_stats(table_html: str | None, season: str) -> Optional[pd.DataFrame]:
+    """
+    Cleaned player stats from a FBref stats table in one pass.
+
+    Args:
+        table_html: The table's HTML (or a whole page containing it)
+        season: Season string added as the ``season`` column
+
+    Returns:
+        The cleaned DataFrame (possibly empty), or None if the markup isn't a
+        FBref-style table with a ``thead`` and ``tbody`` — callers should then
+        fall back to the generic parser.
+    """
+    if not table_html:
+        return pd.DataFrame()
+    table = _find_table(_parse(table_html))
+    if table is None:
+        return None
+    thead, tbody = table.find("thead"), table.find("tbody")
+    if thead is None or tbody is None:
+        return None
+    header = _header_names(thead)
+    if header is None:
+        return None
+
+    raw_names = [name for _, _, name in header]
+    rename_map = standard_column_names(raw_names)
+    names = [rename_map.get(name, name) for name in raw_names]
+    if "player" not in names or len(set(names)) != len(names):
+        return None
+    player_idx = names.index("player")
+    first_label = header[0][1]
+    position_of = {stat: i for i, (stat, _, _) in enumerate(header) if stat}
+
+    width = len(names)
+    rows = []
+    for tr in tbody.iterchildren("tr"):
+        if tr.get("class") and _classes(tr) & _SKIP_ROW_CLASSES:
+            continue
+        row = [None] * width
+        for pos, cell in enumerate(tr.iterchildren("th", "td")):
+            i = position_of.get(cell.get("data-stat"), pos)
+            if i < width:
+                row[i] = _text(cell) or None
+        # Unmarked repeated header rows, and rows without a player (totals, spacers)
+        if row[0] == first_label or not row[player_idx] or row[player_idx] == "Player":
+            continue
+        rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+    columns = zip(*rows)
+    df = pd.DataFrame({
+        name: _typed(values, name in INT_COLUMNS) for name, values in zip(names, columns)
+    })
+    df["season"] = season
+    return df
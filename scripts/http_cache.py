@@ -0,0 +1,146 @@
+"""
+Persistent HTTP response cache for the scrapers.
+
+Every fetched page is kept under the cache directory, keyed by the sha256 of its
+URL:
+
+    <key>.html.gz    response body, gzip-compressed
+    <key>.json       URL, ETag, Last-Modified, encoding and fetch time
+
+A later fetch of the same URL is a conditional request (If-None-Match /
+If-Modified-Since); a 304 reply reuses the stored body, so refreshing unchanged
+pages costs a round trip but no download. In offline mode the network is never
+touched: pages are served from the cache only, which lets the parsers be re-run
+(and tested) in milliseconds.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+
+from pipeline_cache import atomic_write
+
+log = logging.getLogger(__name__)
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been fetched."""
+
+
+class CachedResponse:
+    """
+    A page body plus where it came from.
+
+    ``source`` is 'fetched' (downloaded), 'not-modified' (304, stored body
+    reused) or 'offline' (served from the cache without a request).
+    """
+
+    def __init__(self, url: str, text: str, source: str):
+        self.url = url
+        self.text = text
+        self.source = source
+
+
+class HttpCache:
+    """
+    On-disk cache of GET responses with conditional revalidation.
+
+    Args:
+        cache_dir: Where bodies and metadata are stored
+        offline: Serve only from the cache; raise OfflineCacheMiss for unknown URLs
+    """
+
+    def __init__(self, cache_dir: Path, offline: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.offline = offline
+
+    def _paths(self, url: str) -> tuple:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.html.gz", self.cache_dir / f"{key}.json"
+
+    def lookup(self, url: str) -> Optional[tuple]:
+        """(metadata, body bytes) for ``url``, or None if it isn't cached (or is damaged)."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, ValueError, EOFError):
+            return None
+        if meta.get("url") != url or len(body) != meta.get("size"):
+            return None
+        return meta, body
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str], encoding: Optional[str]) -> Dict[str, Any]:
+        """Save a 200 response; the body is written before the metadata that points at it."""
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "encoding": encoding or "utf-8",
+            "size": len(body),
+            "fetched_at": time.time(),
+        }
+        atomic_write(body_path, lambda f: f.write(gzip.compress(body, compresslevel=6)))
+        self._save_meta(meta_path, meta)
+        return meta
+
+    def _save_meta(self, meta_path: Path, meta: Dict[str, Any]) -> None:
+        atomic_write(meta_path, lambda f: json.dump(meta, f, indent=2), mode="w")
+
+    @staticmethod
+    def _decode(body: bytes, meta: Mapping[str, Any]) -> str:
+        return body.decode(meta.get("encoding") or "utf-8", errors="replace")
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        session: Any = requests,
+        timeout: float = 30,
+    ) -> CachedResponse:
+        """
+        GET ``url`` through the cache.
+
+        Args:
+            url: Page to fetch
+            headers: Extra request headers (e.g. User-Agent)
+            session: Anything with a requests-style ``get`` (a Session for keep-alive)
+            timeout: Request timeout in seconds
+
+        Raises:
+            OfflineCacheMiss: In offline mode, for a URL that isn't cached
+            requests.HTTPError: For error responses
+        """
+        cached = self.lookup(url)
+        if self.offline:
+            if cached is None:
+                raise OfflineCacheMiss(f"{url} is not in the HTTP cache ({self.cache_dir})")
+            return CachedResponse(url, self._decode(cached[1], cached[0]), "offline")
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            meta = cached[0]
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = session.get(url, headers=request_headers, timeout=timeout)
+        if resp.status_code == 304 and cached is not None:
+            meta, body = cached
+            meta["fetched_at"] = time.time()
+            self._save_meta(self._paths(url)[1], meta)
+            log.info(f"  {url} not modified; using cached copy")
+            return CachedResponse(url, self._decode(body, meta), "not-modified")
+
+        resp.raise_for_status()
+        meta = self.store(url, resp.content, resp.headers, resp.encoding)
+        return CachedResponse(url, self._decode(resp.content, meta), "fetched")
@@ -25,18 +25,27 @@ HOW TO USE:
 
 Output:
     data/raw/fbref/<season>.csv — cleaned and standardised CSVs
+
+Files are cleaned in a process pool and replaced atomically (temp file +
+rename), so a crash can't leave a half-written CSV behind. A manifest in
+data/cache/fbref_import/ records every file's size, mtime and hash after it
+was cleaned; files it still matches are skipped without being read, and a file
+that is already in the cleaned schema is recorded but not rewritten.
 """
 
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
 from pathlib import Path
 
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from config import RAW_FBREF_DIR
+from config import CACHE_DIR, RAW_FBREF_DIR
+from pipeline_cache import atomic_write, file_signature, load_manifest, save_manifest
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,8 +54,11 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+IMPORT_CACHE_DIR = CACHE_DIR / "fbref_import"
+IMPORT_MANIFEST_SCHEMA_VERSION = 1  # Bump when the cleaning rules change, to re-clean every file
+
 
-def process_fbref_csv(filepath: Path) -> pd.DataFrame:
+def process_fbref_csv(filepath: Path, raw: str | None = None) -> pd.DataFrame:
     """
     Process a raw FBref "Get table as CSV" export.
 
@@ -54,10 +66,13 @@ def process_fbref_csv(filepath: Path) -> pd.DataFrame:
       - A header comment line starting with "Player Standard Stats"
       - Multi-level column headers (two header rows)
       - Rows that repeat the header mid-table (for section breaks)
+
+    ``raw`` is the file's text if the caller has already read it.
     """
     # Read the file
-    with open(filepath, encoding="utf-8") as f:
-        raw = f.read()
+    if raw is None:
+        with open(filepath, encoding="utf-8") as f:
+            raw = f.read()
 
     # Remove the first line if it's a comment
     lines = raw.strip().split("\n")
@@ -141,45 +156,137 @@ def process_fbref_csv(filepath: Path) -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Process manually downloaded FBref CSV exports"
-    )
-    parser.add_argument(
-        "--dir", type=str, default=str(RAW_FBREF_DIR),
-        help=f"Directory containing FBref CSV files (default: {RAW_FBREF_DIR})"
-    )
-    args = parser.parse_args()
+def _clean_file(filepath: Path) -> int:
+    """
+    Clean one export in place; returns its number of player rows (0 if none).
+
+    The cleaned CSV replaces the file atomically, and only if it differs from
+    what is already there.
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+    df = process_fbref_csv(filepath, data.decode("utf-8"))
+    if df.empty:
+        return 0
+    cleaned = df.to_csv(index=False).encode("utf-8")
+    if cleaned != data:
+        atomic_write(filepath, lambda f: f.write(cleaned))
+    return len(df)
+
+
+def import_csv_dir(
+    csv_dir: Path = RAW_FBREF_DIR,
+    workers: int | None = None,
+    cache_dir: Path = IMPORT_CACHE_DIR,
+    force: bool = False,
+) -> int:
+    """
+    Clean every FBref export in ``csv_dir`` in place.
+
+    Files recorded in the manifest as cleaned and unchanged since are skipped;
+    the rest are cleaned by a pool of ``workers`` processes (default: one per
+    CPU, at most one per file; 0 or 1 cleans them in this process).
+
+    Args:
+        csv_dir: Directory of season CSVs
+        workers: Worker processes for the files that need cleaning
+        cache_dir: Where the import manifest is kept
+        force: Re-clean every file, ignoring the manifest
 
-    csv_dir = Path(args.dir)
+    Returns:
+        Total number of player rows across all files
+
+    Raises:
+        FileNotFoundError: if the directory holds no CSV files
+    """
     csv_files = sorted(csv_dir.glob("*.csv"))
     csv_files = [f for f in csv_files if not f.name.startswith("_")]
-
     if not csv_files:
-        log.error(f"No CSV files found in {csv_dir}/")
-        log.info("")
-        log.info("=== HOW TO GET DATA FROM FBREF ===")
-        log.info("1. Open: https://fbref.com/en/comps/12/stats/La-Liga-Stats")
-        log.info("2. Find 'Standard Stats' table")
-        log.info("3. Click 'Share & Export' → 'Get table as CSV'")
-        log.info("4. Save the CSV as data/raw/fbref/<season>.csv")
-        log.info("   e.g., data/raw/fbref/2023-2024.csv")
-        log.info("5. Re-run this script")
-        sys.exit(1)
+        raise FileNotFoundError(f"No CSV files found in {csv_dir}/")
+
+    manifest_path = cache_dir / "manifest.json"
+    recorded = load_manifest(manifest_path, IMPORT_MANIFEST_SCHEMA_VERSION).get("files", {})
+    keys = {f: str(f.resolve()) for f in csv_files}
 
     total_players = 0
+    files = {}
+    todo = []
     for f in csv_files:
-        df = process_fbref_csv(f)
-        if df.empty:
+        previous = None if force else recorded.get(keys[f])
+        if previous and file_signature(f, previous["signature"]) == previous["signature"]:
+            files[keys[f]] = previous
+            total_players += previous["rows"]
+        else:
+            todo.append(f)
+    if len(todo) < len(csv_files):
+        log.info(f"  {len(csv_files) - len(todo)} file(s) already cleaned and unchanged")
+
+    if workers is None:
+        workers = min(len(todo), os.cpu_count() or 1)
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_clean_file, todo))
+    else:
+        counts = [_clean_file(f) for f in todo]
+
+    for f, players in zip(todo, counts):
+        if not players:
+            # Not recorded, so it is looked at again next run
             log.warning(f"  {f.name}: no valid data")
             continue
-
-        # Overwrite the file with the cleaned version
-        df.to_csv(f, index=False)
-        total_players += len(df)
-        log.info(f"  {f.name}: {len(df)} players processed")
+        files[keys[f]] = {"signature": file_signature(f), "rows": players}
+        total_players += players
+        log.info(f"  {f.name}: {players} players processed")
+
+    # Keep entries for other directories; drop files that left this one
+    for key, entry in recorded.items():
+        if key not in files and Path(key).parent != csv_dir.resolve():
+            files[key] = entry
+    try:
+        save_manifest(manifest_path, {"files": files}, IMPORT_MANIFEST_SCHEMA_VERSION)
+    except OSError as e:
+        log.warning(f"  Could not write import manifest to {cache_dir}: {e}")
 
     log.info(f"Done — {total_players} total player records across {len(csv_files)} seasons")
+    return total_players
+
+
+def log_export_instructions() -> None:
+    """Explain how to export the FBref tables by hand."""
+    log.info("")
+    log.info("=== HOW TO GET DATA FROM FBREF ===")
+    log.info("1. Open: https://fbref.com/en/comps/12/stats/La-Liga-Stats")
+    log.info("2. Find 'Standard Stats' table")
+    log.info("3. Click 'Share & Export' → 'Get table as CSV'")
+    log.info("4. Save the CSV as data/raw/fbref/<season>.csv")
+    log.info("   e.g., data/raw/fbref/2023-2024.csv")
+    log.info("5. Re-run this script")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Process manually downloaded FBref CSV exports"
+    )
+    parser.add_argument(
+        "--dir", type=str, default=str(RAW_FBREF_DIR),
+        help=f"Directory containing FBref CSV files (default: {RAW_FBREF_DIR})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for cleaning (default: one per CPU; 1 cleans serially)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-clean every file, even those recorded as already cleaned"
+    )
+    args = parser.parse_args()
+
+    try:
+        import_csv_dir(Path(args.dir), workers=args.workers, force=args.force)
+    except FileNotFoundError as e:
+        log.error(str(e))
+        log_export_instructions()
+        sys.exit(1)
 
 
 if __name__ == "__main__":
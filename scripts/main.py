@@ -2,27 +2,113 @@
 """
 Data Pipeline Orchestrator — Runs the full data collection and merge pipeline.
 
+Stages run in this process as a small DAG (see pipeline_runner.py):
+
+    wikipedia ────┐
+                  ├──▶ merge
+    fbref_import ─┘
+
+The Wikipedia scrape and the FBref import are independent and run concurrently,
+and the scraped award records are handed to the merge in memory. A per-stage
+wall time and peak memory table is printed at the end.
+
+Each stage has a content-addressed cache key (see stage_cache.py): a hash of its
+input files, its code (the stage's script and every project module it imports)
+and the config it reads (WIKI_URLS for the scrape, AWARD_MAP and
+FORWARD_POSITIONS for the merge). A rerun recomputes only the
+stages whose key changed, restores outputs that were deleted from the cache,
+and skips the rest; --explain prints why each stage ran or was skipped.
+
 Usage:
     python scripts/main.py              # Run full pipeline
     python scripts/main.py --skip-fbref  # Skip FBref (requires manual CSV export)
+    python scripts/main.py --force       # Re-run every stage, re-scraping Wikipedia
+    python scripts/main.py --explain     # Say why each stage ran or was skipped
 """
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from config import (
+    AWARD_MAP,
+    CACHE_DIR,
+    FINAL_JSON,
+    FORWARD_POSITIONS,
+    PROJECT_ROOT,
+    RAW_FBREF_DIR,
+    RAW_WIKI_DIR,
+    WIKI_URLS,
+)
+from import_fbref_csv import import_csv_dir, log_export_instructions
+from merge_data import merge
+from pipeline_runner import Stage, run_pipeline
+from scrape_wikipedia import SCRAPERS, scrape_categories
+from stage_cache import StageCache, python_sources
+from src.core.dataset_io import ndjson_paths
+
 SCRIPTS_DIR = Path(__file__).resolve().parent
+STAMP_DIR = CACHE_DIR / "pipeline"
+STAGE_CACHE_DIR = CACHE_DIR / "stages"
+
+
+def _fbref_csvs() -> list:
+    return [f for f in sorted(RAW_FBREF_DIR.glob("*.csv")) if not f.name.startswith("_")]
+
+
+def _wiki_jsons() -> list:
+    return [RAW_WIKI_DIR / f"{category}.json" for category in SCRAPERS]
+
+
+def _import_fbref(upstream: dict) -> int:
+    total = import_csv_dir(RAW_FBREF_DIR)
+    # The import rewrites its inputs in place, so a stamp file marks when it last ran
+    STAMP_DIR.mkdir(parents=True, exist_ok=True)
+    (STAMP_DIR / "fbref_import.stamp").touch()
+    return total
+
 
+def _merge_outputs() -> list:
+    return [FINAL_JSON, *ndjson_paths(FINAL_JSON), FINAL_JSON.parent / "players_summary.csv"]
 
-def run_script(name: str, args: list = None) -> None:
-    """Run a pipeline script and raise on failure."""
-    cmd = [sys.executable, str(SCRIPTS_DIR / name)] + (args or [])
-    print(f"\n{'='*60}")
-    print(f"Running: {' '.join(cmd)}")
-    print(f"{'='*60}")
-    subprocess.run(cmd, check=True)
-    print(f"✅ {name} completed successfully")
+
+def _scrape_wikipedia(upstream: dict, force: bool) -> dict:
+    # Saved pages are reused unless the scraper or its URLs changed since they were fetched
+    refetch = force or bool(upstream.changed & {"code", "config"})
+    return scrape_categories(force=refetch)
+
+
+def build_stages(force: bool = False, skip_fbref: bool = False) -> list:
+    """The pipeline's stages; ``force`` re-scrapes Wikipedia even when cached."""
+    stages = [
+        Stage(
+            "wikipedia",
+            lambda upstream: _scrape_wikipedia(upstream, force),
+            outputs=_wiki_jsons,
+            code=python_sources(SCRIPTS_DIR / "scrape_wikipedia.py", project_root=PROJECT_ROOT),
+            config={"WIKI_URLS": WIKI_URLS},
+        ),
+    ]
+    if not skip_fbref:
+        stages.append(Stage(
+            "fbref_import",
+            _import_fbref,
+            inputs=_fbref_csvs,
+            outputs=lambda: [STAMP_DIR / "fbref_import.stamp"],
+            code=python_sources(SCRIPTS_DIR / "import_fbref_csv.py", project_root=PROJECT_ROOT),
+        ))
+    stages.append(Stage(
+        "merge",
+        # Award records come straight from the scrape when it ran this time
+        lambda upstream: merge(wiki_data=upstream.get("wikipedia"))[0],
+        deps=[s.name for s in stages],
+        inputs=lambda: _fbref_csvs() + _wiki_jsons(),
+        outputs=_merge_outputs,
+        code=python_sources(SCRIPTS_DIR / "merge_data.py", project_root=PROJECT_ROOT),
+        config={"AWARD_MAP": AWARD_MAP, "FORWARD_POSITIONS": sorted(FORWARD_POSITIONS)},
+    ))
+    return stages
 
 
 def main():
@@ -35,26 +121,47 @@ def main():
         "--force", action="store_true",
         help="Force re-scrape even if cached data exists",
     )
+    parser.add_argument(
+        "--explain", action="store_true",
+        help="Explain why each stage ran, was restored from cache or was skipped",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=4,
+        help="Maximum number of stages running at once (default: 4)",
+    )
     args = parser.parse_args()
 
     print("⚽ La Liga Forwards Analysis — Data Pipeline")
     print("=" * 60)
 
-    # Step 1: Scrape Wikipedia awards
-    wiki_args = ["--force"] if args.force else []
-    run_script("scrape_wikipedia.py", wiki_args)
-
-    # Step 2: Process FBref data
     if args.skip_fbref:
         print("\n⏭️  Skipping FBref scraping (--skip-fbref)")
         print("   Make sure CSVs exist in data/raw/fbref/")
-    else:
-        run_script("import_fbref_csv.py")
 
-    # Step 3: Merge all data sources
-    run_script("merge_data.py")
+    report = run_pipeline(
+        build_stages(force=args.force, skip_fbref=args.skip_fbref),
+        force=args.force,
+        max_workers=args.jobs,
+        cache=StageCache(STAGE_CACHE_DIR, PROJECT_ROOT),
+    )
 
     print("\n" + "=" * 60)
+    print(report.format_table())
+    print("=" * 60)
+    if args.explain:
+        print(report.format_explanation())
+        print("=" * 60)
+
+    fbref = report.by_name.get("fbref_import")
+    if fbref is not None and isinstance(fbref.error, FileNotFoundError):
+        log_export_instructions()
+    if not report.ok:
+        print("❌ Pipeline failed")
+        sys.exit(1)
+    if report.by_name["merge"].status == "ran" and report.by_name["merge"].value is None:
+        print("❌ No data found! Add FBref CSVs or scrape Wikipedia first.")
+        sys.exit(1)
+
     print("🏆 Pipeline complete!")
     print("   Dataset: data/processed/la_liga_all_players.json")
     print("   Summary: data/processed/players_summary.csv")
@@ -12,6 +12,14 @@ Produces:
 Usage:
     python scripts/merge_data.py
     python scripts/merge_data.py --forwards-only     # Filter to forward positions
+    python scripts/merge_data.py --no-cache          # Re-parse every FBref CSV
+    python scripts/merge_data.py --incremental       # Rebuild only players whose inputs changed
+    python scripts/merge_data.py --format gzip       # Compact, gzip-compressed output
+    python scripts/merge_data.py --sqlite            # Also build the SQLite query database
+
+Parsed FBref seasons are cached in data/cache/fbref/ and only re-parsed when
+their CSV changes. Each run records its inputs and the added/changed/removed
+players in data/cache/merge/ (state.json, delta.json).
 """
 
 import argparse
@@ -20,12 +28,15 @@ import logging
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import (
+    CACHE_DIR,
     RAW_FBREF_DIR,
     RAW_WIKI_DIR,
     PROCESSED_DIR,
@@ -34,6 +45,17 @@ from config import (
     FORWARD_POSITIONS,
     season_display,
 )
+from pipeline_cache import atomic_write, file_signature, load_manifest, save_manifest
+from src.core.dataset_io import (
+    DATASET_FORMATS,
+    ndjson_paths,
+    read_dataset_json,
+    write_dataset_json,
+    write_dataset_ndjson,
+)
+from src.core.dataset import PlayerDataset
+from src.core.dataset_tables import HAS_PYARROW, fresh_tables_dir, write_arrow_tables
+from src.core.query import build_database, database_is_current, database_path_for
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,36 +67,131 @@ log = logging.getLogger(__name__)
 
 # ──────────────────────── Load raw data ────────────────────────
 
-def load_fbref_data() -> pd.DataFrame:
-    """Load and concatenate all FBref season CSVs."""
-    csv_files = sorted(RAW_FBREF_DIR.glob("*.csv"))
+FBREF_CACHE_DIR = CACHE_DIR / "fbref"
+FBREF_CACHE_SCHEMA_VERSION = 1
+FBREF_LOAD_WORKERS = 8
+
+# Explicit dtypes for the standardised FBref columns (see import_fbref_csv.py);
+# any other columns are left to pandas' inference
+FBREF_DTYPES = {
+    "player": str,
+    "team": str,
+    "position": str,
+    "nationality": str,
+    "season": str,
+    "goals": "Int64",
+    "assists": "Int64",
+    "matches_played": "Int64",
+    "starts": "Int64",
+    "minutes": "Int64",
+}
+
+
+def _read_fbref_csv(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=FBREF_DTYPES)
+
+
+def _read_fbref_files(paths: list, workers: int) -> dict:
+    """Parse FBref CSVs concurrently; returns file name -> frame (None if unreadable)."""
+    def read(path: Path):
+        try:
+            return _read_fbref_csv(path)
+        except Exception as e:
+            log.warning(f"  Failed to read {path.name}: {e}")
+            return None
+
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+        frames = list(pool.map(read, paths))
+    for path, df in zip(paths, frames):
+        if df is not None:
+            log.info(f"  Loaded {len(df)} rows from {path.name}")
+    return {path.name: df for path, df in zip(paths, frames)}
+
+
+def load_fbref_data(
+    fbref_dir: Path = RAW_FBREF_DIR,
+    cache_dir: Path = FBREF_CACHE_DIR,
+    workers: int = FBREF_LOAD_WORKERS,
+    use_cache: bool = True,
+    keep_source: bool = False,
+) -> pd.DataFrame:
+    """
+    Load and concatenate all FBref season CSVs.
+
+    Files are parsed concurrently with explicit dtypes. With ``use_cache``, a
+    manifest of per-file content hashes and the concatenated frame are kept in
+    ``cache_dir``; only seasons whose files were added or changed are re-parsed
+    and spliced into the cached frame. With ``keep_source``, a ``_source`` column
+    holds the CSV file name of every row.
+    """
+    csv_files = [f for f in sorted(fbref_dir.glob("*.csv")) if not f.name.startswith("_")]
     if not csv_files:
         log.warning("No FBref CSV files found in data/raw/fbref/")
         return pd.DataFrame()
 
-    dfs = []
-    for f in csv_files:
-        if f.name.startswith("_"):
-            continue
+    manifest_path = cache_dir / "manifest.json"
+    combined_path = cache_dir / "combined.pkl"
+    manifest = load_manifest(manifest_path, FBREF_CACHE_SCHEMA_VERSION) if use_cache else {}
+    previous = manifest.get("files", {})
+
+    signatures = {f.name: file_signature(f, previous.get(f.name)) for f in csv_files}
+    # Compare content only: a touched but identical file keeps its cached rows
+    changed = [
+        f for f in csv_files
+        if previous.get(f.name, {}).get("sha256") != signatures[f.name]["sha256"]
+    ]
+
+    cached = None
+    if use_cache and previous and combined_path.exists():
         try:
-            df = pd.read_csv(f)
-            dfs.append(df)
-            log.info(f"  Loaded {len(df)} rows from {f.name}")
+            cached = pd.read_pickle(combined_path)
         except Exception as e:
-            log.warning(f"  Failed to read {f.name}: {e}")
-
-    if not dfs:
+            log.warning(f"  Ignoring unreadable FBref cache {combined_path}: {e}")
+    if cached is None:
+        changed, previous = csv_files, {}
+
+    log.info(f"  {len(csv_files) - len(changed)} season file(s) unchanged, {len(changed)} to parse")
+    parsed = _read_fbref_files(changed, workers)
+
+    # Keep cached rows for unchanged files, then splice in the re-parsed ones in file order
+    pieces = {}
+    if cached is not None:
+        unchanged = set(signatures) - set(parsed)
+        for name, rows in cached.groupby("_source", sort=False):
+            if name in unchanged:
+                pieces[name] = rows
+    for name, df in parsed.items():
+        if df is not None:
+            pieces[name] = df.assign(_source=name)
+
+    frames = [pieces[f.name] for f in csv_files if f.name in pieces]
+    if not frames:
         return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
 
-    combined = pd.concat(dfs, ignore_index=True)
-    log.info(f"Total FBref records: {len(combined)} across {len(dfs)} seasons")
+    if use_cache:
+        # Unreadable files stay out of the manifest so they are retried next run
+        readable = {name: sig for name, sig in signatures.items() if name in pieces}
+        try:
+            # Drop the manifest first so a failed write can never pair it with a stale frame
+            manifest_path.unlink(missing_ok=True)
+            atomic_write(combined_path, combined.to_pickle)
+            save_manifest(manifest_path, {"files": readable}, FBREF_CACHE_SCHEMA_VERSION)
+        except OSError as e:
+            log.warning(f"  Could not write FBref cache to {cache_dir}: {e}")
+
+    if not keep_source:
+        combined = combined.drop(columns="_source")
+    log.info(f"Total FBref records: {len(combined)} across {len(frames)} seasons")
     return combined
 
 
-def load_wikipedia_data() -> dict:
+def load_wikipedia_data(wiki_dir: Path = RAW_WIKI_DIR) -> dict:
     """Load all Wikipedia award JSON files."""
     data = {}
-    for f in RAW_WIKI_DIR.glob("*.json"):
+    for f in sorted(wiki_dir.glob("*.json")):
         try:
             with open(f, encoding="utf-8") as fh:
                 data[f.stem] = json.load(fh)
@@ -97,28 +214,47 @@ def _normalize_name(name: str) -> str:
     return name
 
 
+# Common team-name normalisations
+TEAM_NAME_REPLACEMENTS = {
+    "FC Barcelona": "Barcelona",
+    "Real Madrid CF": "Real Madrid",
+    "Atlético Madrid": "Atlético Madrid",
+    "Club Atlético de Madrid": "Atlético Madrid",
+    "Athletic Bilbao": "Athletic Club",
+    "Athletic Club de Bilbao": "Athletic Club",
+    "Sevilla FC": "Sevilla",
+    "Valencia CF": "Valencia",
+    "Real Sociedad": "Real Sociedad",
+    "Villarreal CF": "Villarreal",
+    "Real Betis": "Real Betis",
+    "RCD Espanyol": "Espanyol",
+    "Deportivo de La Coruña": "Deportivo La Coruña",
+}
+
+
 def _normalize_team(team: str) -> str:
     """Normalise team names for matching."""
     if not team or not isinstance(team, str):
         return ""
     team = team.strip()
-    # Common normalisations
-    replacements = {
-        "FC Barcelona": "Barcelona",
-        "Real Madrid CF": "Real Madrid",
-        "Atlético Madrid": "Atlético Madrid",
-        "Club Atlético de Madrid": "Atlético Madrid",
-        "Athletic Bilbao": "Athletic Club",
-        "Athletic Club de Bilbao": "Athletic Club",
-        "Sevilla FC": "Sevilla",
-        "Valencia CF": "Valencia",
-        "Real Sociedad": "Real Sociedad",
-        "Villarreal CF": "Villarreal",
-        "Real Betis": "Real Betis",
-        "RCD Espanyol": "Espanyol",
-        "Deportivo de La Coruña": "Deportivo La Coruña",
-    }
-    return replacements.get(team, team)
+    return TEAM_NAME_REPLACEMENTS.get(team, team)
+
+
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column as strings, the way str() renders each cell (missing values become 'nan')."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col].astype(str).fillna("nan").astype(object)
+
+
+def _group_lists(codes: np.ndarray, values: list, num_groups: int) -> list:
+    """Split ``values`` into one list per group code, keeping row order within each group."""
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=num_groups), out=offsets[1:])
+    ordered = [values[i] for i in order.tolist()]
+    offsets = offsets.tolist()
+    return [ordered[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
 
 
 def _season_to_year(season_str: str) -> int:
@@ -127,8 +263,160 @@ def _season_to_year(season_str: str) -> int:
     return int(match.group(1)) if match else 0
 
 
+_RE_SEASON = re.compile(r"(\d{4})(?:\s*[-–/]\s*(\d{4}|\d{2})(?!\d))?")
+
+
+def _season_key(season_str: str) -> tuple:
+    """
+    Canonical season key: (start year, end year).
+
+    FBref ('2023/2024') and Wikipedia ('2023–24', '1999–2000') spellings of a
+    season reduce to the same pair. A single-year season ('1929', played within
+    one calendar year) keys as (1929, 1929), so it never matches 1929–30.
+    """
+    match = _RE_SEASON.search(season_str)
+    if not match:
+        return (0, 0)
+    start, end = int(match.group(1)), match.group(2)
+    if end is None:
+        return (start, start)
+    if len(end) == 2:
+        end = start // 100 * 100 + int(end)
+        return (start, end if end > start else end + 100)
+    return (start, int(end))
+
+
+# ──────────────────────── Title attribution ────────────────────────
+
+def _title_index(records: list, team_field: str) -> pd.MultiIndex:
+    """(season start, season end, team) hash index of title winners from Wikipedia records."""
+    keys = set()
+    for record in records:
+        season = record.get("season", "")
+        team = _normalize_team(record.get(team_field, ""))
+        if season and team:
+            keys.add((*_season_key(season), team))
+    return pd.MultiIndex.from_tuples(sorted(keys), names=["season_start", "season_end", "team"])
+
+
+def _season_frame(players: dict) -> pd.DataFrame:
+    """One row per player season: owning player, season start/end years and normalised team."""
+    rows = [
+        (name, *_season_key(s.get("season", "")), _normalize_team(s.get("team", "")))
+        for name, p in players.items()
+        for s in p["seasons"]
+    ]
+    return pd.DataFrame(rows, columns=["player", "season_start", "season_end", "team"])
+
+
+def _attribute_titles(
+    players: dict,
+    season_frame: pd.DataFrame,
+    winners: pd.MultiIndex,
+    achievement: str,
+) -> dict:
+    """
+    Tag every season whose (season start, season end, team) is in ``winners`` with ``achievement``.
+
+    ``season_frame`` rows must line up with the players' season lists (see
+    _season_frame). Returns the number of title-winning seasons per player.
+    """
+    won = pd.MultiIndex.from_frame(season_frame[["season_start", "season_end", "team"]]).isin(winners)
+    seasons = [s for p in players.values() for s in p["seasons"]]
+    for i in won.nonzero()[0]:
+        if achievement not in seasons[i]["team_achievements"]:
+            seasons[i]["team_achievements"].append(achievement)
+
+    counts = season_frame.loc[won, "player"].value_counts()
+    return {name: int(counts.get(name, 0)) for name in players}
+
+
 # ──────────────────────── Build player profiles ────────────────────────
 
+def _fbref_profiles(fbref_df: pd.DataFrame) -> dict:
+    """
+    Per-player season histories from the concatenated FBref frame.
+
+    Every profile field is one group-by over player codes (in order of first
+    appearance): summed career goals, ordered unique teams, first position and
+    nationality, and the most common team (ties go to the team seen first).
+    Season records are materialised in a single pass and split per player.
+    """
+    names = _text_column(fbref_df, "player").str.strip()
+    valid = (names != "") & (names != "nan")
+    df = fbref_df.loc[valid]
+    codes, unique_names = pd.factorize(names[valid], sort=False)
+    num_players = len(unique_names)
+
+    def numbers(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        return df[col].astype(np.int64).to_numpy()
+
+    teams = _text_column(df, "team").str.strip().replace(TEAM_NAME_REPLACEMENTS)
+    positions = _text_column(df, "position")
+    nationalities = _text_column(df, "nationality")
+    goals = numbers("goals")
+
+    career_goals = np.bincount(codes, weights=goals, minlength=num_players).astype(np.int64)
+
+    def first_per_player(values: pd.Series, keep: pd.Series) -> dict:
+        firsts = pd.DataFrame({"code": codes[keep.to_numpy()], "value": values[keep]})
+        firsts = firsts.drop_duplicates("code")
+        return dict(zip(firsts["code"].tolist(), firsts["value"].tolist()))
+
+    position = first_per_player(positions, positions != "")
+    nationality = first_per_player(nationalities, (nationalities != "") & (nationalities != "nan"))
+
+    has_team = (teams != "").to_numpy()
+    team_rows = pd.DataFrame({"code": codes[has_team], "team": teams[has_team].to_numpy()})
+    team_counts = team_rows.groupby(["code", "team"], sort=False).size().reset_index(name="n")
+    unique_teams = _group_lists(
+        team_counts["code"].to_numpy(), team_counts["team"].tolist(), num_players
+    )
+    primary = team_counts.sort_values(["code", "n"], ascending=[True, False], kind="stable")
+    primary_team = dict(zip(*(primary.drop_duplicates("code")[col].tolist() for col in ("code", "team"))))
+
+    season_records = [
+        {
+            "season": season.replace("-", "/"),
+            "team": team,
+            "goals": g,
+            "assists": a,
+            "matches_played": m,
+            "minutes": mins,
+            "awards": [],
+            "team_achievements": [],
+            "cup_final_winner": False,
+            "cl_achievements": [],
+        }
+        for season, team, g, a, m, mins in zip(
+            _text_column(df, "season").tolist(),
+            teams.tolist(),
+            goals.tolist(),
+            numbers("assists").tolist(),
+            numbers("matches_played").tolist(),
+            numbers("minutes").tolist(),
+        )
+    ]
+    seasons = _group_lists(codes, season_records, num_players)
+
+    return {
+        name: {
+            "career_goals": int(career_goals[i]),
+            "team": primary_team.get(i, ""),
+            "teams": unique_teams[i],
+            "position": position.get(i, ""),
+            "nationality": nationality.get(i, ""),
+            "seasons": seasons[i],
+            "career_awards": [],
+            "total_la_liga_titles": 0,
+            "total_champions_league_titles": 0,
+        }
+        for i, name in enumerate(unique_names.tolist())
+    }
+
+
 def build_player_profiles(
     fbref_df: pd.DataFrame,
     wiki_data: dict,
@@ -153,59 +441,7 @@ def build_player_profiles(
     })
 
     if not fbref_df.empty:
-        # Ensure required columns exist
-        for col in ["player", "team", "season", "goals", "assists"]:
-            if col not in fbref_df.columns:
-                fbref_df[col] = "" if col in ["player", "team", "season"] else 0
-
-        for _, row in fbref_df.iterrows():
-            name = str(row.get("player", "")).strip()
-            if not name or name == "nan":
-                continue
-
-            team = _normalize_team(str(row.get("team", "")))
-            position = str(row.get("position", ""))
-            season = str(row.get("season", ""))
-            goals = int(row.get("goals", 0))
-            assists = int(row.get("assists", 0))
-            matches = int(row.get("matches_played", 0))
-            minutes = int(row.get("minutes", 0))
-
-            p = players[name]
-            p["career_goals"] += goals
-
-            if team and team not in p["teams"]:
-                p["teams"].append(team)
-            if not p["team"]:
-                p["team"] = team
-
-            if position and not p["position"]:
-                p["position"] = position
-
-            nationality = str(row.get("nationality", ""))
-            if nationality and nationality != "nan" and not p["nationality"]:
-                p["nationality"] = nationality
-
-            p["seasons"].append({
-                "season": season.replace("-", "/"),
-                "team": team,
-                "goals": goals,
-                "assists": assists,
-                "matches_played": matches,
-                "minutes": minutes,
-                "awards": [],
-                "team_achievements": [],
-                "cup_final_winner": False,
-                "cl_achievements": [],
-            })
-
-        # Set primary team to the one with most seasons
-        for name, p in players.items():
-            if p["teams"]:
-                from collections import Counter
-                team_counts = Counter(s["team"] for s in p["seasons"] if s.get("team"))
-                if team_counts:
-                    p["team"] = team_counts.most_common(1)[0][0]
+        players.update(_fbref_profiles(fbref_df))
 
     # ── Step 2: Enrich with Wikipedia awards ──
     name_lookup = {_normalize_name(name): name for name in players}
@@ -289,47 +525,19 @@ def build_player_profiles(
                         s["awards"].append("La Liga Best Player Award")
                     break
 
-    # La Liga titles — map champion team to all players of that team in that season
-    la_liga_champions = {}
-    for record in wiki_data.get("la_liga_titles", []):
-        season = record.get("season", "")
-        champion = _normalize_team(record.get("champion", ""))
-        if season and champion:
-            la_liga_champions[season] = champion
+    # La Liga titles / Champions League winners — map the winning team to all
+    # players of that team in that season with one hash join per competition
+    season_frame = _season_frame(players)
 
+    la_liga_champions = _title_index(wiki_data.get("la_liga_titles", []), "champion")
+    title_counts = _attribute_titles(players, season_frame, la_liga_champions, "La Liga Title")
     for name, p in players.items():
-        title_count = 0
-        for s in p["seasons"]:
-            season_str_val = s.get("season", "")
-            team = _normalize_team(s.get("team", ""))
-            for champ_season, champ_team in la_liga_champions.items():
-                if (champ_season in season_str_val or season_str_val in champ_season) and team == champ_team:
-                    if "La Liga Title" not in s["team_achievements"]:
-                        s["team_achievements"].append("La Liga Title")
-                    title_count += 1
-                    break
-        p["total_la_liga_titles"] = title_count
-
-    # Champions League winners — map winner team to players
-    cl_winners = {}
-    for record in wiki_data.get("champions_league", []):
-        season = record.get("season", "")
-        winner = _normalize_team(record.get("winner", ""))
-        if season and winner:
-            cl_winners[season] = winner
+        p["total_la_liga_titles"] = title_counts[name]
 
+    cl_winners = _title_index(wiki_data.get("champions_league", []), "winner")
+    cl_counts = _attribute_titles(players, season_frame, cl_winners, "Champions League Win")
     for name, p in players.items():
-        cl_count = 0
-        for s in p["seasons"]:
-            season_str_val = s.get("season", "")
-            team = _normalize_team(s.get("team", ""))
-            for cl_season, cl_team in cl_winners.items():
-                if (cl_season in season_str_val or season_str_val in cl_season) and team == cl_team:
-                    if "Champions League Win" not in s["team_achievements"]:
-                        s["team_achievements"].append("Champions League Win")
-                    cl_count += 1
-                    break
-        p["total_champions_league_titles"] = cl_count
+        p["total_champions_league_titles"] = cl_counts[name]
 
     # ── Step 3: Filter to forwards if requested ──
     if forwards_only:
@@ -346,32 +554,186 @@ def build_player_profiles(
     return dict(players)
 
 
+# ──────────────────────── Incremental merge ────────────────────────
+#
+# Profiles only interact through the normalised player name: FBref rows, award
+# records (Pichichi, Ballon d'Or, Best Player) and the name lookup all stay within
+# one normalised-name group, while titles come from a per-season join against the
+# full winners tables. An incremental run therefore rebuilds only the groups whose
+# FBref rows or award records changed, reusing build_player_profiles() on that
+# subset, and falls back to a full rebuild when the winners tables change.
+
+MERGE_STATE_PATH = CACHE_DIR / "merge" / "state.json"
+MERGE_STATE_SCHEMA_VERSION = 1
+AWARD_SOURCES = ("pichichi", "ballon_dor", "la_liga_best_player")
+TITLE_SOURCES = ("la_liga_titles", "champions_league")
+
+
+def _fbref_name_groups(fbref_df: pd.DataFrame) -> pd.Series:
+    """Normalised-name group of every FBref row ('' for rows without a usable name)."""
+    if fbref_df.empty:
+        return pd.Series([], dtype=object)
+    names = _text_column(fbref_df, "player").str.strip()
+    groups = names.map({n: _normalize_name(n) for n in names.unique()})
+    return groups.where((names != "") & (names != "nan"), "")
+
+
+def _fbref_groups_by_file(fbref_df: pd.DataFrame) -> dict:
+    """CSV file name -> sorted normalised-name groups it contributes rows to."""
+    if fbref_df.empty:
+        return {}
+    frame = pd.DataFrame({"file": fbref_df["_source"], "group": _fbref_name_groups(fbref_df)})
+    frame = frame[frame["group"] != ""].drop_duplicates()
+    return {file: sorted(rows["group"]) for file, rows in frame.groupby("file")}
+
+
+def _award_records_by_group(wiki_data: dict) -> dict:
+    """(source, normalised name) -> that group's award records, in file order."""
+    grouped = defaultdict(list)
+    for source in AWARD_SOURCES:
+        for record in wiki_data.get(source, []):
+            grouped[f"{source}:{_normalize_name(record.get('player', ''))}"].append(record)
+    return dict(grouped)
+
+
+def _affected_groups(
+    state: dict,
+    fbref_signatures: dict,
+    fbref_groups: dict,
+    wiki_data: dict,
+    forwards_only: bool,
+) -> set | None:
+    """
+    Normalised-name groups whose inputs changed since the recorded merge state,
+    or None if a full rebuild is required.
+    """
+    if not state or state.get("forwards_only") != forwards_only:
+        return None
+    if any(wiki_data.get(source, []) != state["wiki"].get(source, []) for source in TITLE_SOURCES):
+        return None
+
+    affected = set()
+    previous_files = state["fbref"]
+    for file in set(previous_files) | set(fbref_signatures):
+        old, new = previous_files.get(file), fbref_signatures.get(file)
+        if old is None or new is None or old["sha256"] != new["sha256"]:
+            affected.update(state["fbref_groups"].get(file, []))
+            affected.update(fbref_groups.get(file, []))
+
+    old_awards = _award_records_by_group(state["wiki"])
+    new_awards = _award_records_by_group(wiki_data)
+    for key in set(old_awards) | set(new_awards):
+        if old_awards.get(key) != new_awards.get(key):
+            affected.add(key.split(":", 1)[1])
+    return affected
+
+
+def _profile_order(fbref_df: pd.DataFrame, wiki_data: dict, names) -> list:
+    """
+    Order ``names`` the way a full build_player_profiles() run creates them:
+    FBref players by first appearance, then award-only players by first record.
+    """
+    order = {}
+    if not fbref_df.empty:
+        fbref_names = _text_column(fbref_df, "player").str.strip()
+        for name in fbref_names.unique():
+            order.setdefault(name, len(order))
+    for source in ("pichichi", "ballon_dor"):
+        for record in wiki_data.get(source, []):
+            order.setdefault(record.get("player", ""), len(order))
+    return sorted(names, key=order.__getitem__)
+
+
+def incremental_profiles(
+    previous: dict,
+    affected: set,
+    fbref_df: pd.DataFrame,
+    wiki_data: dict,
+    forwards_only: bool = False,
+) -> dict:
+    """
+    Rebuild only the ``affected`` normalised-name groups of a previous full build.
+
+    Equivalent to build_player_profiles(fbref_df, wiki_data, forwards_only) as long
+    as ``previous`` was built from inputs that differ only within those groups and
+    share the same title winners tables.
+    """
+    subset_df = fbref_df[_fbref_name_groups(fbref_df).isin(affected).to_numpy()] if not fbref_df.empty else fbref_df
+    subset_wiki = {
+        source: (
+            [r for r in records if _normalize_name(r.get("player", "")) in affected]
+            if source in AWARD_SOURCES else records
+        )
+        for source, records in wiki_data.items()
+    }
+    rebuilt = build_player_profiles(subset_df, subset_wiki, forwards_only=forwards_only)
+
+    players = {name: p for name, p in previous.items() if _normalize_name(name) not in affected}
+    players.update(rebuilt)
+    return {name: players[name] for name in _profile_order(fbref_df, wiki_data, players)}
+
+
+def diff_players(previous: dict, current: dict) -> dict:
+    """Player names added, changed and removed between two datasets."""
+    return {
+        "added": [name for name in current if name not in previous],
+        "changed": [name for name in current if name in previous and previous[name] != current[name]],
+        "removed": [name for name in previous if name not in current],
+    }
+
+
+def _load_previous_players(output_path: Path, state: dict) -> dict | None:
+    """Players of the last merge output, if it is still the file the state recorded."""
+    recorded = state.get("output", {})
+    if recorded.get("path") != str(output_path) or not output_path.exists():
+        return None
+    if file_signature(output_path, recorded).get("sha256") != recorded.get("sha256"):
+        return None
+    return read_dataset_json(output_path)["players"]
+
+
 # ──────────────────────── Output ────────────────────────
 
-def save_dataset(players: dict, output_path: Path):
-    """Save the merged dataset as JSON."""
+def _sidecars_missing(output_path: Path) -> bool:
+    """Whether the NDJSON copy or (with pyarrow) the Arrow tables need writing."""
+    if not all(p.exists() for p in ndjson_paths(output_path)):
+        return True
+    return HAS_PYARROW and fresh_tables_dir(output_path) is None
+
+
+def save_dataset(players: dict, output_path: Path, fmt: str = "pretty"):
+    """
+    Save the merged dataset as JSON, streamed one player at a time.
+
+    ``fmt`` is one of DATASET_FORMATS ("pretty", "compact" or "gzip"); the file
+    name stays the same and players_data detects the format when loading. An
+    NDJSON copy with a per-player offset index is written next to it for
+    single-player lookups (players_data.get_player), and, when pyarrow is
+    installed, normalized Arrow tables (see src/core/dataset_tables.py).
+    """
     import time
 
-    dataset = {
-        "metadata": {
-            "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "total_players": len(players),
-            "sources": {
-                "stats": "FBref.com (Sports Reference / StatsBomb)",
-                "awards": "Wikipedia",
-            },
-            "description": (
-                "Comprehensive La Liga player statistics combining season-by-season "
-                "performance data from FBref with awards and honours from Wikipedia."
-            ),
+    metadata = {
+        "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "total_players": len(players),
+        "sources": {
+            "stats": "FBref.com (Sports Reference / StatsBomb)",
+            "awards": "Wikipedia",
         },
-        "players": players,
+        "description": (
+            "Comprehensive La Liga player statistics combining season-by-season "
+            "performance data from FBref with awards and honours from Wikipedia."
+        ),
     }
+    write_dataset_json(output_path, metadata, players, fmt=fmt)
+    write_dataset_ndjson(output_path, metadata, players)
+    if HAS_PYARROW:
+        tables_dir = write_arrow_tables(output_path, PlayerDataset.from_players(players))
+        log.info(f"Saved Arrow tables to {tables_dir}")
+    else:
+        log.info("pyarrow not installed; skipping the Arrow table export")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(dataset, f, indent=2, ensure_ascii=False)
-
-    log.info(f"Saved {len(players)} player profiles to {output_path}")
+    log.info(f"Saved {len(players)} player profiles to {output_path} ({fmt})")
 
     # Also generate a summary CSV for quick inspection
     summary_rows = []
@@ -395,33 +757,145 @@ def save_dataset(players: dict, output_path: Path):
         log.info(f"Saved summary CSV to {summary_csv}")
 
 
+# ──────────────────────── Merge run ────────────────────────
+
+def merge(
+    output_path: Path = FINAL_JSON,
+    forwards_only: bool = False,
+    incremental: bool = False,
+    fbref_dir: Path = RAW_FBREF_DIR,
+    wiki_dir: Path = RAW_WIKI_DIR,
+    fbref_cache_dir: Path = FBREF_CACHE_DIR,
+    state_path: Path = MERGE_STATE_PATH,
+    use_cache: bool = True,
+    workers: int = FBREF_LOAD_WORKERS,
+    fmt: str = "pretty",
+    sqlite: bool = False,
+    wiki_data: dict | None = None,
+) -> tuple:
+    """
+    Load the raw data, build (or incrementally update) the profiles and save them.
+
+    Every run records its inputs in ``state_path`` and writes the delta against
+    the previous output next to it (``delta.json``) for downstream caches. With
+    ``sqlite``, the query database (src/core/query.py) is rebuilt whenever it
+    no longer matches the output. ``wiki_data`` (category -> records) can be
+    passed in by a caller that already holds it instead of reading ``wiki_dir``.
+
+    Returns:
+        Tuple of (players, delta); players is None if there was no input data
+    """
+    log.info("Loading FBref data...")
+    fbref_df = load_fbref_data(fbref_dir, fbref_cache_dir, workers, use_cache, keep_source=True)
+
+    if wiki_data is None:
+        log.info("Loading Wikipedia data...")
+        wiki_data = load_wikipedia_data(wiki_dir)
+
+    if fbref_df.empty and not wiki_data:
+        return None, {}
+
+    state = load_manifest(state_path, MERGE_STATE_SCHEMA_VERSION)
+    format_changed = state.get("format", "pretty") != fmt
+    previous = _load_previous_players(output_path, state) if state else None
+    csv_files = [f for f in sorted(fbref_dir.glob("*.csv")) if not f.name.startswith("_")]
+    fbref_signatures = {
+        f.name: file_signature(f, state.get("fbref", {}).get(f.name)) for f in csv_files
+    }
+    fbref_groups = _fbref_groups_by_file(fbref_df)
+
+    affected = None
+    if incremental:
+        if previous is None:
+            log.info("No usable previous merge state or output; running a full rebuild")
+        else:
+            affected = _affected_groups(state, fbref_signatures, fbref_groups, wiki_data, forwards_only)
+            if affected is None:
+                log.info("Title winners or filters changed; running a full rebuild")
+
+    if affected is None:
+        log.info("Building player profiles...")
+        players = build_player_profiles(fbref_df, wiki_data, forwards_only=forwards_only)
+    else:
+        log.info(f"Rebuilding {len(affected)} affected player group(s)...")
+        players = incremental_profiles(previous, affected, fbref_df, wiki_data, forwards_only)
+
+    delta = diff_players(previous or {}, players)
+    log.info(
+        f"Delta: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+        f"{len(delta['removed'])} removed"
+    )
+    unchanged = affected is not None and not format_changed and not any(delta.values())
+    if unchanged and not _sidecars_missing(output_path):
+        log.info(f"No player changes; leaving {output_path} untouched")
+    else:
+        save_dataset(players, output_path, fmt=fmt)
+
+    db_path = database_path_for(output_path)
+    if sqlite and not database_is_current(db_path, output_path):
+        build_database(players, db_path, source=output_path)
+        log.info(f"Saved query database to {db_path}")
+
+    state_dir = state_path.parent
+    atomic_write(
+        state_dir / "delta.json",
+        lambda f: f.write(json.dumps(delta, indent=2, ensure_ascii=False).encode("utf-8")),
+    )
+    save_manifest(
+        state_path,
+        {
+            "forwards_only": forwards_only,
+            "format": fmt,
+            "output": {"path": str(output_path), **file_signature(output_path)},
+            "fbref": fbref_signatures,
+            "fbref_groups": fbref_groups,
+            "wiki": wiki_data,
+        },
+        MERGE_STATE_SCHEMA_VERSION,
+    )
+    return players, delta
+
+
 # ──────────────────────── CLI ────────────────────────
 
 def main():
     parser = argparse.ArgumentParser(description="Merge FBref + Wikipedia data into unified dataset")
     parser.add_argument("--forwards-only", action="store_true", help="Only include forward positions")
     parser.add_argument("--output", type=str, default=str(FINAL_JSON), help="Output JSON path")
+    parser.add_argument(
+        "--format", choices=DATASET_FORMATS, default="pretty",
+        help="Output JSON layout: indented (default), compact one-player-per-line, or gzip-compressed compact",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only rebuild players whose FBref seasons or award records changed since the last merge",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-parse every FBref CSV instead of reusing unchanged seasons from data/cache/",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=FBREF_LOAD_WORKERS,
+        help=f"Threads used to parse FBref CSVs (default: {FBREF_LOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--sqlite", action="store_true",
+        help="Also write an indexed SQLite database of players, seasons and awards for ad-hoc queries",
+    )
     args = parser.parse_args()
 
-    log.info("Loading FBref data...")
-    fbref_df = load_fbref_data()
-
-    log.info("Loading Wikipedia data...")
-    wiki_data = load_wikipedia_data()
-
-    if fbref_df.empty and not wiki_data:
-        log.error("No data found! Run scrape_fbref.py and scrape_wikipedia.py first.")
-        sys.exit(1)
-
-    log.info("Building player profiles...")
-    players = build_player_profiles(
-        fbref_df,
-        wiki_data,
+    players, _ = merge(
+        output_path=Path(args.output),
         forwards_only=args.forwards_only,
+        incremental=args.incremental,
+        use_cache=not args.no_cache,
+        workers=args.workers,
+        fmt=args.format,
+        sqlite=args.sqlite,
     )
-
-    output_path = Path(args.output)
-    save_dataset(players, output_path)
+    if players is None:
+        log.error("No data found! Run scrape_fbref.py and scrape_wikipedia.py first.")
+        sys.exit(1)
 
     # Print top 10 by career goals
     top = sorted(players.items(), key=lambda x: x[1]["career_goals"], reverse=True)[:10]
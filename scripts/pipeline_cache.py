@@ -0,0 +1,54 @@
+"""
+Pipeline cache helpers — content hashes, manifests and atomic writes.
+
+Pipeline steps that skip unchanged inputs keep a small JSON manifest of the
+files they consumed (size, mtime and sha256). The size/mtime pair is a fast
+path; the content hash is only recomputed when it changes, so a fresh checkout
+with new mtimes but identical bytes is still recognised as unchanged.
+
+file_sha256() and atomic_write() come from src/core/file_utils.py, which the
+dataset caches use too.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import config  # noqa: F401  (puts the project root on sys.path for src/)
+from src.core.file_utils import atomic_path, atomic_write, file_sha256  # noqa: F401  (re-exported)
+
+
+def file_signature(path: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Size, mtime and sha256 of ``path``.
+
+    If ``previous`` (an earlier signature of the same path) has the same size and
+    mtime, its hash is reused instead of re-reading the file.
+    """
+    stat = path.stat()
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous and all(previous.get(k) == v for k, v in signature.items()) and previous.get("sha256"):
+        signature["sha256"] = previous["sha256"]
+    else:
+        signature["sha256"] = file_sha256(path)
+    return signature
+
+
+def load_manifest(path: Path, schema_version: int) -> Dict[str, Any]:
+    """Read a JSON manifest; a missing, unreadable or outdated manifest reads as empty."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("schema_version") != schema_version:
+        return {}
+    return manifest
+
+
+def save_manifest(path: Path, manifest: Dict[str, Any], schema_version: int) -> None:
+    """Atomically write a JSON manifest tagged with ``schema_version``."""
+    payload = {"schema_version": schema_version, **manifest}
+    atomic_write(path, lambda f: json.dump(payload, f, indent=2, sort_keys=True), mode="w")
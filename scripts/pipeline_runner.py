@@ -0,0 +1,357 @@
+"""
+In-process DAG runner for the data pipeline.
+
+Each Stage declares the stages it depends on, the files it reads and the files
+it writes. run_pipeline() runs the stages in one interpreter:
+
+  - a stage starts as soon as every stage it depends on has finished, so
+    independent stages (e.g. the Wikipedia scrape and the FBref import) overlap;
+  - make-style skipping: a stage whose outputs all exist and are newer than
+    every input is skipped (stages without declared outputs always run);
+    with a StageCache (see stage_cache.py) the decision is content-addressed
+    instead, keyed on input contents, code and config;
+  - a stage's return value is handed to its dependents in memory, so they don't
+    have to re-read it from disk;
+  - wall time and peak memory are recorded per stage.
+
+Peak memory is the process's resident set size, sampled by a background thread
+every few milliseconds (tracemalloc would be exact for Python allocations but
+slows pandas-heavy stages several-fold). Each sample is attributed to every
+stage running at the time, so overlapping stages include each other's memory.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+MEMORY_SAMPLE_SECONDS = 0.01
+
+PathsFn = Callable[[], Iterable[Path]]
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    Args:
+        name: Unique stage name
+        run: Called as ``run(upstream)`` where ``upstream`` maps each dependency's
+             name to its return value (None if the dependency was skipped)
+        deps: Names of stages that must finish first
+        inputs: Files the stage reads; a callable so globs are evaluated when the
+                stage is about to run, after its dependencies wrote them
+        outputs: Files the stage writes (empty: the stage always runs)
+        code: Source files implementing the stage; part of its cache key
+        config: Configuration values the stage reads, by name; part of its cache key
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Any],
+        deps: Sequence[str] = (),
+        inputs: PathsFn = lambda: (),
+        outputs: PathsFn = lambda: (),
+        code: Sequence[Path] = (),
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = tuple(code)
+        self.config = dict(config or {})
+
+    def __repr__(self) -> str:
+        return f"<Stage {self.name}>"
+
+
+class Upstream(dict):
+    """
+    The ``upstream`` mapping passed to Stage.run.
+
+    A plain dict of dependency name -> return value, which also says why the stage
+    is running: ``reason`` is a short explanation and ``changed`` the set of key
+    components that changed ('inputs', 'code', 'config', 'outputs', 'forced' or
+    'new'), so a stage can e.g. re-fetch data only when its code changed.
+    """
+
+    def __init__(self, values: Dict[str, Any], reason: str = "", changed: Iterable[str] = ()):
+        super().__init__(values)
+        self.reason = reason
+        self.changed = frozenset(changed)
+
+
+class StageResult:
+    """
+    Outcome of one stage: status ('ran', 'restored', 'skipped', 'failed', 'blocked'),
+    reason, timings, and ``details`` listing everything that went into the decision.
+    """
+
+    def __init__(self, name: str, status: str, reason: str, value: Any = None,
+                 seconds: float = 0.0, peak_bytes: int = 0, error: Optional[BaseException] = None,
+                 details: Sequence[str] = ()):
+        self.name = name
+        self.status = status
+        self.reason = reason
+        self.value = value
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.error = error
+        self.details = list(details) or [reason]
+
+
+class PipelineError(RuntimeError):
+    """Raised by PipelineReport.raise_for_failures() when a stage failed."""
+
+
+class PipelineReport:
+    """Per-stage results in completion order, plus the total wall time."""
+
+    def __init__(self, results: List[StageResult], seconds: float):
+        self.results = results
+        self.seconds = seconds
+        self.by_name = {r.name: r for r in results}
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status in ("ran", "restored", "skipped") for r in self.results)
+
+    def raise_for_failures(self) -> None:
+        failed = [r for r in self.results if r.status == "failed"]
+        if failed:
+            raise PipelineError(f"Stage {failed[0].name!r} failed: {failed[0].error}") from failed[0].error
+
+    def format_table(self) -> str:
+        """Plain-text summary: one row per stage with status, wall time and peak memory."""
+        lines = [f"{'stage':<20} {'status':<8} {'wall':>9} {'peak RSS':>10}  reason"]
+        for r in self.results:
+            timing = f"{r.seconds:8.2f}s" if r.status in ("ran", "failed") else f"{'-':>9}"
+            memory = f"{r.peak_bytes / 1e6:8.1f}MB" if r.status in ("ran", "failed") else f"{'-':>10}"
+            lines.append(f"{r.name:<20} {r.status:<8} {timing} {memory}  {r.reason}")
+        lines.append(f"{'total':<20} {'':<8} {self.seconds:8.2f}s")
+        return "\n".join(lines)
+
+    def format_explanation(self) -> str:
+        """Every stage's decision with the full list of reasons behind it."""
+        lines = []
+        for r in self.results:
+            lines.append(f"{r.name}: {r.status}")
+            lines.extend(f"  - {detail}" for detail in r.details)
+        return "\n".join(lines)
+
+
+# ──────────────────────── Staleness ────────────────────────
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def stale_reason(stage: Stage) -> Optional[str]:
+    """Why ``stage`` needs to run, or None if its outputs are up to date."""
+    outputs = [Path(p) for p in stage.outputs()]
+    if not outputs:
+        return "no declared outputs"
+
+    output_times = []
+    for path in outputs:
+        mtime = _mtime(path)
+        if mtime is None:
+            return f"missing output {path.name}"
+        output_times.append(mtime)
+
+    oldest_output = min(output_times)
+    for path in stage.inputs():
+        mtime = _mtime(Path(path))
+        if mtime is not None and mtime > oldest_output:
+            return f"{Path(path).name} is newer than its outputs"
+    return None
+
+
+# ──────────────────────── Memory sampling ────────────────────────
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (0 where it can't be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Not Linux: fall back to the high-water mark (bytes on macOS, KiB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _MemorySampler:
+    """Attribute sampled RSS peaks to whichever stages were running at the time."""
+
+    def __init__(self):
+        self._running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="pipeline-memory", daemon=True)
+
+    def __enter__(self) -> "_MemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        rss = current_rss()
+        with self._lock:
+            for name in self._running:
+                self._running[name] = max(self._running[name], rss)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(MEMORY_SAMPLE_SECONDS):
+            self._sample()
+
+    def begin(self, name: str) -> None:
+        with self._lock:
+            self._running[name] = current_rss()
+
+    def end(self, name: str) -> int:
+        self._sample()
+        with self._lock:
+            return self._running.pop(name)
+
+
+# ──────────────────────── Runner ────────────────────────
+
+def _check_graph(stages: Sequence[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in {names}")
+    known = set(names)
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stage(s) {missing}")
+
+    # Kahn's algorithm: every stage must become ready eventually
+    remaining = {s.name: set(s.deps) for s in stages}
+    while remaining:
+        ready = [n for n, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle among stages {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    force: bool = False,
+    max_workers: int = 4,
+    trace_memory: bool = True,
+    cache=None,
+) -> PipelineReport:
+    """
+    Run ``stages`` in dependency order, overlapping independent ones.
+
+    Args:
+        stages: The pipeline's stages (any order)
+        force: Run every stage even if its outputs are up to date
+        max_workers: Maximum number of stages running at once
+        trace_memory: Sample per-stage peak memory (RSS)
+        cache: Optional StageCache; when given, stages are skipped or restored by
+               content-addressed key instead of by file modification times
+
+    Returns:
+        PipelineReport; a stage whose run or cache lookup/restore raised is 'failed'
+        and the stages downstream of it are 'blocked'
+    """
+    _check_graph(stages)
+    results: Dict[str, StageResult] = {}
+    order: List[StageResult] = []
+    pending = list(stages)
+    started = time.perf_counter()
+
+    def execute(stage: Stage, sampler: Optional[_MemorySampler]) -> StageResult:
+        # Cache lookups, restores and records fail the stage like its own errors do,
+        # so one bad cache entry still produces a report with dependents blocked
+        reason, details, measuring = None, (), False
+        t0 = time.perf_counter()
+        try:
+            decision = None
+            if cache is not None:
+                decision = cache.decide(stage, force=force)
+                reason, details, changed = decision.reason, decision.details, decision.changed
+                if decision.action == "skip":
+                    return StageResult(stage.name, "skipped", reason, details=details)
+                if decision.action == "restore":
+                    cache.restore(stage, decision)
+                    return StageResult(stage.name, "restored", reason, details=details)
+            else:
+                reason = "forced" if force else stale_reason(stage)
+                if reason is None:
+                    return StageResult(stage.name, "skipped", "outputs up to date")
+                details, changed = [reason], {"forced"} if force else set()
+
+            upstream = Upstream({dep: results[dep].value for dep in stage.deps}, reason, changed)
+            log.info(f"▶ {stage.name} ({reason})")
+            if sampler:
+                sampler.begin(stage.name)
+                measuring = True
+            t0 = time.perf_counter()
+            value = stage.run(upstream)
+            status, error = "ran", None
+            if decision is not None:
+                cache.record(stage, decision)
+        except Exception as e:
+            log.error(f"✗ {stage.name} failed: {e}")
+            value, status, error = None, "failed", e
+            reason = reason or f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - t0
+        peak = sampler.end(stage.name) if measuring else 0
+        return StageResult(stage.name, status, reason, value, seconds, peak, error, details)
+
+    def run_all(sampler: Optional[_MemorySampler]) -> None:
+        running: Dict[Future, Stage] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                for stage in list(pending):
+                    dep_results = [results.get(d) for d in stage.deps]
+                    if any(r is not None and r.status in ("failed", "blocked") for r in dep_results):
+                        pending.remove(stage)
+                        blocked = StageResult(stage.name, "blocked", "an upstream stage failed")
+                        results[stage.name] = blocked
+                        order.append(blocked)
+                    elif all(r is not None for r in dep_results):
+                        pending.remove(stage)
+                        running[pool.submit(execute, stage, sampler)] = stage
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    result = future.result()
+                    results[stage.name] = result
+                    order.append(result)
+
+    if trace_memory:
+        with _MemorySampler() as sampler:
+            run_all(sampler)
+    else:
+        run_all(None)
+
+    return PipelineReport(order, time.perf_counter() - started)
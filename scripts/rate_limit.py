@@ -0,0 +1,113 @@
+"""
+Politeness limits for the scrapers.
+
+HostLimiter caps, per host, how many requests are in flight at once and how
+closely their start times may follow each other. Unlike a fixed sleep after
+every page, it lets concurrent fetches overlap while still spacing them out.
+
+TokenBucket enforces a requests-per-minute budget shared by any number of
+threads: each request takes a token, tokens refill at a steady rate, and up to
+``capacity`` of them can accumulate for a short burst.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+from urllib.parse import urlsplit
+
+
+class _HostState:
+    def __init__(self, max_concurrent: int):
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+
+class HostLimiter:
+    """
+    Per-host concurrency cap plus a minimum interval between request starts.
+
+    Args:
+        max_concurrent: Requests allowed in flight to one host at a time
+        min_interval: Seconds between consecutive request starts to one host
+    """
+
+    def __init__(self, max_concurrent: int = 4, min_interval: float = 0.0):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(self.max_concurrent)
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[float]:
+        """
+        Block until a request to ``url``'s host may start; hold the slot while it runs.
+
+        Yields the start time reserved for the request (``time.monotonic()``).
+        """
+        state = self._state(urlsplit(url).netloc)
+        with state.slots:
+            with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield start
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate_per_minute: Sustained number of acquire() calls allowed per minute
+        capacity: Tokens that can be saved up for a burst (1 = strictly even spacing)
+        clock, sleep: Time sources, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_minute <= 0 or capacity < 1:
+            raise ValueError("rate_per_minute must be positive and capacity at least 1")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+
+        Waiting callers reserve their token up front (the balance may go
+        negative), so concurrent callers are served in arrival order.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -5,11 +5,23 @@ FBref Scraper — Fetches season-by-season La Liga player stats.
 Uses Selenium (real browser) to bypass FBref's aggressive bot blocking.
 Falls back to direct HTTP requests with proper headers if Selenium is unavailable.
 
+Seasons are fetched by a few worker threads that share one token bucket
+(FBREF_REQUESTS_PER_MINUTE, see rate_limit.py), so the request budget holds no
+matter how many workers run. Parsing, cleaning and saving a season happen on a
+separate thread while the workers fetch the next pages; the table is parsed in
+a single lxml pass straight into the cleaned schema (fbref_table.py).
+
+Browsers come from a DriverPool (driver_pool.py): they are started once,
+health-checked, and recycled after FBREF_DRIVER_MAX_PAGES pages or a crash. A
+checkpoint journal (data/raw/fbref/_scrape_journal.jsonl) records completed and
+in-flight seasons, so an interrupted backfill resumes where it stopped.
+
 Usage:
     python scripts/scrape_fbref.py                   # Scrape all configured seasons
     python scripts/scrape_fbref.py --seasons 2023-2024 2022-2023
     python scripts/scrape_fbref.py --start 2015 --end 2024
     python scripts/scrape_fbref.py --current          # Current season only
+    python scripts/scrape_fbref.py --workers 3 --rpm 10
 
 Output:
     data/raw/fbref/<season>.csv   — one CSV per season with player stats
@@ -18,8 +30,13 @@ Output:
 import argparse
 import json
 import logging
+import os
+import queue
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from pathlib import Path
 
 import pandas as pd
@@ -29,7 +46,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import (
     ALL_SEASONS,
     FBREF_START_SEASON,
+    FBREF_DRIVER_MAX_PAGES,
     FBREF_END_SEASON,
+    FBREF_FETCH_WORKERS,
+    FBREF_REQUESTS_PER_MINUTE,
     RAW_FBREF_DIR,
     REQUEST_DELAY_SECONDS,
     SELENIUM_PAGE_TIMEOUT,
@@ -39,6 +59,10 @@ from config import (
     fbref_current_season_url,
     season_str,
 )
+from driver_pool import DriverPool
+from fbref_table import extract_player_stats, standard_column_names, stats_table_html
+from pipeline_cache import atomic_write
+from rate_limit import TokenBucket
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +71,8 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+JOURNAL_NAME = "_scrape_journal.jsonl"
+
 
 # ──────────────────────── Selenium backend ────────────────────────
 
@@ -95,16 +121,13 @@ def _get_selenium_driver(visible: bool = False):
         return None
 
 
-def _scrape_with_selenium(driver, url: str) -> pd.DataFrame:
-    """Load a FBref page in Selenium and extract the main stats table."""
-    import random
+def _fetch_table_selenium(driver, url: str) -> str | None:
+    """Load a FBref page in Selenium and return the main stats table's HTML."""
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
 
     driver.get(url)
-    # Random delay to look more human
-    time.sleep(random.uniform(3, 6))
 
     # Wait for the main stats table to appear
     try:
@@ -122,7 +145,7 @@ def _scrape_with_selenium(driver, url: str) -> pd.DataFrame:
             # Save page source for debugging
             source = driver.page_source[:500]
             log.warning(f"  Page snippet: {source[:200]}...")
-            return pd.DataFrame()
+            return None
 
     # Get all stats tables
     tables = driver.find_elements(By.CSS_SELECTOR, "table.stats_table")
@@ -133,14 +156,18 @@ def _scrape_with_selenium(driver, url: str) -> pd.DataFrame:
         tables = driver.find_elements(By.CSS_SELECTOR, "table")
 
     if not tables:
-        return pd.DataFrame()
+        return None
 
     # Extract the first stats table's HTML
-    table_html = tables[0].get_attribute("outerHTML")
+    return tables[0].get_attribute("outerHTML")
+
+
+def _parse_stats_table(table_html: str | None) -> pd.DataFrame:
+    """Parse a FBref stats table's HTML into a DataFrame with flattened headers."""
+    if not table_html:
+        return pd.DataFrame()
 
-    # Parse with pandas
     try:
-        from io import StringIO
         dfs = pd.read_html(StringIO(table_html), header=[0, 1])
     except Exception:
         dfs = pd.read_html(StringIO(table_html))
@@ -155,43 +182,26 @@ def _scrape_with_selenium(driver, url: str) -> pd.DataFrame:
             col[-1] if col[0].startswith("Unnamed") else f"{col[0]}_{col[-1]}"
             for col in df.columns
         ]
-
     return df
 
 
 # ──────────────────────── HTTP fallback ────────────────────────
 
-def _scrape_with_requests(url: str) -> pd.DataFrame:
-    """Attempt direct HTTP scrape (may get 403 from FBref)."""
-    import requests
-    from bs4 import BeautifulSoup
-
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Referer": "https://www.google.com/",
-    }
-
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Referer": "https://www.google.com/",
+}
 
-    soup = BeautifulSoup(response.text, "lxml")
-    table = soup.find("table", {"class": "stats_table"})
-    if table is None:
-        return pd.DataFrame()
 
-    dfs = pd.read_html(str(table), header=[0, 1])
-    if not dfs:
-        return pd.DataFrame()
+def _fetch_table_requests(url: str, session=None) -> str | None:
+    """Fetch a FBref page over HTTP (may get 403 from FBref) and return the stats table's HTML."""
+    import requests
 
-    df = dfs[0]
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [
-            col[-1] if col[0].startswith("Unnamed") else f"{col[0]}_{col[-1]}"
-            for col in df.columns
-        ]
-    return df
+    response = (session or requests).get(url, headers=REQUEST_HEADERS, timeout=30)
+    response.raise_for_status()
+    return stats_table_html(response.text)
 
 
 # ──────────────────────── Post-processing ────────────────────────
@@ -207,48 +217,7 @@ def _clean_player_stats(df: pd.DataFrame, season: str) -> pd.DataFrame:
         df = df[df["Player"].notna() & (df["Player"] != "Player")]
 
     # Standardise key column names
-    rename_map = {}
-    for col in df.columns:
-        cl = col.lower()
-        if cl == "player":
-            rename_map[col] = "player"
-        elif cl == "squad":
-            rename_map[col] = "team"
-        elif cl == "pos":
-            rename_map[col] = "position"
-        elif cl == "nation":
-            rename_map[col] = "nationality"
-        elif cl in ("age",):
-            rename_map[col] = "age"
-        elif "mp" in cl and "match" not in cl:
-            rename_map[col] = "matches_played"
-        elif cl in ("starts",):
-            rename_map[col] = "starts"
-        elif cl in ("min",):
-            rename_map[col] = "minutes"
-        elif cl.endswith("gls") or cl == "goals" or cl == "performance_gls":
-            if "gls" in cl and "performance" in cl.lower():
-                rename_map[col] = "goals"
-            elif cl in ("gls", "goals"):
-                rename_map[col] = "goals"
-        elif cl.endswith("ast") or cl == "assists" or cl == "performance_ast":
-            if "ast" in cl:
-                rename_map[col] = "assists"
-
-    df = df.rename(columns=rename_map)
-
-    # Ensure we have key columns; if column exists with different name, try standard FBref names
-    if "goals" not in df.columns:
-        for c in df.columns:
-            if "Gls" in c or "gls" in c:
-                df = df.rename(columns={c: "goals"})
-                break
-
-    if "assists" not in df.columns:
-        for c in df.columns:
-            if "Ast" in c or "ast" in c:
-                df = df.rename(columns={c: "assists"})
-                break
+    df = df.rename(columns=standard_column_names(list(df.columns)))
 
     # Add season column
     df["season"] = season
@@ -267,66 +236,254 @@ def _clean_player_stats(df: pd.DataFrame, season: str) -> pd.DataFrame:
 
 # ──────────────────────── Main scraping loop ────────────────────────
 
-def scrape_seasons(seasons: list[str], force: bool = False, visible: bool = False) -> dict:
+def _driver_alive(driver) -> bool:
+    """Health check: the browser still answers a trivial script."""
+    return driver.execute_script("return 1") == 1
+
+
+def _page_pool(visible: bool, browser: bool, size: int) -> tuple:
+    """
+    A DriverPool of Selenium drivers, or of HTTP sessions when the browser is
+    disabled or won't start, plus the matching ``fetch(driver, url)`` function.
+    """
+    first = _get_selenium_driver(visible=visible) if browser else None
+    if first is None:
+        import requests
+        pool = DriverPool(requests.Session, size=size, quit=lambda session: session.close())
+        return pool, lambda session, url: _fetch_table_requests(url, session)
+
+    spare = [first]
+
+    def new_driver():
+        driver = spare.pop() if spare else _get_selenium_driver(visible=visible)
+        if driver is None:
+            raise RuntimeError("Could not start a Selenium driver")
+        return driver
+
+    pool = DriverPool(new_driver, size=size, max_pages=FBREF_DRIVER_MAX_PAGES, is_alive=_driver_alive)
+    return pool, _fetch_table_selenium
+
+
+def _fetch_with_retries(pool: DriverPool, fetch, url: str, bucket: TokenBucket) -> str | None:
+    """
+    Table HTML for ``url``; every attempt spends a token from ``bucket`` and
+    borrows a driver from ``pool``, so a retry after a crash gets a fresh one.
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        bucket.acquire()
+        try:
+            with pool.driver() as driver:
+                table_html = fetch(driver, url)
+            if table_html:
+                return table_html
+        except Exception as e:
+            log.warning(f"  Attempt {attempt}/{MAX_RETRIES} failed: {e}")
+            time.sleep(REQUEST_DELAY_SECONDS * attempt)
+    return None
+
+
+# ──────────────────────── Checkpoint journal ────────────────────────
+
+class ScrapeJournal:
+    """
+    Append-only checkpoint log of a backfill, one JSON object per line:
+
+        {"event": "run", "seasons": [...], "force": true}
+        {"event": "started", "season": "2015-2016"}
+        {"event": "done", "season": "2015-2016", "path": "..."}
+        {"event": "failed", "season": "2016-2017", "error": "..."}
+        {"event": "finished"}
+
+    Every line is flushed and fsynced, so after a crash the journal says which
+    seasons were completed and which were in flight. A torn last line is ignored.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _events(self) -> list:
+        events = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            return []
+        return events
+
+    def unfinished_run(self, seasons: list[str]) -> tuple | None:
+        """
+        (completed seasons, in-flight seasons) of an interrupted run over the
+        same ``seasons``, or None if there is nothing to resume.
+        """
+        events = self._events()
+        starts = [i for i, e in enumerate(events) if e.get("event") == "run"]
+        if not starts:
+            return None
+        run = events[starts[-1]:]
+        if sorted(run[0].get("seasons", [])) != sorted(seasons):
+            return None
+        if any(e.get("event") == "finished" for e in run):
+            return None
+
+        done, in_flight = set(), []
+        for event in run[1:]:
+            season = event.get("season")
+            if event.get("event") == "started" and season not in in_flight:
+                in_flight.append(season)
+            elif event.get("event") in ("done", "failed"):
+                if season in in_flight:
+                    in_flight.remove(season)
+                if event["event"] == "done":
+                    done.add(season)
+        return done, in_flight
+
+    def begin(self, seasons: list[str], force: bool) -> None:
+        """Start a new run, discarding the previous journal."""
+        atomic_write(
+            self.path,
+            lambda f: f.write(json.dumps({"event": "run", "seasons": list(seasons), "force": force}) + "\n"),
+            mode="w",
+        )
+
+    def record(self, event: str, season: str | None = None, **details) -> None:
+        entry = {"event": event, "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+        if season is not None:
+            entry["season"] = season
+        entry.update(details)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _save_season(table_html: str, season: str, out_path: Path) -> int:
+    """Parse, clean and atomically save one season; returns the number of players."""
+    df = extract_player_stats(table_html, season)
+    if df is None:
+        # Not the usual FBref markup: fall back to the generic read_html path
+        df = _clean_player_stats(_parse_stats_table(table_html), season)
+    if df.empty:
+        raise ValueError("no player rows in the stats table")
+    # UTF-8 whatever the locale (cp1252 on Windows): import_fbref_csv reads these as UTF-8
+    atomic_write(out_path, lambda f: df.to_csv(f, index=False, encoding="utf-8"))
+    return len(df)
+
+
+def scrape_seasons(
+    seasons: list[str],
+    force: bool = False,
+    visible: bool = False,
+    workers: int = FBREF_FETCH_WORKERS,
+    requests_per_minute: float = FBREF_REQUESTS_PER_MINUTE,
+    browser: bool = True,
+    out_dir: Path = RAW_FBREF_DIR,
+    resume: bool = True,
+) -> dict:
     """
     Scrape player stats for the given seasons.
 
+    Progress is checkpointed in ``out_dir/_scrape_journal.jsonl``. If a run
+    over the same seasons was interrupted, it is resumed: seasons it completed
+    are not fetched again (even with ``force``) and the ones that were in
+    flight go first.
+
+    Args:
+        seasons: Season strings, e.g. ["2023-2024"]
+        force: Re-scrape seasons whose CSV already exists
+        visible: Show the browser windows
+        workers: Concurrent fetch workers (sharing a pool of as many browsers)
+        requests_per_minute: Page loads allowed per minute across all workers
+        browser: Use Selenium; False (or Selenium unavailable) fetches over HTTP
+        out_dir: Where the season CSVs are written
+        resume: Continue an interrupted run instead of starting over
+
     Returns dict mapping season -> output CSV path.
     """
+    journal = ScrapeJournal(out_dir / JOURNAL_NAME)
+    previous = journal.unfinished_run(seasons) if resume else None
+    if previous is None:
+        journal.begin(seasons, force)
+        completed, in_flight = set(), []
+    else:
+        completed, in_flight = previous
+        log.info(f"Resuming interrupted run: {len(completed)} done, {len(in_flight)} in flight")
+
     results = {}
+    todo = []
+    for i, season in enumerate(seasons):
+        out_path = out_dir / f"{season}.csv"
 
-    # Try Selenium first
-    driver = _get_selenium_driver(visible=visible)
-    use_selenium = driver is not None
+        if season in completed and out_path.exists():
+            log.info(f"[{i+1}/{len(seasons)}] {season} — done earlier in this run, skipping")
+            results[season] = str(out_path)
+        # Skip if already scraped (unless --force)
+        elif out_path.exists() and not force:
+            log.info(f"[{i+1}/{len(seasons)}] {season} — cached, skipping")
+            results[season] = str(out_path)
+        else:
+            todo.append(season)
 
-    try:
-        for i, season in enumerate(seasons):
-            out_path = RAW_FBREF_DIR / f"{season}.csv"
+    if not todo:
+        journal.record("finished")
+        return results
 
-            # Skip if already scraped (unless --force)
-            if out_path.exists() and not force:
-                log.info(f"[{i+1}/{len(seasons)}] {season} — cached, skipping")
-                results[season] = str(out_path)
-                continue
+    # Seasons that were in flight when the last run stopped go first
+    pending: queue.Queue = queue.Queue()
+    for season in sorted(todo, key=lambda s: s not in in_flight):
+        pending.put(season)
+
+    bucket = TokenBucket(requests_per_minute)
+    n_workers = max(1, min(workers, len(todo)))
+    pool, fetch = _page_pool(visible, browser, n_workers)
+    saves = {}
 
-            url = fbref_season_stats_url(season)
-            log.info(f"[{i+1}/{len(seasons)}] Scraping {season} from {url}")
+    def save(table_html: str, season: str, out_path: Path) -> int:
+        players = _save_season(table_html, season, out_path)
+        journal.record("done", season, path=str(out_path))
+        return players
 
-            df = pd.DataFrame()
-            for attempt in range(1, MAX_RETRIES + 1):
+    with pool, ThreadPoolExecutor(max_workers=1, thread_name_prefix="fbref-parse") as parser:
+
+        def fetch_worker() -> None:
+            while True:
                 try:
-                    if use_selenium:
-                        df = _scrape_with_selenium(driver, url)
-                    else:
-                        df = _scrape_with_requests(url)
-
-                    if not df.empty:
-                        break
-                except Exception as e:
-                    log.warning(f"  Attempt {attempt}/{MAX_RETRIES} failed: {e}")
-                    time.sleep(REQUEST_DELAY_SECONDS * attempt)
-
-            if df.empty:
-                log.error(f"  FAILED to scrape {season} after {MAX_RETRIES} attempts")
+                    season = pending.get_nowait()
+                except queue.Empty:
+                    return
+                url = fbref_season_stats_url(season)
+                log.info(f"Scraping {season} from {url}")
+                journal.record("started", season)
+                table_html = _fetch_with_retries(pool, fetch, url, bucket)
+                if table_html is None:
+                    log.error(f"  FAILED to scrape {season} after {MAX_RETRIES} attempts")
+                    journal.record("failed", season, error="no stats table")
+                    continue
+                # Parse and save on the parser thread; this worker moves on to the next page
+                out_path = out_dir / f"{season}.csv"
+                saves[season] = (out_path, parser.submit(save, table_html, season, out_path))
+
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="fbref-fetch") as fetch_pool:
+            for future in [fetch_pool.submit(fetch_worker) for _ in range(n_workers)]:
+                future.result()
+
+        for season, (out_path, future) in saves.items():
+            try:
+                players = future.result()
+            except Exception as e:
+                log.error(f"  Failed to process {season}: {e}")
+                journal.record("failed", season, error=str(e))
                 continue
-
-            # Clean and save
-            df = _clean_player_stats(df, season)
-            df.to_csv(out_path, index=False)
-            log.info(f"  Saved {len(df)} players to {out_path}")
+            log.info(f"  Saved {players} players to {out_path}")
             results[season] = str(out_path)
 
-            # Rate limiting
-            if i < len(seasons) - 1:
-                log.info(f"  Waiting {REQUEST_DELAY_SECONDS}s (rate limit)...")
-                time.sleep(REQUEST_DELAY_SECONDS)
-
-    finally:
-        if driver:
-            driver.quit()
-            log.info("Selenium driver closed")
-
-    return results
+    log.info(f"Started {pool.created} driver(s), retired {pool.retired}")
+    journal.record("finished")
+    return {season: results[season] for season in seasons if season in results}
 
 
 # ──────────────────────── CLI ────────────────────────
@@ -343,6 +500,12 @@ def main():
     parser.add_argument("--force", action="store_true", help="Re-scrape even if cached")
     parser.add_argument("--visible", action="store_true",
                         help="Run browser in visible mode (use when headless is blocked by FBref)")
+    parser.add_argument("--workers", type=int, default=FBREF_FETCH_WORKERS,
+                        help=f"Concurrent fetch workers (default: {FBREF_FETCH_WORKERS})")
+    parser.add_argument("--rpm", type=float, default=FBREF_REQUESTS_PER_MINUTE,
+                        help=f"Page loads per minute across all workers (default: {FBREF_REQUESTS_PER_MINUTE})")
+    parser.add_argument("--restart", action="store_true",
+                        help="Start over instead of resuming an interrupted run")
     args = parser.parse_args()
 
     if args.current:
@@ -357,7 +520,10 @@ def main():
         seasons = ALL_SEASONS
 
     log.info(f"Will scrape {len(seasons)} season(s): {seasons[0]} → {seasons[-1]}")
-    results = scrape_seasons(seasons, force=args.force, visible=args.visible)
+    results = scrape_seasons(
+        seasons, force=args.force, visible=args.visible,
+        workers=args.workers, requests_per_minute=args.rpm, resume=not args.restart,
+    )
     log.info(f"Done — scraped {len(results)}/{len(seasons)} seasons successfully")
 
     # Summary
@@ -9,11 +9,19 @@ Scrapes structured tables from Wikipedia for:
   - La Liga title winners (to map team achievements to players)
   - Champions League winners
 
-Uses requests + BeautifulSoup (Wikipedia explicitly allows scraping).
+Uses requests + BeautifulSoup (Wikipedia explicitly allows scraping). Fetched
+pages are kept in an HTTP cache (data/cache/http/, see http_cache.py) and
+refreshed with conditional requests; --offline re-runs every parser from the
+cached HTML without touching the network.
+
+All categories are fetched concurrently over one keep-alive session, within a
+per-host politeness limit (see rate_limit.py), and each page is parsed in a
+worker process as soon as it arrives, while the others are still downloading.
 
 Usage:
     python scripts/scrape_wikipedia.py           # Scrape all award categories
     python scripts/scrape_wikipedia.py --only pichichi ballon_dor
+    python scripts/scrape_wikipedia.py --offline  # Re-parse cached pages, no network
 
 Output:
     data/raw/wikipedia/<category>.json
@@ -22,18 +30,29 @@ Output:
 import argparse
 import json
 import logging
+import os
 import re
 import sys
-import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from config import RAW_WIKI_DIR, WIKI_URLS, USER_AGENT
+from config import (
+    CACHE_DIR,
+    RAW_WIKI_DIR,
+    USER_AGENT,
+    WIKI_MAX_CONCURRENT_PER_HOST,
+    WIKI_MIN_REQUEST_INTERVAL,
+    WIKI_URLS,
+)
+from http_cache import HttpCache
+from rate_limit import HostLimiter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,12 +66,38 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml",
 }
 
+HTTP_CACHE = HttpCache(CACHE_DIR / "http")
+LIMITER = HostLimiter(WIKI_MAX_CONCURRENT_PER_HOST, WIKI_MIN_REQUEST_INTERVAL)
+
+
+def _make_session() -> requests.Session:
+    """A keep-alive session whose connection pool fits every concurrent fetch."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=WIKI_MAX_CONCURRENT_PER_HOST)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _make_session()
+
+
+def _fetch_html(url: str) -> str:
+    """Page source for ``url`` via HTTP_CACHE, over SESSION and within LIMITER."""
+    if HTTP_CACHE.offline:
+        return HTTP_CACHE.fetch(url).text
+    with LIMITER.slot(url):
+        return HTTP_CACHE.fetch(url, headers=HEADERS, session=SESSION).text
+
 
 def _fetch_page(url: str) -> BeautifulSoup:
     """Fetch a Wikipedia page and return parsed HTML."""
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "lxml")
+    return BeautifulSoup(_fetch_html(url), "lxml")
+
+
+def _page_soup(url: str, html: str | None) -> BeautifulSoup:
+    """Parse ``html`` when the caller already fetched the page, else fetch ``url``."""
+    return _fetch_page(url) if html is None else BeautifulSoup(html, "lxml")
 
 
 def _clean_text(text: str) -> str:
@@ -65,7 +110,7 @@ def _clean_text(text: str) -> str:
 
 # ──────────────────────── Pichichi Trophy ────────────────────────
 
-def scrape_pichichi() -> list[dict]:
+def scrape_pichichi(html: str | None = None) -> list[dict]:
     """
     Scrape Pichichi Trophy (La Liga top scorer) winners from Wikipedia.
     Returns list of {season, player, team, goals}.
@@ -76,7 +121,7 @@ def scrape_pichichi() -> list[dict]:
     """
     log.info("Scraping Pichichi Trophy winners...")
     url = WIKI_URLS["pichichi"]
-    soup = _fetch_page(url)
+    soup = _page_soup(url, html)
 
     records = []
 
@@ -147,7 +192,7 @@ def scrape_pichichi() -> list[dict]:
 
 # ──────────────────────── Ballon d'Or ────────────────────────
 
-def scrape_ballon_dor() -> list[dict]:
+def scrape_ballon_dor(html: str | None = None) -> list[dict]:
     """
     Scrape Ballon d'Or winners and podium (top 3) from Wikipedia.
     Returns list of {year, player, placement, team}.
@@ -158,9 +203,9 @@ def scrape_ballon_dor() -> list[dict]:
     url = WIKI_URLS["ballon_dor"]
     records = []
 
+    # Fetch errors propagate, so scrape_categories() keeps the previously saved records
+    soup = _page_soup(url, html)
     try:
-        soup = _fetch_page(url)
-
         # Find the large table with Year/Rank/Player headers
         tables = soup.find_all("table", {"class": "wikitable"})
         for table in tables:
@@ -223,14 +268,14 @@ def scrape_ballon_dor() -> list[dict]:
 
 # ──────────────────────── La Liga Best Player ────────────────────────
 
-def scrape_la_liga_best_player() -> list[dict]:
+def scrape_la_liga_best_player(html: str | None = None) -> list[dict]:
     """Scrape La Liga Best Player / Alfredo Di Stéfano Trophy winners."""
     log.info("Scraping La Liga Best Player awards...")
     url = WIKI_URLS["la_liga_best_player"]
     records = []
 
+    soup = _page_soup(url, html)
     try:
-        soup = _fetch_page(url)
         html_str = str(soup)
         dfs = pd.read_html(html_str)
         for df in dfs:
@@ -269,7 +314,7 @@ def scrape_la_liga_best_player() -> list[dict]:
 
 # ──────────────────────── La Liga Title Winners ────────────────────────
 
-def scrape_la_liga_titles() -> list[dict]:
+def scrape_la_liga_titles(html: str | None = None) -> list[dict]:
     """
     Scrape La Liga championship winners by season from
     https://en.wikipedia.org/wiki/List_of_Spanish_football_champions
@@ -280,8 +325,8 @@ def scrape_la_liga_titles() -> list[dict]:
     url = WIKI_URLS["la_liga_titles"]
     records = []
 
+    soup = _page_soup(url, html)
     try:
-        soup = _fetch_page(url)
         tables = soup.find_all("table", {"class": "wikitable"})
 
         for table in tables:
@@ -327,14 +372,14 @@ def scrape_la_liga_titles() -> list[dict]:
 
 # ──────────────────────── Champions League Winners ────────────────────────
 
-def scrape_champions_league() -> list[dict]:
+def scrape_champions_league(html: str | None = None) -> list[dict]:
     """Scrape UEFA Champions League winners by season."""
     log.info("Scraping Champions League winners...")
     url = WIKI_URLS["champions_league"]
     records = []
 
+    soup = _page_soup(url, html)
     try:
-        soup = _fetch_page(url)
         html_str = str(soup)
         dfs = pd.read_html(html_str, match="Season|Final")
         for df in dfs:
@@ -378,6 +423,85 @@ SCRAPERS = {
 }
 
 
+def scrape_categories(
+    categories: list[str] | None = None,
+    force: bool = False,
+    wiki_dir: Path = RAW_WIKI_DIR,
+    offline: bool = False,
+    parse_workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Scrape award categories, reusing saved JSON unless ``force``.
+
+    Pages are fetched concurrently (one thread per category, throttled by
+    LIMITER) and handed to a pool of ``parse_workers`` processes (default: one
+    per CPU, at most one per category); 0 parses in the fetching threads.
+
+    With ``offline``, every category is re-parsed from the cached HTML (no
+    network); categories whose page was never fetched keep their saved JSON.
+
+    Returns:
+        Dict of category -> records, sorted by category (the same shape
+        merge_data.load_wikipedia_data() reads back from ``wiki_dir``)
+    """
+    categories = categories or list(SCRAPERS.keys())
+    all_data: dict[str, Any] = {}
+    stale = []
+    for category in categories:
+        out_path = wiki_dir / f"{category}.json"
+        if out_path.exists() and not (force or offline):
+            log.info(f"{category} — cached, loading from {out_path}")
+            all_data[category] = _load_saved(out_path)
+        else:
+            stale.append(category)
+
+    if stale:
+        was_offline, HTTP_CACHE.offline = HTTP_CACHE.offline, offline
+        if parse_workers is None:
+            parse_workers = min(len(stale), os.cpu_count() or 1)
+        parsers = ProcessPoolExecutor(parse_workers) if parse_workers > 0 else None
+        try:
+            with ThreadPoolExecutor(max_workers=len(stale), thread_name_prefix="wiki") as fetchers:
+                futures = {
+                    category: fetchers.submit(_scrape_category, category, wiki_dir, parsers)
+                    for category in stale
+                }
+                for category, future in futures.items():
+                    all_data[category] = future.result()
+        finally:
+            HTTP_CACHE.offline = was_offline
+            if parsers is not None:
+                parsers.shutdown()
+
+    return dict(sorted(all_data.items()))
+
+
+def _load_saved(out_path: Path) -> list:
+    with open(out_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scrape_category(category: str, wiki_dir: Path, parsers: Executor | None) -> list:
+    """Fetch and parse one category and save it; on failure keep the saved records."""
+    out_path = wiki_dir / f"{category}.json"
+    scraper_fn = SCRAPERS[category]
+    try:
+        html = _fetch_html(WIKI_URLS[category])
+        if parsers is None:
+            data = scraper_fn(html)
+        else:
+            data = parsers.submit(scraper_fn, html).result()
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        log.info(f"Saved {len(data)} records to {out_path}")
+        return data
+
+    except Exception as e:
+        log.error(f"Failed to scrape {category}: {e}")
+        # Keep whatever an earlier run saved, as a later read from disk would
+        return _load_saved(out_path) if out_path.exists() else []
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape La Liga awards data from Wikipedia")
     parser.add_argument(
@@ -385,34 +509,14 @@ def main():
         help="Only scrape specific categories"
     )
     parser.add_argument("--force", action="store_true", help="Re-scrape even if cached")
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="Re-run the parsers on cached HTML only (no network requests)",
+    )
     args = parser.parse_args()
 
     categories = args.only or list(SCRAPERS.keys())
-    all_data: dict[str, Any] = {}
-
-    for category in categories:
-        out_path = RAW_WIKI_DIR / f"{category}.json"
-
-        if out_path.exists() and not args.force:
-            log.info(f"{category} — cached, loading from {out_path}")
-            with open(out_path) as f:
-                all_data[category] = json.load(f)
-            continue
-
-        scraper_fn = SCRAPERS[category]
-        try:
-            data = scraper_fn()
-            all_data[category] = data
-
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            log.info(f"Saved {len(data)} records to {out_path}")
-
-        except Exception as e:
-            log.error(f"Failed to scrape {category}: {e}")
-            all_data[category] = []
-
-        time.sleep(1)  # Be polite to Wikipedia
+    all_data = scrape_categories(categories, force=args.force, offline=args.offline)
 
     # Summary
     total = sum(len(v) for v in all_data.values())
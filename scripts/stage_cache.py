@@ -0,0 +1,303 @@
+"""
+Content-addressed cache for pipeline stages.
+
+A stage's cache key is a sha256 over everything that determines its outputs:
+
+  - the content of its input files,
+  - the source of the code that implements it (its "code version"),
+  - the configuration values it reads (e.g. AWARD_MAP, FORWARD_POSITIONS).
+
+After a stage runs, its output files are copied into a blob store keyed by their
+own content hash, and a manifest records key -> output hashes:
+
+    data/cache/stages/
+        objects/ab/ab12...        output file contents, by sha256
+        keys/<stage>/<key>.json   output path -> sha256 for one cache key
+        last/<stage>.json         components, key and outputs of the last run
+
+On the next run the stage is skipped when a manifest exists for its current key
+and the outputs on disk match it. Outputs that are missing, or that are still the
+pipeline's own output from an earlier key (e.g. after reverting a config change),
+are restored from the blob store instead of recomputing. Anything else, including
+outputs edited by hand, makes the stage run again. Every decision carries a
+human-readable explanation of what changed since the last run.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from pipeline_cache import atomic_path, file_signature, load_manifest, save_manifest
+
+log = logging.getLogger(__name__)
+
+STAGE_CACHE_SCHEMA_VERSION = 1
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode()).hexdigest()
+
+
+def _summarise(kind: str, before: Mapping[str, str], after: Mapping[str, str]) -> List[str]:
+    """Human-readable differences between two {name: hash} maps."""
+    details = []
+    for name in sorted(after.keys() - before.keys()):
+        details.append(f"{kind} {name} added")
+    for name in sorted(before.keys() - after.keys()):
+        details.append(f"{kind} {name} removed")
+    for name in sorted(after.keys() & before.keys()):
+        if after[name] != before[name]:
+            details.append(f"{kind} {name} changed")
+    return details
+
+
+def _module_files(base: Path, parts: List[str]) -> List[Path]:
+    """Files executed by importing the dotted module ``parts`` from ``base``: package __init__s, then the module."""
+    files = []
+    for i in range(1, len(parts) + 1):
+        path = base.joinpath(*parts[:i])
+        if (path / "__init__.py").is_file():
+            files.append(path / "__init__.py")
+        elif i == len(parts) and path.with_suffix(".py").is_file():
+            files.append(path.with_suffix(".py"))
+        else:
+            return []
+    return files
+
+
+def _imported_files(path: Path, search: List[Path]) -> List[Path]:
+    """Project files imported anywhere in ``path`` (lazy imports inside functions included)."""
+    found = []
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"), filename=str(path))):
+        if isinstance(node, ast.Import):
+            modules = [(alias.name.split("."), ()) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            parts = node.module.split(".") if node.module else []
+            modules = [(parts, [alias.name for alias in node.names])]
+        else:
+            continue
+        if isinstance(node, ast.ImportFrom) and node.level:
+            bases = [path.parents[node.level - 1]]
+        else:
+            bases = search
+        for parts, names in modules:
+            for base in bases:
+                files = _module_files(base, parts) if parts else []
+                # ``from package import module`` imports the submodule too
+                for name in names:
+                    files += _module_files(base, parts + [name])[len(parts):]
+                if files:
+                    found.extend(files)
+                    break
+    return found
+
+
+def python_sources(*entry_points: Path, project_root: Path) -> List[Path]:
+    """
+    ``entry_points`` plus every project module they import, transitively.
+
+    This is a stage's code version: editing any module the stage runs (config,
+    shared helpers, src/core) changes its key. Imports are resolved the way the
+    scripts resolve them: relative to the importing file's directory, and from
+    ``project_root`` (``src.core...``) and ``project_root/src`` (``core...``).
+    Standard-library and third-party modules are not part of the project and are
+    ignored.
+    """
+    project_root = Path(project_root).resolve()
+    seen: Dict[Path, None] = {}
+    pending = [Path(p).resolve() for p in entry_points]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen[path] = None
+        search = [path.parent, project_root, project_root / "src"]
+        pending.extend(p.resolve() for p in _imported_files(path, search))
+    return sorted(seen)
+
+
+class Decision:
+    """What to do with one stage ('run', 'restore' or 'skip') and why."""
+
+    def __init__(self, action: str, reason: str, details: List[str], changed: frozenset,
+                 key: str, components: Dict[str, Dict[str, str]], restore: Optional[Dict[str, str]] = None):
+        self.action = action
+        self.reason = reason
+        self.details = details
+        self.changed = changed
+        self.key = key
+        self.components = components
+        self.restore = restore or {}
+
+
+class StageCache:
+    """
+    Content-addressed store of stage outputs.
+
+    Args:
+        root: Cache directory (keys/, last/ and objects/ live under it)
+        base_dir: Paths are recorded relative to this directory when possible,
+                  so keys don't depend on where the checkout lives
+    """
+
+    def __init__(self, root: Path, base_dir: Path):
+        self.root = Path(root)
+        self.base_dir = Path(base_dir)
+        self._signatures: Dict[str, Dict[str, Any]] = {}
+
+    # ──────────── paths ────────────
+
+    def _name(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.base_dir.resolve()).as_posix()
+        except ValueError:
+            return path.resolve().as_posix()
+
+    def _path(self, name: str) -> Path:
+        path = Path(name)
+        return path if path.is_absolute() else self.base_dir / path
+
+    def _object(self, sha: str) -> Path:
+        return self.root / "objects" / sha[:2] / sha
+
+    def _manifest_path(self, stage: str, key: str) -> Path:
+        return self.root / "keys" / stage / f"{key}.json"
+
+    def _last_path(self, stage: str) -> Path:
+        return self.root / "last" / f"{stage}.json"
+
+    # ──────────── hashing ────────────
+
+    def _hash_file(self, path: Path, previous: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """sha256 of ``path`` (reusing ``previous`` when size/mtime match), or None if missing."""
+        try:
+            signature = file_signature(path, previous)
+        except OSError:
+            return None
+        self._signatures[self._name(path)] = signature
+        return signature["sha256"]
+
+    def _hash_files(self, paths, previous: Mapping[str, Dict[str, Any]]) -> Dict[str, str]:
+        hashes = {}
+        for path in paths:
+            name = self._name(path)
+            sha = self._hash_file(Path(path), previous.get(name))
+            if sha is not None:
+                hashes[name] = sha
+        return hashes
+
+    def components(self, stage, previous_signatures: Mapping[str, Dict[str, Any]] = None) -> Dict[str, Dict[str, str]]:
+        """Input, code and config hashes that make up ``stage``'s key."""
+        previous_signatures = previous_signatures or {}
+        return {
+            "inputs": self._hash_files(stage.inputs(), previous_signatures),
+            "code": self._hash_files(stage.code, previous_signatures),
+            "config": {name: _digest(value) for name, value in stage.config.items()},
+        }
+
+    def key(self, stage_name: str, components: Mapping[str, Any]) -> str:
+        return _digest({"schema": STAGE_CACHE_SCHEMA_VERSION, "stage": stage_name, **components})
+
+    # ──────────── decisions ────────────
+
+    def decide(self, stage, force: bool = False) -> Decision:
+        """Work out whether ``stage`` can be skipped, restored from cache, or must run."""
+        last = load_manifest(self._last_path(stage.name), STAGE_CACHE_SCHEMA_VERSION)
+        signatures = last.get("signatures", {})
+        components = self.components(stage, signatures)
+        key = self.key(stage.name, components)
+
+        if force:
+            return Decision("run", "forced", ["--force given"], frozenset({"forced"}), key, components)
+
+        changes = []
+        changed = set()
+        if not last:
+            changes.append("no previous run recorded")
+            changed.add("new")
+        else:
+            for kind, label in (("inputs", "input"), ("code", "code"), ("config", "config")):
+                diff = _summarise(label, last.get("components", {}).get(kind, {}), components[kind])
+                if diff:
+                    changes.extend(diff)
+                    changed.add(kind)
+
+        manifest = load_manifest(self._manifest_path(stage.name, key), STAGE_CACHE_SCHEMA_VERSION)
+        if not manifest:
+            if not changes:
+                changes.append("no cached outputs for this key")
+            return Decision("run", changes[0] if len(changes) == 1 else f"{changes[0]} (+{len(changes) - 1} more)",
+                            changes, frozenset(changed), key, components)
+
+        # A manifest exists for this exact key: compare outputs on disk with it
+        produced = last.get("outputs", {})
+        restore, edited = {}, []
+        for name, sha in manifest["outputs"].items():
+            current = self._hash_file(self._path(name), signatures.get(name))
+            if current == sha:
+                continue
+            if current is not None and current != produced.get(name):
+                edited.append(name)
+            elif self._object(sha).exists():
+                restore[name] = sha
+            else:
+                edited.append(name)
+
+        if edited:
+            details = changes + [f"output {name} differs from the cached result" for name in edited]
+            return Decision("run", f"output {edited[0]} differs from the cached result", details,
+                            frozenset(changed | {"outputs"}), key, components)
+        if restore:
+            details = changes + [f"output {name} restored from cache" for name in restore]
+            return Decision("restore", f"restored {len(restore)} output(s) from cache", details,
+                            frozenset(changed), key, components, restore)
+        return Decision("skip", f"cache hit ({key[:12]})", changes or ["inputs, code and config unchanged"],
+                        frozenset(changed), key, components)
+
+    # ──────────── writes ────────────
+
+    def _store_object(self, path: Path, sha: str) -> None:
+        target = self._object(sha)
+        if target.exists():
+            return
+        with atomic_path(target) as tmp:
+            shutil.copyfile(path, tmp)
+
+    def restore(self, stage, decision: Decision) -> None:
+        """Copy the cached outputs listed in ``decision`` back into place."""
+        for name, sha in decision.restore.items():
+            path = self._path(name)
+            with atomic_path(path) as tmp:
+                shutil.copyfile(self._object(sha), tmp)
+        self._record_last(stage, decision.key, decision.components, self._hash_files(stage.outputs(), {}))
+
+    def record(self, stage, decision: Decision) -> None:
+        """
+        Store ``stage``'s outputs after a successful run.
+
+        Stages that rewrite their own inputs (e.g. cleaning CSVs in place) are
+        also recorded under the post-run key, so the next run is a cache hit.
+        """
+        outputs = self._hash_files(stage.outputs(), {})
+        for name, sha in outputs.items():
+            self._store_object(self._path(name), sha)
+
+        after = self.components(stage, self._signatures)
+        final_key = self.key(stage.name, after)
+        for key in {decision.key, final_key}:
+            save_manifest(self._manifest_path(stage.name, key), {"outputs": outputs}, STAGE_CACHE_SCHEMA_VERSION)
+        self._record_last(stage, final_key, after, outputs)
+
+    def _record_last(self, stage, key: str, components: Mapping[str, Any], outputs: Mapping[str, str]) -> None:
+        names = set(components["inputs"]) | set(components["code"]) | set(outputs)
+        save_manifest(self._last_path(stage.name), {
+            "key": key,
+            "components": components,
+            "outputs": dict(outputs),
+            "signatures": {n: self._signatures[n] for n in names if n in self._signatures},
+        }, STAGE_CACHE_SCHEMA_VERSION)
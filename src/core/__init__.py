@@ -2,7 +2,16 @@
 Core analysis modules for La Liga Forwards Analysis.
 """
 
-from .analysis import calculate_player_score
-from .players_data import players, points_system
+from .analysis import calculate_player_score, score_players
+from .dataset import PlayerDataset
+from .players_data import load_dataset, load_tables, players, points_system
 
-__all__ = ["calculate_player_score", "players", "points_system"]
+__all__ = [
+    "calculate_player_score",
+    "score_players",
+    "PlayerDataset",
+    "load_dataset",
+    "load_tables",
+    "players",
+    "points_system",
+]
@@ -0,0 +1,87 @@
+"""
+Shared per-player stat aggregation.
+
+The app, the static site generator and the radar chart all derive the same
+season counts (golden boots, 20+ goal seasons, cup finals, ...). They all call
+aggregate_player_stats(), which computes every derived column with vectorised
+group-bys over the PlayerDataset season and label tables, and then select the
+columns they display.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+import pandas as pd
+
+from .analysis import score_players
+from .dataset import PlayerDataset
+
+# Column sets used by each consumer, in display order
+APP_STATS_COLUMNS: List[str] = [
+    'Player', 'Career Goals', 'La Liga Titles', 'Champions League Titles', "Ballon d'Or Wins",
+    'Total Score', 'La Liga Golden Boots', '20+ Goal Seasons', '10+ Assist Seasons',
+    'Cup Final Wins', 'CL Top Scorer Awards',
+]
+STATIC_STATS_COLUMNS: List[str] = [
+    'Player', 'Career Goals', 'La Liga Titles', 'Champions League Titles', "Ballon d'Or Wins",
+    'Total Score', 'La Liga Golden Boots', 'La Liga Best Player Awards', '20+ Goal Seasons',
+    '10+ Assist Seasons', 'Cup Final Wins', 'CL Top Scorer Awards',
+    'Season Goals (Sample)', 'Season Assists (Sample)',
+]
+# Axes of the player comparison radar (radar_diagram.py and the app's radar tab)
+RADAR_METRICS: List[str] = [
+    'Career Goals', 'La Liga Titles', 'Champions League Titles', "Ballon d'Or Wins",
+    'La Liga Golden Boots', '20+ Goal Seasons', '10+ Assist Seasons', 'Cup Final Wins',
+    'CL Top Scorer Awards',
+]
+RADAR_STATS_COLUMNS: List[str] = ['Player'] + RADAR_METRICS
+
+
+def aggregate_player_stats(
+    players: Mapping[str, Dict[str, Any]],
+    points_system: Optional[Mapping[str, int]] = None,
+) -> pd.DataFrame:
+    """
+    Compute every derived per-player stat column in one pass over the season table.
+
+    Args:
+        players: PlayerDataset or mapping of player name to player data
+        points_system: If given, a 'Total Score' column is added via score_players()
+
+    Returns:
+        DataFrame with one row per player (in input order) and a 'Player' column
+    """
+    dataset = PlayerDataset.from_players(players)
+    table = dataset.players
+    seasons = dataset.seasons
+
+    stats = {
+        'Player': [str(name) for name in dataset.names],
+        'Career Goals': table['career_goals'],
+        'La Liga Titles': table['total_la_liga_titles'],
+        'Champions League Titles': table['total_champions_league_titles'],
+        "Ballon d'Or Wins": dataset.label_count('career_awards', "Ballon d'Or Win"),
+    }
+    if points_system is not None:
+        stats['Total Score'] = score_players(dataset, points_system)
+
+    stats.update({
+        'La Liga Golden Boots': dataset.per_player(
+            dataset.seasons_with_label('awards', 'La Liga Golden Boot')
+        ),
+        'La Liga Best Player Awards': dataset.per_player(
+            dataset.seasons_with_label('awards', 'La Liga Best Player Award')
+        ),
+        '20+ Goal Seasons': dataset.per_player(seasons['goals'] >= 20),
+        '10+ Assist Seasons': dataset.per_player(seasons['assists'] >= 10),
+        'Cup Final Wins': dataset.per_player(seasons['cup_final_winner']),
+        'CL Top Scorer Awards': dataset.label_count('cl_achievements', 'CL Top Scorer'),
+        'Season Goals (Sample)': dataset.per_player(seasons['goals']),
+        'Season Assists (Sample)': dataset.per_player(seasons['assists']),
+    })
+    return pd.DataFrame(stats)
+
+
+def rank_scores(stats_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the Player/Score ranking table (highest score first) from aggregated stats."""
+    scores_df = stats_df[['Player', 'Total Score']].rename(columns={'Total Score': 'Score'})
+    return scores_df.sort_values(by='Score', ascending=False).reset_index(drop=True)
@@ -2,7 +2,14 @@
 Analysis functions for calculating player scores.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
+
+import numpy as np
+
+from .dataset import PlayerDataset
+
+# Team trophies that earn 'Other Trophies' points (major titles are counted via career totals)
+CUP_TROPHIES = ('Copa del Rey', 'Supercopa de España', 'UEFA Super Cup', 'FIFA Club World Cup')
 
 
 def calculate_player_score(player_data: Dict[str, Any], points_system: Dict[str, int]) -> int:
@@ -56,7 +63,7 @@ def calculate_player_score(player_data: Dict[str, Any], points_system: Dict[str,
         
         # Points for Cup Achievements (avoid double counting major titles)
         for achievement in season.get('team_achievements', []):
-            if achievement in ['Copa del Rey', 'Supercopa de España', 'UEFA Super Cup', 'FIFA Club World Cup']:
+            if achievement in CUP_TROPHIES:
                 season_score += points_system.get('Other Trophies', 0)
         
         # Cup Final Winner
@@ -70,3 +77,61 @@ def calculate_player_score(player_data: Dict[str, Any], points_system: Dict[str,
         total_score += season_score
     
     return total_score
+
+
+def score_players(players: Mapping[str, Dict[str, Any]], points_system: Dict[str, int]) -> np.ndarray:
+    """
+    Calculate scores for many players at once using array operations.
+
+    Produces exactly the same values as calling calculate_player_score() on
+    each player, but works on the columnar PlayerDataset (building one from a
+    plain dict if needed) and accumulates points with vectorised group sums
+    instead of nested loops.
+
+    Args:
+        players: PlayerDataset or mapping of player name to player data
+        points_system: Dictionary mapping achievements to point values
+
+    Returns:
+        int64 array of total scores aligned with the iteration order of ``players``
+    """
+    dataset = PlayerDataset.from_players(players)
+    if len(dataset) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    pts = points_system.get
+    table = dataset.players
+    seasons = dataset.seasons
+
+    # Career-level points
+    career_goals = table['career_goals']
+    scores = np.where(
+        career_goals >= 200,
+        pts('200+ La Liga Goals', 0),
+        np.where(career_goals >= 100, pts('100+ La Liga Goals', 0), 0),
+    ).astype(np.int64)
+    scores += dataset.label_count('career_awards', "Ballon d'Or Win") * pts("Ballon d'Or Win", 0)
+    scores += table['total_la_liga_titles'] * pts('La Liga Title', 0)
+    scores += table['total_champions_league_titles'] * pts('Champions League Win', 0)
+
+    # Season-level points
+    season_points = (
+        (seasons['goals'] >= 20) * pts('20+ Goal La Liga Season', 0)
+        + (seasons['assists'] >= 10) * pts('10+ Assist La Liga Season', 0)
+        + seasons['cup_final_winner'] * pts('Cup Final Winner', 0)
+    )
+    scores += dataset.per_player(season_points)
+
+    # Label points, looked up once per category code (Ballon d'Or is counted via career awards)
+    award_points = dataset.category_values(points_system)
+    award_points[[c == "Ballon d'Or Win" for c in dataset.categories]] = 0
+    scores += dataset.label_values('awards', award_points)
+
+    cup_points = np.asarray(
+        [pts('Other Trophies', 0) if c in CUP_TROPHIES else 0 for c in dataset.categories],
+        dtype=np.int64,
+    )
+    scores += dataset.label_values('team_achievements', cup_points)
+    scores += dataset.label_values('cl_achievements', dataset.category_values(points_system))
+
+    return scores
@@ -0,0 +1,259 @@
+"""
+Columnar player/season store.
+
+PlayerDataset keeps the player data in flat NumPy tables instead of the nested
+dict-of-dicts-of-lists produced by load_players():
+
+    - player table:  one row per player (name, career totals, team, position, ...)
+    - season table:  one row per season with an integer ``player_id``
+    - label tables:  awards, team achievements, CL achievements, career awards and
+                     team lists stored as (owner_id, code) pairs, where ``code`` is a
+                     small-int index into a shared ``categories`` vocabulary
+
+Rows are grouped by owner, so each player's seasons (and each season's labels) are a
+contiguous slice described by an offsets array. Aggregations become bincount/reduceat
+group-bys over those arrays, while the Mapping interface still hands out the familiar
+player dicts for older callers.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+PLAYER_COLUMNS = ('career_goals', 'total_la_liga_titles', 'total_champions_league_titles')
+PLAYER_TEXT_COLUMNS = ('team', 'position', 'nationality')
+SEASON_COLUMNS = ('goals', 'assists', 'matches_played', 'minutes')
+
+# Label tables owned by a player row vs. by a season row
+PLAYER_LABEL_TABLES = ('career_awards', 'teams')
+SEASON_LABEL_TABLES = ('awards', 'team_achievements', 'cl_achievements')
+LABEL_TABLES = PLAYER_LABEL_TABLES + SEASON_LABEL_TABLES
+
+
+def _code_dtype(num_categories: int) -> np.dtype:
+    """Smallest signed integer dtype able to hold every category code."""
+    return np.dtype(np.int16) if num_categories < np.iinfo(np.int16).max else np.dtype(np.int32)
+
+
+def _offsets(owners: np.ndarray, num_owners: int) -> np.ndarray:
+    """CSR-style offsets so rows for owner ``i`` are ``rows[offsets[i]:offsets[i + 1]]``."""
+    counts = np.bincount(owners, minlength=num_owners) if len(owners) else np.zeros(num_owners, int)
+    offsets = np.zeros(num_owners + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+class PlayerDataset(Mapping):
+    """
+    Columnar dataset of players, seasons and categorical award tables.
+
+    Behaves like a read-only ``Dict[str, Dict[str, Any]]`` keyed by player name;
+    indexing materialises a single player dict in the same shape as the JSON dataset.
+    """
+
+    def __init__(
+        self,
+        players: Dict[str, np.ndarray],
+        seasons: Dict[str, np.ndarray],
+        labels: Dict[str, Dict[str, np.ndarray]],
+        categories: List[str],
+    ):
+        """
+        Args:
+            players: Player table columns (``name`` plus PLAYER_COLUMNS / PLAYER_TEXT_COLUMNS)
+            seasons: Season table columns (``player_id``, ``season``, ``team`` codes,
+                     SEASON_COLUMNS and ``cup_final_winner``), grouped by player
+            labels: Label tables keyed by name, each with ``owner`` and ``code`` arrays
+            categories: Shared vocabulary that category codes index into
+        """
+        self.players = players
+        self.seasons = seasons
+        self.labels = labels
+        self.categories = list(categories)
+        self._categories = np.asarray(self.categories, dtype=object)
+        self._index = {str(name): i for i, name in enumerate(players['name'])}
+
+        num_players = len(players['name'])
+        num_seasons = len(seasons['player_id'])
+        self.season_offsets = _offsets(seasons['player_id'], num_players)
+        self.label_offsets = {
+            table: _offsets(
+                labels[table]['owner'],
+                num_players if table in PLAYER_LABEL_TABLES else num_seasons,
+            )
+            for table in LABEL_TABLES
+        }
+
+    # ──────────────────────── Construction ────────────────────────
+
+    @classmethod
+    def from_players(cls, players: Mapping[str, Dict[str, Any]]) -> 'PlayerDataset':
+        """Build a columnar dataset from the nested player dict structure."""
+        if isinstance(players, PlayerDataset):
+            return players
+
+        vocab: Dict[str, int] = {}
+
+        def code(label: Any) -> int:
+            return vocab.setdefault(label, len(vocab))
+
+        player_cols: Dict[str, list] = {c: [] for c in ('name',) + PLAYER_COLUMNS + PLAYER_TEXT_COLUMNS}
+        season_cols: Dict[str, list] = {
+            c: [] for c in ('player_id', 'season', 'team', 'cup_final_winner') + SEASON_COLUMNS
+        }
+        label_rows: Dict[str, tuple] = {table: ([], []) for table in LABEL_TABLES}
+
+        for player_id, (name, data) in enumerate(players.items()):
+            player_cols['name'].append(name)
+            for col in PLAYER_COLUMNS:
+                player_cols[col].append(data.get(col, 0))
+            for col in PLAYER_TEXT_COLUMNS:
+                player_cols[col].append(data.get(col, ''))
+            for table in PLAYER_LABEL_TABLES:
+                values = data.get(table, [])
+                label_rows[table][0].extend([player_id] * len(values))
+                label_rows[table][1].extend(code(v) for v in values)
+
+            for season in data.get('seasons', []):
+                season_id = len(season_cols['player_id'])
+                season_cols['player_id'].append(player_id)
+                season_cols['season'].append(code(season.get('season', '')))
+                season_cols['team'].append(code(season.get('team', '')))
+                season_cols['cup_final_winner'].append(bool(season.get('cup_final_winner', False)))
+                for col in SEASON_COLUMNS:
+                    season_cols[col].append(season.get(col, 0))
+                for table in SEASON_LABEL_TABLES:
+                    values = season.get(table, [])
+                    label_rows[table][0].extend([season_id] * len(values))
+                    label_rows[table][1].extend(code(v) for v in values)
+
+        code_dtype = _code_dtype(len(vocab))
+        player_table = {'name': np.asarray(player_cols['name'], dtype=object)}
+        for col in PLAYER_COLUMNS:
+            player_table[col] = np.asarray(player_cols[col], dtype=np.int64)
+        for col in PLAYER_TEXT_COLUMNS:
+            player_table[col] = np.asarray(player_cols[col], dtype=object)
+
+        season_table = {
+            'player_id': np.asarray(season_cols['player_id'], dtype=np.int32),
+            'season': np.asarray(season_cols['season'], dtype=code_dtype),
+            'team': np.asarray(season_cols['team'], dtype=code_dtype),
+            'cup_final_winner': np.asarray(season_cols['cup_final_winner'], dtype=bool),
+        }
+        for col in SEASON_COLUMNS:
+            season_table[col] = np.asarray(season_cols[col], dtype=np.int64)
+
+        label_tables = {
+            table: {
+                'owner': np.asarray(owners, dtype=np.int32),
+                'code': np.asarray(codes, dtype=code_dtype),
+            }
+            for table, (owners, codes) in label_rows.items()
+        }
+        return cls(player_table, season_table, label_tables, list(vocab))
+
+    # ──────────────────────── Mapping interface ────────────────────────
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._player_dict(self._index[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Materialise the full nested dict structure returned by load_players()."""
+        return {name: self._player_dict(i) for name, i in self._index.items()}
+
+    def _labels_for(self, table: str, owner: int) -> List[str]:
+        start, stop = self.label_offsets[table][owner], self.label_offsets[table][owner + 1]
+        return self._categories[self.labels[table]['code'][start:stop]].tolist()
+
+    def _player_dict(self, player_id: int) -> Dict[str, Any]:
+        p, s = self.players, self.seasons
+        seasons = []
+        for season_id in range(self.season_offsets[player_id], self.season_offsets[player_id + 1]):
+            seasons.append({
+                'season': self.categories[s['season'][season_id]],
+                'team': self.categories[s['team'][season_id]],
+                'goals': int(s['goals'][season_id]),
+                'assists': int(s['assists'][season_id]),
+                'matches_played': int(s['matches_played'][season_id]),
+                'minutes': int(s['minutes'][season_id]),
+                'awards': self._labels_for('awards', season_id),
+                'team_achievements': self._labels_for('team_achievements', season_id),
+                'cup_final_winner': bool(s['cup_final_winner'][season_id]),
+                'cl_achievements': self._labels_for('cl_achievements', season_id),
+            })
+        return {
+            'career_goals': int(p['career_goals'][player_id]),
+            'team': str(p['team'][player_id]),
+            'teams': self._labels_for('teams', player_id),
+            'position': str(p['position'][player_id]),
+            'nationality': str(p['nationality'][player_id]),
+            'seasons': seasons,
+            'career_awards': self._labels_for('career_awards', player_id),
+            'total_la_liga_titles': int(p['total_la_liga_titles'][player_id]),
+            'total_champions_league_titles': int(p['total_champions_league_titles'][player_id]),
+        }
+
+    # ──────────────────────── Vectorised group-bys ────────────────────────
+
+    @property
+    def names(self) -> np.ndarray:
+        """Player names in row order."""
+        return self.players['name']
+
+    def category_code(self, label: str) -> Optional[int]:
+        """Code for ``label`` in the shared vocabulary, or None if it never occurs."""
+        try:
+            return self.categories.index(label)
+        except ValueError:
+            return None
+
+    def category_values(self, mapping: Mapping[str, int], default: int = 0) -> np.ndarray:
+        """Vector of ``mapping[category]`` for every category code (e.g. points per label)."""
+        return np.asarray([mapping.get(c, default) for c in self.categories], dtype=np.int64)
+
+    def per_player(self, season_values: np.ndarray) -> np.ndarray:
+        """Sum a per-season array into a per-player array."""
+        return np.bincount(
+            self.seasons['player_id'], weights=season_values, minlength=len(self)
+        ).astype(np.int64)
+
+    def label_player_ids(self, table: str) -> np.ndarray:
+        """Player id for every row of a label table."""
+        owners = self.labels[table]['owner']
+        if table in PLAYER_LABEL_TABLES:
+            return owners
+        return self.seasons['player_id'][owners]
+
+    def label_values(self, table: str, values: np.ndarray) -> np.ndarray:
+        """Sum per-category ``values`` (indexed by code) over a label table, per player."""
+        codes = self.labels[table]['code']
+        return np.bincount(
+            self.label_player_ids(table), weights=values[codes], minlength=len(self)
+        ).astype(np.int64)
+
+    def label_count(self, table: str, label: str) -> np.ndarray:
+        """Number of occurrences of ``label`` in a label table, per player."""
+        code = self.category_code(label)
+        if code is None:
+            return np.zeros(len(self), dtype=np.int64)
+        mask = self.labels[table]['code'] == code
+        return np.bincount(self.label_player_ids(table)[mask], minlength=len(self)).astype(np.int64)
+
+    def seasons_with_label(self, table: str, label: str) -> np.ndarray:
+        """Boolean per-season mask: does the season's label list contain ``label``."""
+        mask = np.zeros(len(self.seasons['player_id']), dtype=bool)
+        code = self.category_code(label)
+        if code is not None:
+            table_rows = self.labels[table]
+            mask[table_rows['owner'][table_rows['code'] == code]] = True
+        return mask
@@ -0,0 +1,157 @@
+"""
+Compiled binary cache for the processed player dataset.
+
+Parsing the pretty-printed la_liga_all_players.json grows with every season the
+pipeline adds. This module compiles the JSON once into a sidecar directory of
+``.npy`` arrays (one per PlayerDataset column) next to the source file:
+
+    data/processed/la_liga_all_players.json
+    data/processed/la_liga_all_players.cache/
+        manifest.json            schema version + source size/mtime/sha256
+        players.name.npy         ...one file per column
+
+Arrays are loaded with ``mmap_mode='r'`` so a warm start maps the columns instead
+of parsing anything. The cache is rebuilt automatically when the schema version
+changes or the source JSON changes (size/mtime fast path, sha256 to confirm).
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+from .dataset import LABEL_TABLES, PlayerDataset
+from .file_utils import atomic_write, file_sha256
+
+log = logging.getLogger(__name__)
+
+CACHE_SCHEMA_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def cache_dir_for(source: Path) -> Path:
+    """Sidecar cache directory for a source JSON file."""
+    return source.with_suffix(".cache")
+
+
+def _source_stat(source: Path) -> Dict[str, int]:
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_manifest(cache_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("schema_version") != CACHE_SCHEMA_VERSION:
+        return None
+    return manifest
+
+
+def _dataset_arrays(dataset: PlayerDataset) -> Dict[str, np.ndarray]:
+    """Flatten a dataset into named arrays; text columns become fixed-width unicode."""
+    arrays: Dict[str, np.ndarray] = {}
+    for col, values in dataset.players.items():
+        arrays[f"players.{col}"] = values.astype(str) if values.dtype == object else values
+    for col, values in dataset.seasons.items():
+        arrays[f"seasons.{col}"] = values
+    for table in LABEL_TABLES:
+        for col, values in dataset.labels[table].items():
+            arrays[f"labels.{table}.{col}"] = values
+    arrays["categories"] = np.asarray([str(c) for c in dataset.categories], dtype=str)
+    return arrays
+
+
+def save_dataset_cache(dataset: PlayerDataset, cache_dir: Path, source_info: Dict[str, Any]) -> None:
+    """Write every dataset column to ``cache_dir``; the manifest is written last."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+    arrays = _dataset_arrays(dataset)
+    for name, values in arrays.items():
+        atomic_write(cache_dir / f"{name}.npy", lambda f, v=values: np.save(f, v, allow_pickle=False))
+
+    manifest = {
+        "schema_version": CACHE_SCHEMA_VERSION,
+        "source": source_info,
+        "arrays": sorted(arrays),
+    }
+    atomic_write(
+        cache_dir / MANIFEST_NAME,
+        lambda f: json.dump(manifest, f, indent=2),
+        mode="w",
+    )
+
+
+def load_dataset_cache(cache_dir: Path, manifest: Mapping[str, Any]) -> PlayerDataset:
+    """Memory-map the cached arrays back into a PlayerDataset."""
+    arrays = {
+        name: np.load(cache_dir / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+        for name in manifest["arrays"]
+    }
+    players = {k.split(".", 1)[1]: v for k, v in arrays.items() if k.startswith("players.")}
+    seasons = {k.split(".", 1)[1]: v for k, v in arrays.items() if k.startswith("seasons.")}
+    labels: Dict[str, Dict[str, np.ndarray]] = {table: {} for table in LABEL_TABLES}
+    for key, values in arrays.items():
+        if key.startswith("labels."):
+            _, table, col = key.split(".")
+            labels[table][col] = values
+    return PlayerDataset(players, seasons, labels, arrays["categories"].tolist())
+
+
+def _refresh_manifest(cache_dir: Path, manifest: Mapping[str, Any]) -> None:
+    """Record the new source mtime so the next load takes the fast path again."""
+    try:
+        atomic_write(cache_dir / MANIFEST_NAME, lambda f: json.dump(manifest, f, indent=2), mode="w")
+    except OSError as e:
+        log.debug("Could not refresh cache manifest %s: %s", cache_dir, e)
+
+
+def load_cached_dataset(
+    source: Path,
+    build: Callable[[Path], Mapping[str, Dict[str, Any]]],
+    cache_dir: Optional[Path] = None,
+) -> PlayerDataset:
+    """
+    Load ``source`` through its compiled cache, rebuilding the cache if stale.
+
+    Args:
+        source: Path to the JSON dataset
+        build: Function that parses ``source`` into the nested player dict
+        cache_dir: Override for the sidecar directory (defaults to cache_dir_for(source))
+
+    Returns:
+        PlayerDataset backed by memory-mapped arrays when the cache is usable
+    """
+    cache_dir = cache_dir or cache_dir_for(source)
+    stat = _source_stat(source)
+    manifest = _read_manifest(cache_dir)
+
+    digest = None
+    if manifest is not None:
+        try:
+            cached = manifest["source"]
+            if cached.get("size") == stat["size"] and cached.get("mtime_ns") == stat["mtime_ns"]:
+                return load_dataset_cache(cache_dir, manifest)
+
+            # mtime changed (e.g. fresh checkout); confirm with the content hash before rebuilding
+            digest = file_sha256(source)
+            if cached.get("sha256") == digest:
+                manifest["source"] = {**stat, "sha256": digest}
+                _refresh_manifest(cache_dir, manifest)
+                return load_dataset_cache(cache_dir, manifest)
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Ignoring unreadable dataset cache %s: %s", cache_dir, e)
+
+    digest = digest or file_sha256(source)
+    dataset = PlayerDataset.from_players(build(source))
+    try:
+        save_dataset_cache(dataset, cache_dir, {**stat, "sha256": digest})
+        log.info("Compiled dataset cache for %s at %s", source.name, cache_dir)
+    except OSError as e:
+        log.warning("Could not write dataset cache to %s: %s", cache_dir, e)
+    return dataset
@@ -0,0 +1,215 @@
+"""
+Reading and writing the processed player dataset file.
+
+The dataset is a single JSON document, ``{"metadata": {...}, "players": {...}}``,
+written in one of three formats:
+
+    pretty    indent=2, one key per line (diff-friendly; the historical format)
+    compact   no indentation, one player per line
+    gzip      compact, gzip-compressed
+
+Writers stream one player at a time instead of serialising the whole document in
+one call, and read_dataset_json() detects the format from the file's leading
+bytes, so loaders don't need to know which one the pipeline produced.
+
+Alongside the dataset the pipeline writes a newline-delimited copy for single
+player lookups:
+
+    la_liga_all_players.ndjson        one {"name": ..., "profile": ...} per line
+    la_liga_all_players.ndjson.idx    JSON: metadata + name -> [byte offset, length]
+
+read_ndjson_player() seeks to one line and parses only that player.
+"""
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from .file_utils import atomic_write, file_sha256
+
+DATASET_FORMATS = ("pretty", "compact", "gzip")
+GZIP_MAGIC = b"\x1f\x8b"
+NDJSON_INDEX_VERSION = 2
+
+PlayerItems = Union[Mapping[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]]
+
+
+def is_gzip_file(path: Path) -> bool:
+    """True if ``path`` starts with the gzip magic number."""
+    with open(path, "rb") as f:
+        return f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+
+def open_dataset_text(path: Path):
+    """Open a dataset file for reading as text, transparently decompressing gzip."""
+    if is_gzip_file(path):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def read_dataset_json(path: Path) -> Dict[str, Any]:
+    """Parse a dataset file written in any of DATASET_FORMATS."""
+    with open_dataset_text(Path(path)) as f:
+        return json.load(f)
+
+
+def _write_pretty(f, metadata: Mapping[str, Any], players: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+    # Byte-for-byte what json.dump(document, indent=2, ensure_ascii=False) produces
+    meta = json.dumps(metadata, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+    f.write('{\n  "metadata": ' + meta + ',\n  "players": {')
+    empty = True
+    for name, profile in players:
+        body = json.dumps(profile, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+        f.write(("\n" if empty else ",\n") + "    " + json.dumps(name, ensure_ascii=False) + ": " + body)
+        empty = False
+    f.write("}\n}" if empty else "\n  }\n}")
+
+
+def _write_compact(f, metadata: Mapping[str, Any], players: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+    def dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    f.write('{"metadata":' + dumps(metadata) + ',"players":{')
+    for i, (name, profile) in enumerate(players):
+        f.write(("\n" if i == 0 else ",\n") + dumps(name) + ":" + dumps(profile))
+    f.write("}}\n")
+
+
+def write_dataset_json(
+    path: Path,
+    metadata: Mapping[str, Any],
+    players: PlayerItems,
+    fmt: str = "pretty",
+) -> None:
+    """
+    Stream the dataset document to ``path`` one player at a time.
+
+    Args:
+        path: Output file; written via a temp file + rename
+        metadata: The document's "metadata" object
+        players: Mapping of name -> profile, or an iterable of (name, profile) pairs
+        fmt: One of DATASET_FORMATS
+    """
+    if fmt not in DATASET_FORMATS:
+        raise ValueError(f"Unknown dataset format {fmt!r}; expected one of {DATASET_FORMATS}")
+    items = players.items() if isinstance(players, Mapping) else players
+
+    def write(raw) -> None:
+        if fmt == "gzip":
+            # No name and mtime=0 keep the output reproducible for identical data
+            with gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as gz:
+                with io.TextIOWrapper(gz, encoding="utf-8", newline="") as f:
+                    _write_compact(f, metadata, items)
+        else:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                (_write_pretty if fmt == "pretty" else _write_compact)(f, metadata, items)
+
+    atomic_write(Path(path), write)
+
+
+# ──────────────────────── NDJSON + offset index ────────────────────────
+
+def ndjson_paths(dataset_path: Path) -> Tuple[Path, Path]:
+    """The NDJSON copy and offset index that sit next to ``dataset_path``."""
+    ndjson = Path(dataset_path).with_suffix(".ndjson")
+    return ndjson, ndjson.with_name(ndjson.name + ".idx")
+
+
+def write_dataset_ndjson(
+    dataset_path: Path,
+    metadata: Mapping[str, Any],
+    players: PlayerItems,
+) -> None:
+    """
+    Write the NDJSON copy of the dataset and its name -> byte offset index.
+
+    The index records the size of the NDJSON file and the size, mtime and
+    sha256 of ``dataset_path`` (which must already be written), so a lookup
+    can tell whether either file was replaced without regenerating the other.
+    """
+    items = players.items() if isinstance(players, Mapping) else players
+    ndjson_path, index_path = ndjson_paths(dataset_path)
+    offsets: Dict[str, Tuple[int, int]] = {}
+
+    def write_lines(raw) -> None:
+        position = 0
+        for name, profile in items:
+            line = json.dumps({"name": name, "profile": profile}, ensure_ascii=False, separators=(",", ":"))
+            encoded = line.encode("utf-8") + b"\n"
+            raw.write(encoded)
+            offsets[name] = (position, len(encoded))
+            position += len(encoded)
+
+    atomic_write(ndjson_path, write_lines)
+
+    stat = Path(dataset_path).stat()
+    index = {
+        "version": NDJSON_INDEX_VERSION,
+        "dataset": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(Path(dataset_path))},
+        "ndjson_size": ndjson_path.stat().st_size,
+        "metadata": dict(metadata),
+        "offsets": offsets,
+    }
+    atomic_write(
+        index_path, lambda raw: raw.write(json.dumps(index, ensure_ascii=False).encode("utf-8"))
+    )
+
+
+def load_ndjson_index(dataset_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the offset index for ``dataset_path``.
+
+    Returns None if the index is missing, unreadable, from another version, or
+    out of step with the dataset's content or the NDJSON file's size. The
+    dataset's size and mtime are the fast path; if only the mtime moved, its
+    sha256 decides, so a same-size edit is still caught.
+    """
+    ndjson_path, index_path = ndjson_paths(dataset_path)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        stat = Path(dataset_path).stat()
+        ndjson_size = ndjson_path.stat().st_size
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(index, dict)
+        or index.get("version") != NDJSON_INDEX_VERSION
+        or not isinstance(index.get("dataset"), dict)
+        or index["dataset"].get("size") != stat.st_size
+        or index.get("ndjson_size") != ndjson_size
+    ):
+        return None
+    recorded = index["dataset"]
+    if recorded.get("mtime_ns") != stat.st_mtime_ns:
+        try:
+            if recorded.get("sha256") != file_sha256(Path(dataset_path)):
+                return None
+        except OSError:
+            return None
+    return index
+
+
+def read_ndjson_player(dataset_path: Path, index: Mapping[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """
+    Seek to ``name``'s line in the NDJSON copy and parse just that player.
+
+    Returns None if the player is not in the index; raises ValueError if the
+    line at the indexed offset is not that player's record.
+    """
+    entry = index["offsets"].get(name)
+    if entry is None:
+        return None
+    offset, length = entry
+    with open(ndjson_paths(dataset_path)[0], "rb") as f:
+        f.seek(offset)
+        line = f.read(length)
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"Corrupt NDJSON record for {name!r} at offset {offset}") from exc
+    if not isinstance(record, dict) or record.get("name") != name:
+        raise ValueError(f"NDJSON index is out of date: offset {offset} does not hold {name!r}")
+    return record["profile"]
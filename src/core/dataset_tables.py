@@ -0,0 +1,256 @@
+"""
+Normalized table export of the processed dataset (Arrow IPC, optional pyarrow).
+
+The nested JSON is convenient for the pipeline but awkward for anything that only
+needs a few columns. This module flattens a PlayerDataset into normalized tables:
+
+    players            player_id, name, team, position, nationality, career totals
+    seasons            season_id, player_id, season, team, goals, assists, ...
+    awards             season_id, player_id, label      (per-season awards)
+    team_achievements  season_id, player_id, label
+    cl_achievements    season_id, player_id, label
+    career_awards      player_id, label
+    teams              player_id, label
+    categories         label                            (shared label vocabulary)
+
+Label, season and team columns are categoricals over the shared vocabulary, so
+they map straight back onto PlayerDataset's integer codes.
+
+When pyarrow is installed the pipeline writes the tables as uncompressed Arrow
+IPC files next to the JSON dataset:
+
+    data/processed/la_liga_all_players.json
+    data/processed/la_liga_all_players.arrow/
+        manifest.json            schema version + source size/mtime/sha256
+        players.arrow            ...one file per table
+
+Readers memory-map the files, so worker processes share one copy of the data in
+the page cache and a column projection only touches the columns it selects.
+dataset_from_arrow() hands out numeric columns and category codes as read-only
+views of the mapped buffers; only strings and booleans are converted.
+Without pyarrow, dataset_frames() builds the same tables from the JSON instead.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .dataset import (
+    LABEL_TABLES,
+    PLAYER_COLUMNS,
+    PLAYER_LABEL_TABLES,
+    PLAYER_TEXT_COLUMNS,
+    SEASON_COLUMNS,
+    PlayerDataset,
+    _code_dtype,
+)
+from .file_utils import atomic_write, file_sha256
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+log = logging.getLogger(__name__)
+
+TABLES_SCHEMA_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+TABLE_NAMES = ("players", "seasons") + LABEL_TABLES + ("categories",)
+
+# Column projection: table name -> columns to read (None for every column)
+Projection = Mapping[str, Optional[Sequence[str]]]
+
+
+def tables_dir_for(source: Path) -> Path:
+    """Sidecar directory holding the Arrow tables for a source JSON file."""
+    return Path(source).with_suffix(".arrow")
+
+
+# ──────────────────────── Normalized frames ────────────────────────
+
+def dataset_frames(dataset: PlayerDataset) -> Dict[str, pd.DataFrame]:
+    """Flatten a PlayerDataset into the normalized tables listed in TABLE_NAMES."""
+    categories = [str(c) for c in dataset.categories]
+
+    def categorical(codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(np.asarray(codes), categories=categories)
+
+    p, s = dataset.players, dataset.seasons
+    num_players, num_seasons = len(p['name']), len(s['player_id'])
+
+    frames = {
+        'players': pd.DataFrame({
+            'player_id': np.arange(num_players, dtype=np.int32),
+            'name': np.asarray(p['name']).astype(str),
+            **{col: np.asarray(p[col]).astype(str) for col in PLAYER_TEXT_COLUMNS},
+            **{col: np.asarray(p[col], dtype=np.int64) for col in PLAYER_COLUMNS},
+        }),
+        'seasons': pd.DataFrame({
+            'season_id': np.arange(num_seasons, dtype=np.int32),
+            'player_id': np.asarray(s['player_id'], dtype=np.int32),
+            'season': categorical(s['season']),
+            'team': categorical(s['team']),
+            **{col: np.asarray(s[col], dtype=np.int64) for col in SEASON_COLUMNS},
+            'cup_final_winner': np.asarray(s['cup_final_winner'], dtype=bool),
+        }),
+        'categories': pd.DataFrame({'label': categories}),
+    }
+    for table in LABEL_TABLES:
+        owners = np.asarray(dataset.labels[table]['owner'], dtype=np.int32)
+        if table in PLAYER_LABEL_TABLES:
+            columns = {'player_id': owners}
+        else:
+            columns = {'season_id': owners, 'player_id': np.asarray(s['player_id'])[owners]}
+        frames[table] = pd.DataFrame({**columns, 'label': categorical(dataset.labels[table]['code'])})
+    return frames
+
+
+def project_frames(frames: Mapping[str, pd.DataFrame], columns: Optional[Projection] = None) -> Dict[str, pd.DataFrame]:
+    """Apply a column projection to already-built frames."""
+    if columns is None:
+        return dict(frames)
+    return {
+        table: frames[table] if cols is None else frames[table][list(cols)]
+        for table, cols in columns.items()
+    }
+
+
+# ──────────────────────── Arrow IPC files ────────────────────────
+
+def _require_pyarrow() -> None:
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for Arrow tables (pip install pyarrow)")
+
+
+def write_arrow_tables(source: Path, dataset: PlayerDataset, tables_dir: Optional[Path] = None) -> Path:
+    """
+    Write every normalized table of ``dataset`` as an Arrow IPC file.
+
+    The manifest records ``source``'s size, mtime and sha256 and is written
+    last, so a half-written directory is never mistaken for a fresh one.
+    """
+    _require_pyarrow()
+    source = Path(source)
+    tables_dir = tables_dir or tables_dir_for(source)
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    (tables_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+    # Dictionary indices use PlayerDataset's code dtype, so readers can map them without a cast
+    index_type = pa.from_numpy_dtype(_code_dtype(len(dataset.categories)))
+    for name, frame in dataset_frames(dataset).items():
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        schema = pa.schema([
+            field.with_type(pa.dictionary(index_type, field.type.value_type))
+            if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ])
+        table = table.cast(schema)
+
+        def write(f, table=table):
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+        atomic_write(tables_dir / f"{name}.arrow", write)
+
+    stat = source.stat()
+    manifest = {
+        "schema_version": TABLES_SCHEMA_VERSION,
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(source)},
+        "tables": list(TABLE_NAMES),
+    }
+    atomic_write(tables_dir / MANIFEST_NAME, lambda f: json.dump(manifest, f, indent=2), mode="w")
+    return tables_dir
+
+
+def fresh_tables_dir(source: Path, tables_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    The Arrow tables directory for ``source`` if it is current, else None.
+
+    Size and mtime are the fast path; if only the mtime moved (e.g. a fresh
+    checkout) the content hash decides.
+    """
+    source = Path(source)
+    tables_dir = tables_dir or tables_dir_for(source)
+    try:
+        with open(tables_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+        recorded = manifest["source"]
+        stat = source.stat()
+        if manifest.get("schema_version") != TABLES_SCHEMA_VERSION or recorded["size"] != stat.st_size:
+            return None
+        if recorded["mtime_ns"] != stat.st_mtime_ns and recorded["sha256"] != file_sha256(source):
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return tables_dir
+
+
+def read_arrow_tables(tables_dir: Path, columns: Optional[Projection] = None) -> Dict[str, "pa.Table"]:
+    """
+    Memory-map Arrow tables, reading only the projected tables and columns.
+
+    Args:
+        tables_dir: Directory written by write_arrow_tables()
+        columns: Table name -> columns to keep (None keeps every column);
+                 defaults to every column of every table
+    """
+    _require_pyarrow()
+    projection = columns if columns is not None else {name: None for name in TABLE_NAMES}
+    tables = {}
+    for name, cols in projection.items():
+        with pa.memory_map(str(Path(tables_dir) / f"{name}.arrow"), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        tables[name] = table if cols is None else table.select(list(cols))
+    return tables
+
+
+def _numpy(table: "pa.Table", column: str) -> np.ndarray:
+    """
+    Column as a NumPy array.
+
+    A single-chunk integer or float column without nulls (dictionary columns:
+    their indices) comes back as a read-only view of the memory-mapped buffer.
+    Only multi-chunk columns are combined, and only strings and bit-packed
+    booleans are converted into new arrays.
+    """
+    chunked = table.column(column)
+    array = chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        array = array.indices
+    fixed_width = pa.types.is_integer(array.type) or pa.types.is_floating(array.type)
+    return array.to_numpy(zero_copy_only=fixed_width and array.null_count == 0)
+
+
+def dataset_from_arrow(tables_dir: Path) -> PlayerDataset:
+    """Rebuild a PlayerDataset from memory-mapped Arrow tables."""
+    tables = read_arrow_tables(tables_dir)
+    categories = tables['categories'].column('label').to_pylist()
+    code_dtype = _code_dtype(len(categories))
+
+    p, s = tables['players'], tables['seasons']
+    players = {'name': _numpy(p, 'name').astype(object)}
+    players.update({col: _numpy(p, col) for col in PLAYER_COLUMNS})
+    players.update({col: _numpy(p, col).astype(object) for col in PLAYER_TEXT_COLUMNS})
+
+    seasons = {
+        'player_id': _numpy(s, 'player_id'),
+        'season': _numpy(s, 'season').astype(code_dtype, copy=False),
+        'team': _numpy(s, 'team').astype(code_dtype, copy=False),
+        'cup_final_winner': _numpy(s, 'cup_final_winner'),
+    }
+    seasons.update({col: _numpy(s, col) for col in SEASON_COLUMNS})
+
+    labels = {}
+    for table in LABEL_TABLES:
+        owner = 'player_id' if table in PLAYER_LABEL_TABLES else 'season_id'
+        labels[table] = {
+            'owner': _numpy(tables[table], owner),
+            'code': _numpy(tables[table], 'label').astype(code_dtype, copy=False),
+        }
+    return PlayerDataset(players, seasons, labels, categories)
@@ -0,0 +1,74 @@
+"""
+File helpers shared by the dataset caches and the pipeline scripts.
+
+Every generated file (dataset copies, caches, manifests, cleaned CSVs) is written
+through a temp file in the same directory and renamed into place, so readers,
+including live memory maps, never see a partial file. The temp file comes from
+``mkstemp`` (mode 0600); before the rename it gets the mode of the file it
+replaces, or the mode a plain ``open()`` would have given a new file.
+"""
+
+import hashlib
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+def _current_umask() -> int:
+    # os.umask can only be read by setting it; do it once, before any worker threads
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _current_umask()
+
+
+def file_sha256(path: Path) -> str:
+    """Content hash of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _target_mode(path: Path) -> int:
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """
+    Temp file path to build ``path`` in; renamed over ``path`` if the block succeeds.
+
+    For writers that need a file name rather than a file object (SQLite,
+    shutil.copyfile). On any exception the temp file is removed and ``path`` is
+    left as it was.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield Path(tmp)
+        os.chmod(tmp, _target_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path: Path, write: Callable[[Any], None], mode: str = "wb") -> None:
+    """Call ``write`` with a file opened in ``mode`` on a temp file, then rename it to ``path``."""
+    with atomic_path(path) as tmp:
+        with open(tmp, mode) as f:
+            write(f)
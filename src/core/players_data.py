@@ -7,10 +7,20 @@ produced by the data pipeline (scripts/scrape_fbref.py + scrape_wikipedia.py + m
 Falls back to a minimal built-in dataset if the JSON file is not found.
 """
 
-import json
 import logging
+import threading
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
+
+from .dataset import PlayerDataset
+from .dataset_cache import load_cached_dataset
+from .dataset_io import load_ndjson_index, ndjson_paths, read_dataset_json, read_ndjson_player
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .dataset_tables import Projection
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +55,29 @@ _DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 _VERIFIED_JSON = _DATA_DIR / "processed" / "la_liga_all_players.json"
 
 
+def _resolve_json_path(path: Path | str | None = None) -> Path | None:
+    """Return the JSON dataset to load (explicit path, then the verified dataset), if any."""
+    if path:
+        json_path = Path(path)
+        if json_path.exists():
+            return json_path
+
+    if _VERIFIED_JSON.exists():
+        return _VERIFIED_JSON
+
+    return None
+
+
+def _warn_fallback() -> None:
+    log.warning(
+        "Verified dataset not found at %s. "
+        "Run 'python scripts/scrape_fbref.py && python scripts/scrape_wikipedia.py "
+        "&& python scripts/merge_data.py' to generate it. "
+        "Using minimal fallback data.",
+        _VERIFIED_JSON,
+    )
+
+
 def load_players(path: Path | str | None = None) -> Dict[str, Dict[str, Any]]:
     """
     Load player data from the verified JSON dataset.
@@ -57,31 +90,85 @@ def load_players(path: Path | str | None = None) -> Dict[str, Dict[str, Any]]:
     The returned dict is keyed by player name and compatible with
     calculate_player_score() in analysis.py.
     """
-    # Try explicit path first
-    if path:
-        json_path = Path(path)
-        if json_path.exists():
-            return _load_from_json(json_path)
-
-    # Try the verified dataset
-    if _VERIFIED_JSON.exists():
-        return _load_from_json(_VERIFIED_JSON)
+    json_path = _resolve_json_path(path)
+    if json_path is not None:
+        return _load_from_json(json_path)
 
     # Fallback to built-in minimal dataset
-    log.warning(
-        "Verified dataset not found at %s. "
-        "Run 'python scripts/scrape_fbref.py && python scripts/scrape_wikipedia.py "
-        "&& python scripts/merge_data.py' to generate it. "
-        "Using minimal fallback data.",
-        _VERIFIED_JSON,
-    )
+    _warn_fallback()
     return _fallback_players()
 
 
+def load_dataset(path: Path | str | None = None, use_cache: bool = True) -> PlayerDataset:
+    """
+    Load player data as a columnar PlayerDataset.
+
+    Uses the same source priority as load_players(). With ``use_cache``, JSON
+    sources are read from the pipeline's Arrow tables when pyarrow is installed
+    and the tables are current (see dataset_tables.py), and otherwise through the
+    compiled sidecar cache (see dataset_cache.py); either way warm starts
+    memory-map the columns instead of re-parsing the JSON. The result can still
+    be indexed by player name for the nested dict view.
+    """
+    json_path = _resolve_json_path(path)
+    if json_path is None:
+        _warn_fallback()
+        return PlayerDataset.from_players(_fallback_players())
+
+    if not use_cache:
+        return PlayerDataset.from_players(_load_from_json(json_path))
+
+    # dataset_tables pulls in pandas and pyarrow; import it only on the load path
+    from . import dataset_tables
+
+    tables_dir = dataset_tables.fresh_tables_dir(json_path) if dataset_tables.HAS_PYARROW else None
+    if tables_dir is not None:
+        try:
+            return dataset_tables.dataset_from_arrow(tables_dir)
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("Ignoring unreadable Arrow tables %s: %s", tables_dir, exc)
+    return load_cached_dataset(json_path, _load_from_json)
+
+
+def load_tables(
+    columns: Optional["Projection"] = None,
+    path: Path | str | None = None,
+) -> Dict[str, "pd.DataFrame"]:
+    """
+    Load the normalized player tables as DataFrames, reading only what is asked for.
+
+    Args:
+        columns: Table name -> columns to load (None for every column of that
+                 table), e.g. ``{"seasons": ["player_id", "season", "goals"]}``;
+                 defaults to every table. Table names are listed in
+                 dataset_tables.TABLE_NAMES.
+        path: Dataset to load, with the same priority as load_players()
+
+    Current Arrow tables written by merge_data.py are memory-mapped and only the
+    projected columns are read. Without pyarrow (or without fresh tables) the
+    tables are built from the JSON dataset and then projected.
+    """
+    from . import dataset_tables
+
+    json_path = _resolve_json_path(path)
+    tables_dir = None
+    if dataset_tables.HAS_PYARROW and json_path is not None:
+        tables_dir = dataset_tables.fresh_tables_dir(json_path)
+    if tables_dir is not None:
+        try:
+            return {
+                name: table.to_pandas()
+                for name, table in dataset_tables.read_arrow_tables(tables_dir, columns).items()
+            }
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("Ignoring unreadable Arrow tables %s: %s", tables_dir, exc)
+
+    return dataset_tables.project_frames(dataset_tables.dataset_frames(load_dataset(path)), columns)
+
+
 def _load_from_json(path: Path) -> Dict[str, Dict[str, Any]]:
-    """Load player data from a JSON file."""
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
+    """Load player data from a JSON file (pretty, compact or gzip; see dataset_io.py)."""
+    data = read_dataset_json(path)
 
     # The JSON has {"metadata": {...}, "players": {...}} structure
     if "players" in data:
@@ -93,6 +180,51 @@ def _load_from_json(path: Path) -> Dict[str, Dict[str, Any]]:
     return players
 
 
+# Offset indexes parsed so far, keyed by dataset path; each entry remembers the
+# (size, mtime) of the dataset, NDJSON and index files it was validated against
+_ndjson_indexes: Dict[Path, tuple] = {}
+_ndjson_lock = threading.Lock()
+
+
+def _cached_ndjson_index(json_path: Path) -> Dict[str, Any] | None:
+    try:
+        key = tuple(
+            (stat.st_size, stat.st_mtime_ns)
+            for stat in (p.stat() for p in (json_path, *ndjson_paths(json_path)))
+        )
+    except OSError:
+        return None
+    with _ndjson_lock:
+        cached = _ndjson_indexes.get(json_path)
+        if cached is None or cached[0] != key:
+            cached = (key, load_ndjson_index(json_path))
+            _ndjson_indexes[json_path] = cached
+        return cached[1]
+
+
+def get_player(name: str, path: Path | str | None = None) -> Dict[str, Any] | None:
+    """
+    Load a single player's profile, or None if the player is unknown.
+
+    Uses the same source priority as load_players(). When the pipeline's NDJSON
+    copy and offset index sit next to the JSON dataset (see dataset_io.py), only
+    that player's line is read and parsed; the index itself is parsed once per
+    process. Otherwise the whole dataset is loaded.
+    """
+    json_path = _resolve_json_path(path)
+    if json_path is None:
+        return _fallback_players().get(name)
+
+    index = _cached_ndjson_index(json_path)
+    if index is not None:
+        try:
+            return read_ndjson_player(json_path, index, name)
+        except (OSError, ValueError) as exc:
+            log.warning("NDJSON lookup for %r failed (%s); loading the full dataset", name, exc)
+
+    return _load_from_json(json_path).get(name)
+
+
 def _fallback_players() -> Dict[str, Dict[str, Any]]:
     """
     Minimal fallback dataset with verified career stats for 7 legendary La Liga forwards.
@@ -334,6 +466,62 @@ def _fallback_players() -> Dict[str, Dict[str, Any]]:
 
 
 # ──────────────────────── Legacy compatibility ────────────────────────
+
+class LazyPlayers(MutableMapping):
+    """
+    Dict-like proxy that loads the player data on first access.
+
+    Importing this module no longer pays for the dataset load; the loader runs
+    once, under a lock, the first time the mapping is read (or written).
+    """
+
+    def __init__(self, loader: Callable[[], Dict[str, Dict[str, Any]]] = load_players):
+        self._loader = loader
+        self._data: Dict[str, Dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the underlying data has been materialised yet."""
+        return self._data is not None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._loader()
+                data = self._data
+        return data
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._load()[name]
+
+    def __setitem__(self, name: str, value: Dict[str, Any]) -> None:
+        self._load()[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._load()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._load()
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        """Shallow copy of the loaded data as a plain dict."""
+        return dict(self._load())
+
+    def __repr__(self) -> str:
+        if not self.loaded:
+            return f"<{type(self).__name__} (not loaded)>"
+        return f"<{type(self).__name__} ({len(self._data)} players)>"
+
+
 # The old code did `from core.players_data import players`
-# Keep this as a module-level dict that loads on import.
-players = load_players()
+# Keep that name working, but defer the load until the mapping is first used.
+players = LazyPlayers()
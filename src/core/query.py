@@ -0,0 +1,330 @@
+"""
+SQLite query engine for ad-hoc questions about players and seasons.
+
+The processed dataset is loaded into an indexed SQLite database (stdlib sqlite3,
+no server) built from the normalized tables in dataset_tables.py:
+
+    players            player_id, name, team, position, nationality, career totals
+    seasons            season_id, player_id, season, season_start, team, goals, ...
+    awards             season_id, player_id, award          (per-season awards)
+    team_achievements  season_id, player_id, achievement
+    cl_achievements    season_id, player_id, achievement
+    career_awards      player_id, award
+    player_teams       player_id, team
+    titles             view: player_id, name, season, season_start, team, title
+
+``season_start`` is the season's start year, so "2005-06 to 2014-15" is
+``season_start BETWEEN 2005 AND 2014``. The database sits next to the JSON
+dataset (la_liga_all_players.sqlite); merge_data.py --sqlite writes it, and
+open_database() (re)builds it on demand when it is missing or out of date.
+
+Every query helper returns a DataFrame, and score_players_sql() runs the scoring
+engine as one SQL aggregation so it can be checked against analysis.score_players().
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from .analysis import CUP_TROPHIES
+from .dataset import PlayerDataset
+from .dataset_tables import dataset_frames
+from .file_utils import atomic_path, file_sha256
+
+log = logging.getLogger(__name__)
+
+DB_SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE players (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    team TEXT,
+    position TEXT,
+    nationality TEXT,
+    career_goals INTEGER NOT NULL,
+    total_la_liga_titles INTEGER NOT NULL,
+    total_champions_league_titles INTEGER NOT NULL
+);
+CREATE TABLE seasons (
+    season_id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players (player_id),
+    season TEXT NOT NULL,
+    season_start INTEGER,
+    team TEXT,
+    goals INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    matches_played INTEGER NOT NULL,
+    minutes INTEGER NOT NULL,
+    cup_final_winner INTEGER NOT NULL
+);
+CREATE TABLE awards (season_id INTEGER NOT NULL, player_id INTEGER NOT NULL, award TEXT NOT NULL);
+CREATE TABLE team_achievements (season_id INTEGER NOT NULL, player_id INTEGER NOT NULL, achievement TEXT NOT NULL);
+CREATE TABLE cl_achievements (season_id INTEGER NOT NULL, player_id INTEGER NOT NULL, achievement TEXT NOT NULL);
+CREATE TABLE career_awards (player_id INTEGER NOT NULL, award TEXT NOT NULL);
+CREATE TABLE player_teams (player_id INTEGER NOT NULL, team TEXT NOT NULL);
+
+CREATE INDEX seasons_player ON seasons (player_id);
+CREATE INDEX seasons_start ON seasons (season_start);
+CREATE INDEX seasons_team ON seasons (team, season_start);
+CREATE INDEX awards_player ON awards (player_id);
+CREATE INDEX awards_award ON awards (award);
+CREATE INDEX team_achievements_player ON team_achievements (player_id);
+CREATE INDEX team_achievements_achievement ON team_achievements (achievement);
+CREATE INDEX cl_achievements_player ON cl_achievements (player_id);
+CREATE INDEX career_awards_player ON career_awards (player_id);
+CREATE INDEX player_teams_team ON player_teams (team);
+
+CREATE VIEW titles AS
+SELECT t.player_id, p.name, s.season, s.season_start, s.team, t.achievement AS title
+FROM team_achievements t
+JOIN seasons s ON s.season_id = t.season_id
+JOIN players p ON p.player_id = t.player_id;
+"""
+
+# Label tables: (dataset_tables frame, SQLite table, label column)
+_LABEL_TABLES = (
+    ('awards', 'awards', 'award'),
+    ('team_achievements', 'team_achievements', 'achievement'),
+    ('cl_achievements', 'cl_achievements', 'achievement'),
+    ('career_awards', 'career_awards', 'award'),
+    ('teams', 'player_teams', 'team'),
+)
+
+
+def database_path_for(source: Path) -> Path:
+    """SQLite database that sits next to a source JSON file."""
+    return Path(source).with_suffix(".sqlite")
+
+
+def _source_info(source: Path) -> Dict[str, str]:
+    stat = source.stat()
+    return {
+        "source_size": str(stat.st_size),
+        "source_mtime_ns": str(stat.st_mtime_ns),
+        "source_sha256": file_sha256(source),
+    }
+
+
+def _rows(frame: pd.DataFrame) -> list:
+    """DataFrame rows as plain Python tuples (categoricals as their labels)."""
+    columns = [
+        frame[c].astype(str) if isinstance(frame[c].dtype, pd.CategoricalDtype) else frame[c]
+        for c in frame.columns
+    ]
+    return list(zip(*(c.tolist() for c in columns)))
+
+
+def _populate(conn: sqlite3.Connection, players: Mapping[str, Dict[str, Any]], metadata: Mapping[str, str]) -> None:
+    frames = dataset_frames(PlayerDataset.from_players(players))
+    seasons = frames['seasons'].copy()
+    seasons.insert(
+        3, 'season_start',
+        seasons['season'].astype(str).str.extract(r'(\d{4})', expand=False).astype('Int64'),
+    )
+    seasons['cup_final_winner'] = seasons['cup_final_winner'].astype(int)
+    seasons['season_start'] = seasons['season_start'].astype(object).where(seasons['season_start'].notna(), None)
+
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO metadata VALUES (?, ?)",
+        [("schema_version", str(DB_SCHEMA_VERSION)), *metadata.items()],
+    )
+    conn.executemany("INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?)", _rows(frames['players']))
+    conn.executemany("INSERT INTO seasons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", _rows(seasons))
+    for frame_name, table, _ in _LABEL_TABLES:
+        frame = frames[frame_name]
+        placeholders = ", ".join("?" * len(frame.columns))
+        conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", _rows(frame))
+    conn.commit()
+
+
+def build_database(
+    players: Mapping[str, Dict[str, Any]],
+    db_path: Path,
+    source: Optional[Path] = None,
+) -> Path:
+    """
+    Write ``players`` to a fresh SQLite database at ``db_path``.
+
+    The database is built in a temp file and renamed into place. If ``source``
+    (the JSON dataset) is given, its size/mtime/sha256 are recorded so
+    database_is_current() can tell when it needs rebuilding.
+    """
+    db_path = Path(db_path)
+    with atomic_path(db_path) as tmp:
+        conn = sqlite3.connect(tmp)
+        try:
+            _populate(conn, players, _source_info(Path(source)) if source else {})
+        finally:
+            conn.close()
+    return db_path
+
+
+def database_is_current(db_path: Path, source: Path) -> bool:
+    """Whether ``db_path`` was built from the current contents of ``source``."""
+    try:
+        conn = sqlite3.connect(f"file:{Path(db_path).as_posix()}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM metadata").fetchall())
+        finally:
+            conn.close()
+        stat = Path(source).stat()
+    except (sqlite3.Error, OSError):
+        return False
+    if meta.get("schema_version") != str(DB_SCHEMA_VERSION) or meta.get("source_size") != str(stat.st_size):
+        return False
+    if meta.get("source_mtime_ns") == str(stat.st_mtime_ns):
+        return True
+    return meta.get("source_sha256") == file_sha256(Path(source))
+
+
+def open_database(source: Path | str | None = None, db_path: Path | str | None = None) -> sqlite3.Connection:
+    """
+    Open a read-only connection to the query database, building it if needed.
+
+    Args:
+        source: JSON dataset, with the same priority as load_players(); without
+                any dataset the built-in fallback players are loaded in memory
+        db_path: Override for the database file (defaults to database_path_for(source))
+    """
+    from .players_data import _fallback_players, _load_from_json, _resolve_json_path
+
+    json_path = _resolve_json_path(source)
+    if json_path is None:
+        conn = sqlite3.connect(":memory:")
+        _populate(conn, _fallback_players(), {})
+        return conn
+
+    db_path = Path(db_path) if db_path else database_path_for(json_path)
+    if not database_is_current(db_path, json_path):
+        log.info("Building query database %s from %s", db_path, json_path)
+        build_database(_load_from_json(json_path), db_path, source=json_path)
+    return sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro", uri=True)
+
+
+def query(conn: sqlite3.Connection, sql: str, params: Sequence[Any] | Mapping[str, Any] = ()) -> pd.DataFrame:
+    """Run any SQL against the database and return the result as a DataFrame."""
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+# ──────────────────────── Canned queries ────────────────────────
+
+def seasons_with_goals(
+    conn: sqlite3.Connection,
+    min_goals: int = 20,
+    team: Optional[str] = None,
+    from_year: Optional[int] = None,
+    to_year: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Seasons with at least ``min_goals`` goals, optionally for one team and a
+    range of start years (inclusive), highest scoring first.
+    """
+    sql = """
+        SELECT p.name AS player, s.season, s.team, s.goals, s.assists
+        FROM seasons s JOIN players p ON p.player_id = s.player_id
+        WHERE s.goals >= :min_goals
+          AND (:team IS NULL OR s.team = :team)
+          AND (:from_year IS NULL OR s.season_start >= :from_year)
+          AND (:to_year IS NULL OR s.season_start <= :to_year)
+        ORDER BY s.goals DESC, s.season_start, p.name
+    """
+    params = {"min_goals": min_goals, "team": team, "from_year": from_year, "to_year": to_year}
+    return query(conn, sql, params)
+
+
+def players_with_titles_at_clubs(
+    conn: sqlite3.Connection,
+    min_clubs: int = 2,
+    title: str = "La Liga Title",
+) -> pd.DataFrame:
+    """Players who won ``title`` with at least ``min_clubs`` different teams."""
+    sql = """
+        SELECT name AS player, COUNT(DISTINCT team) AS clubs, COUNT(*) AS titles,
+               GROUP_CONCAT(DISTINCT team) AS teams
+        FROM titles
+        WHERE title = :title
+        GROUP BY player_id
+        HAVING COUNT(DISTINCT team) >= :min_clubs
+        ORDER BY clubs DESC, titles DESC, player
+    """
+    return query(conn, sql, {"title": title, "min_clubs": min_clubs})
+
+
+# ──────────────────────── Scoring ────────────────────────
+
+def score_players_sql(conn: sqlite3.Connection, points_system: Mapping[str, int]) -> pd.DataFrame:
+    """
+    Score every player with one SQL aggregation.
+
+    Mirrors analysis.score_players(): the points system is passed in as a
+    VALUES table and joined against the award tables.
+
+    Returns:
+        DataFrame with 'Player' and 'Score' columns in dataset (player_id) order
+    """
+    items = list(points_system.items())
+    points_rows = ", ".join("(?, ?)" for _ in items) or "(NULL, 0)"
+    cups = ", ".join("?" for _ in CUP_TROPHIES)
+
+    def pts(name: str) -> int:
+        return int(points_system.get(name, 0))
+
+    sql = f"""
+        WITH points (label, value) AS (VALUES {points_rows}),
+        season_pts AS (
+            SELECT player_id,
+                   SUM((goals >= 20) * ? + (assists >= 10) * ? + cup_final_winner * ?) AS pts
+            FROM seasons GROUP BY player_id
+        ),
+        award_pts AS (
+            SELECT a.player_id, SUM(COALESCE(pt.value, 0)) AS pts
+            FROM awards a LEFT JOIN points pt ON pt.label = a.award
+            WHERE a.award <> 'Ballon d''Or Win'
+            GROUP BY a.player_id
+        ),
+        cup_pts AS (
+            SELECT player_id, COUNT(*) * ? AS pts
+            FROM team_achievements WHERE achievement IN ({cups})
+            GROUP BY player_id
+        ),
+        cl_pts AS (
+            SELECT c.player_id, SUM(COALESCE(pt.value, 0)) AS pts
+            FROM cl_achievements c LEFT JOIN points pt ON pt.label = c.achievement
+            GROUP BY c.player_id
+        ),
+        ballon_dor AS (
+            SELECT player_id, COUNT(*) AS wins
+            FROM career_awards WHERE award = 'Ballon d''Or Win'
+            GROUP BY player_id
+        )
+        SELECT p.name AS Player,
+               CASE WHEN p.career_goals >= 200 THEN ? WHEN p.career_goals >= 100 THEN ? ELSE 0 END
+               + COALESCE(b.wins, 0) * ?
+               + p.total_la_liga_titles * ?
+               + p.total_champions_league_titles * ?
+               + COALESCE(s.pts, 0) + COALESCE(a.pts, 0) + COALESCE(c.pts, 0) + COALESCE(cl.pts, 0)
+               AS Score
+        FROM players p
+        LEFT JOIN season_pts s ON s.player_id = p.player_id
+        LEFT JOIN award_pts a ON a.player_id = p.player_id
+        LEFT JOIN cup_pts c ON c.player_id = p.player_id
+        LEFT JOIN cl_pts cl ON cl.player_id = p.player_id
+        LEFT JOIN ballon_dor b ON b.player_id = p.player_id
+        ORDER BY p.player_id
+    """
+    params = [value for item in items for value in item]
+    params += [pts('20+ Goal La Liga Season'), pts('10+ Assist La Liga Season'), pts('Cup Final Winner')]
+    params += [pts('Other Trophies'), *CUP_TROPHIES]
+    params += [
+        pts('200+ La Liga Goals'), pts('100+ La Liga Goals'), pts("Ballon d'Or Win"),
+        pts('La Liga Title'), pts('Champions League Win'),
+    ]
+    scores = query(conn, sql, params)
+    scores['Score'] = scores['Score'].astype('int64')
+    return scores
@@ -0,0 +1,140 @@
+"""
+Fingerprint-keyed result cache for scoring.
+
+The app rescored every player on each Streamlit rerun. Results only depend on the
+player data and the points system, so they are cached under a content fingerprint
+of both: the default dataset, verified data, uploaded CSVs and generated sample
+sets each land in their own entry, and any edit to the data produces a new key.
+
+Computing a fingerprint is linear in the data, so it is memoised per source
+object: a PlayerDataset keeps its own, and the last few player dicts are
+remembered by identity. Both are treated as read-only once fingerprinted; the
+app keeps each source object alive across reruns (st.cache_resource or
+st.session_state), so a rerun only looks up the LRU.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping
+
+from .dataset import PlayerDataset
+
+DEFAULT_MAX_ENTRIES = 8
+
+# id(players) -> (players, digest) for recently fingerprinted dicts; holding the
+# dict keeps its id from being reused while the entry exists
+_dict_digests: "OrderedDict[int, tuple]" = OrderedDict()
+_dict_digests_lock = threading.Lock()
+
+
+def _dataset_digest(dataset: PlayerDataset) -> str:
+    """Hash the raw column bytes of a PlayerDataset (memoised; datasets are read-only)."""
+    cached = getattr(dataset, "_fingerprint", None)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.blake2b(digest_size=16)
+    tables = [("players", dataset.players), ("seasons", dataset.seasons)]
+    tables += [(f"labels.{name}", table) for name, table in dataset.labels.items()]
+    for prefix, table in tables:
+        for col in sorted(table):
+            values = table[col]
+            digest.update(f"{prefix}.{col}:{values.dtype.str}:".encode())
+            if values.dtype == object:
+                digest.update(json.dumps(values.tolist(), default=str).encode())
+            else:
+                digest.update(values.tobytes())
+    digest.update(json.dumps(dataset.categories, default=str).encode())
+
+    dataset._fingerprint = digest.hexdigest()
+    return dataset._fingerprint
+
+
+def _dict_digest(players: Mapping[str, Dict[str, Any]]) -> str:
+    """Hash a player dict's JSON serialisation."""
+    payload = [[name, data] for name, data in players.items()]
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _memoised_dict_digest(players: Mapping[str, Dict[str, Any]]) -> str:
+    with _dict_digests_lock:
+        entry = _dict_digests.get(id(players))
+        if entry is not None and entry[0] is players:
+            _dict_digests.move_to_end(id(players))
+            return entry[1]
+
+    digest = _dict_digest(players)
+
+    with _dict_digests_lock:
+        _dict_digests[id(players)] = (players, digest)
+        _dict_digests.move_to_end(id(players))
+        while len(_dict_digests) > DEFAULT_MAX_ENTRIES:
+            _dict_digests.popitem(last=False)
+    return digest
+
+
+def fingerprint_players(
+    players: Mapping[str, Dict[str, Any]], points_system: Mapping[str, int]
+) -> str:
+    """
+    Content fingerprint of a player dataset plus the points system.
+
+    Two inputs with equal content get the same fingerprint regardless of object
+    identity; player order is significant because it determines output order.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(dict(points_system), sort_keys=True).encode())
+    if isinstance(players, PlayerDataset):
+        digest.update(b"dataset:" + _dataset_digest(players).encode())
+    else:
+        digest.update(b"dict:" + _memoised_dict_digest(players).encode())
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache with a bounded number of entries."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, computing and storing it on a miss.
+
+        The computation runs outside the lock so a slow rescoring does not block
+        readers of other entries; concurrent misses on one key may both compute.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
@@ -4,9 +4,14 @@ CSV Handler for Dynamic Player Data Analysis.
 Handles CSV upload, validation, and conversion for the La Liga Forwards Analysis.
 """
 
+import codecs
+import csv
+import io
+import os
+import time
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List, Any
+from typing import Callable, Dict, Tuple, List, Any, Optional
 
 try:
     import streamlit as st
@@ -14,11 +19,33 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
 
-MAX_UPLOAD_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB
-MAX_UPLOAD_ROWS = 5000
+
+def _limit_from_env(name: str, default: int) -> int:
+    """Integer limit overridable through an environment variable."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# In-memory uploads (preview + full parse); override with LALIGA_MAX_UPLOAD_* env vars
+MAX_UPLOAD_SIZE_BYTES = _limit_from_env('LALIGA_MAX_UPLOAD_BYTES', 5 * 1024 * 1024)  # 5 MB
+MAX_UPLOAD_ROWS = _limit_from_env('LALIGA_MAX_UPLOAD_ROWS', 50000)
 MAX_UPLOAD_COLUMNS = 100
+
+# Streaming ingestion: only one chunk of rows is held in memory at a time
+STREAM_CHUNK_ROWS = _limit_from_env('LALIGA_STREAM_CHUNK_ROWS', 20000)
+STREAM_MAX_SIZE_BYTES = _limit_from_env('LALIGA_STREAM_MAX_BYTES', 200 * 1024 * 1024)  # Streamlit's upload cap
+STREAM_MAX_ROWS = _limit_from_env('LALIGA_STREAM_MAX_ROWS', 2_000_000)
+STREAM_READ_BYTES = 1024 * 1024
 MAX_TEXT_FIELD_LENGTH = 120
 
+# Upload sniffing: only this many leading bytes are inspected to pick the dialect
+SNIFF_SAMPLE_BYTES = 64 * 1024
+CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+CANDIDATE_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+MIN_UPLOAD_COLUMNS = 4
+
 ALLOWED_AWARDS = {
     "Ballon d'Or Win",
     "La Liga Golden Boot",
@@ -358,71 +385,99 @@ def process_uploaded_data(df: pd.DataFrame) -> Dict[str, Any]:
         return process_custom_template_data(df)
 
 
+def _numeric_column(df: pd.DataFrame, column: str, default: float = 0) -> pd.Series:
+    """Column coerced to float (non-numeric -> NaN); a constant ``default`` if the column is absent."""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=float)
+    values = pd.to_numeric(df[column], errors='coerce').astype(float)
+    return values.where(np.isfinite(values))
+
+
+def _split_labels(df: pd.DataFrame, column: str) -> List[List[str]]:
+    """Comma-separated label column -> list of stripped, non-empty labels per row."""
+    if column not in df.columns:
+        return [[] for _ in range(len(df))]
+    labels = df[column].fillna('').astype(str).str.split(',').explode().str.strip()
+    labels = labels[labels != '']
+    # explode keeps rows in order, so each row's labels are one contiguous run
+    offsets = np.zeros(len(df) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels.index.to_numpy(), minlength=len(df)), out=offsets[1:])
+    values, offsets = labels.tolist(), offsets.tolist()
+    return [values[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def _player_names(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped player names as strings (missing names become 'nan', as str() would)."""
+    return df[column].astype(str).fillna('nan').str.strip()
+
+
 def process_custom_template_data(df: pd.DataFrame) -> Dict[str, Any]:
-    """Convert custom template CSV to internal data structure (original functionality)."""
-    processed_players = {}
-    
-    for _, row in df.iterrows():
-        player_name = str(row['player_name']).strip()
-        
-        if not player_name:
+    """
+    Convert custom template CSV to internal data structure (original functionality).
+
+    Numeric columns are converted whole with pd.to_numeric and award/achievement
+    lists are split with str.split/explode, so the only per-row Python work left is
+    building the output dicts.
+    """
+    df = df.reset_index(drop=True)
+    names = _player_names(df, 'player_name')
+    keep = (names != '').to_numpy()
+    names = names.tolist()
+
+    career = {
+        col: _numeric_column(df, col).fillna(0).astype(np.int64).to_numpy()
+        for col in ('career_goals', 'total_la_liga_titles', 'total_champions_league_titles', 'ballon_dor_wins')
+    }
+
+    # Per-row season lists, season 1..3 in order
+    seasons_by_row: List[List[Dict[str, Any]]] = [[] for _ in range(len(df))]
+    for i in range(1, 4):
+        goals_col = f'season_{i}_goals'
+        assists_col = f'season_{i}_assists'
+        if goals_col not in df.columns:
             continue
-            
-        # Extract basic career data
-        career_data = {
-            'career_goals': int(row.get('career_goals', 0)),
-            'total_la_liga_titles': int(row.get('total_la_liga_titles', 0)),
-            'total_champions_league_titles': int(row.get('total_champions_league_titles', 0)),
-            'seasons': []
+
+        goals = _numeric_column(df, goals_col)
+        assists = _numeric_column(df, assists_col)
+        # A season is usable when goals parse; present-but-unparseable assists skip it
+        assists_invalid = df[assists_col].notna() & assists.isna() if assists_col in df.columns else False
+        valid = (goals.notna() & ~assists_invalid).to_numpy()
+        if not valid.any():
+            continue
+
+        goals_arr = goals.fillna(0).astype(np.int64).to_numpy()
+        assists_arr = assists.fillna(0).astype(np.int64).to_numpy()
+        awards = _split_labels(df, f'season_{i}_awards')
+        achievements = _split_labels(df, f'season_{i}_team_achievements')
+
+        for row in np.flatnonzero(valid):
+            team_achievements = achievements[row]
+            season_goals = int(goals_arr[row])
+            seasons_by_row[row].append({
+                'season': f'{2020 + i}/{2021 + i}',  # Example seasons
+                'goals': season_goals,
+                'assists': int(assists_arr[row]),
+                'awards': awards[row],
+                'team_achievements': team_achievements,
+                'cup_final_winner': 'Copa del Rey' in team_achievements,
+                # Assume top scorer if a CL-winning season has high goals
+                'cl_achievements': (
+                    ['CL Top Scorer']
+                    if 'Champions League Win' in team_achievements and season_goals >= 10
+                    else []
+                ),
+            })
+
+    return {
+        names[row]: {
+            'career_goals': int(career['career_goals'][row]),
+            'total_la_liga_titles': int(career['total_la_liga_titles'][row]),
+            'total_champions_league_titles': int(career['total_champions_league_titles'][row]),
+            'seasons': seasons_by_row[row],
+            'career_awards': ["Ballon d'Or Win"] * int(career['ballon_dor_wins'][row]),
         }
-        
-        # Process career awards
-        ballon_dor_wins = int(row.get('ballon_dor_wins', 0))
-        career_data['career_awards'] = ["Ballon d'Or Win"] * ballon_dor_wins
-        
-        # Extract season data (up to 3 seasons)
-        for i in range(1, 4):
-            goals_col = f'season_{i}_goals'
-            assists_col = f'season_{i}_assists'
-            awards_col = f'season_{i}_awards'
-            achievements_col = f'season_{i}_team_achievements'
-            
-            if goals_col in row and pd.notna(row[goals_col]) and row[goals_col] != '':
-                try:
-                    goals = int(float(row[goals_col]))
-                    assists = int(float(row.get(assists_col, 0))) if pd.notna(row.get(assists_col, 0)) else 0
-                    
-                    # Process awards
-                    awards_str = str(row.get(awards_col, ''))
-                    awards = [award.strip() for award in awards_str.split(',') if award.strip()]
-                    
-                    # Process team achievements
-                    achievements_str = str(row.get(achievements_col, ''))
-                    team_achievements = [ach.strip() for ach in achievements_str.split(',') if ach.strip()]
-                    
-                    season = {
-                        'season': f'{2020 + i}/{2021 + i}',  # Example seasons
-                        'goals': goals,
-                        'assists': assists,
-                        'awards': awards,
-                        'team_achievements': team_achievements,
-                        'cup_final_winner': 'Copa del Rey' in team_achievements,
-                        'cl_achievements': []
-                    }
-                    
-                    # Add CL achievements if Champions League Win is in team achievements
-                    if 'Champions League Win' in team_achievements:
-                        if goals >= 10:  # Assume top scorer if high goals
-                            season['cl_achievements'].append('CL Top Scorer')
-                    
-                    career_data['seasons'].append(season)
-                    
-                except (ValueError, TypeError):
-                    continue  # Skip invalid season data
-        
-        processed_players[player_name] = career_data
-    
-    return processed_players
+        for row in np.flatnonzero(keep)
+    }
 
 
 def transform_football_stats_data(df: pd.DataFrame) -> Dict[str, Any]:
@@ -432,73 +487,45 @@ def transform_football_stats_data(df: pd.DataFrame) -> Dict[str, Any]:
     Handles data with columns like Player, Squad, Goals, Assists, etc.
     Returns processed player data compatible with the analysis system.
     """
-    processed_players = {}
-    
-    # Get column mappings (flexible to handle different naming)
-    player_col = 'Player' if 'Player' in df.columns else None
-    goals_col = 'Goals' if 'Goals' in df.columns else None
-    assists_col = 'Assists' if 'Assists' in df.columns else None
-    squad_col = 'Squad' if 'Squad' in df.columns else None
-    
-    if not player_col:
+    if 'Player' not in df.columns:
         return {}
-    
-    for _, row in df.iterrows():
-        player_name = str(row[player_col]).strip()
-        
-        if not player_name or player_name == 'nan':
-            continue
-            
-        # Extract available data
-        goals = 0
-        assists = 0
-        squad = "Unknown"
-        
-        try:
-            if goals_col and pd.notna(row[goals_col]):
-                goals = int(float(row[goals_col]))
-        except (ValueError, TypeError):
-            goals = 0
-            
-        try:
-            if assists_col and pd.notna(row[assists_col]):
-                assists = int(float(row[assists_col]))
-        except (ValueError, TypeError):
-            assists = 0
-            
-        if squad_col and pd.notna(row[squad_col]):
-            squad = str(row[squad_col]).strip()
-        
-        # Create basic career data structure
-        # Since we don't have historical data, we'll use current season stats
-        career_data = {
-            'career_goals': goals,  # Use current season goals as approximation
-            'total_la_liga_titles': 0,  # Not available in stats data
-            'total_champions_league_titles': 0,  # Not available in stats data
-            'seasons': []
-        }
-        
-        # Create a single season entry with available data
-        if goals > 0 or assists > 0:
-            season = {
+
+    df = df.reset_index(drop=True)
+    names = _player_names(df, 'Player')
+    keep = ((names != '') & (names != 'nan')).to_numpy()
+    names = names.tolist()
+
+    goals = _numeric_column(df, 'Goals').fillna(0).astype(np.int64).to_numpy()
+    assists = _numeric_column(df, 'Assists').fillna(0).astype(np.int64).to_numpy()
+    if 'Squad' in df.columns:
+        squads = df['Squad'].astype(str).str.strip().where(df['Squad'].notna(), 'Unknown').to_numpy()
+    else:
+        squads = np.full(len(df), 'Unknown', dtype=object)
+    has_season = (goals > 0) | (assists > 0)
+
+    processed_players = {}
+    for row in np.flatnonzero(keep):
+        # Since we don't have historical data, current season stats form a single season
+        seasons = []
+        if has_season[row]:
+            seasons.append({
                 'season': 'Unknown',
-                'goals': goals,
-                'assists': assists,
+                'goals': int(goals[row]),
+                'assists': int(assists[row]),
                 'awards': [],
                 'team_achievements': [],
                 'cup_final_winner': False,
                 'cl_achievements': [],
-                'squad': squad
-            }
-            
+                'squad': squads[row],
+            })
+        processed_players[names[row]] = {
+            'career_goals': int(goals[row]),  # Use current season goals as approximation
+            'total_la_liga_titles': 0,  # Not available in stats data
+            'total_champions_league_titles': 0,  # Not available in stats data
+            'seasons': seasons,
+            'career_awards': [],
+        }
 
-            career_data['seasons'].append(season)
-        
-        # Add empty career awards for now
-        career_data['career_awards'] = []
-        
-        processed_players[player_name] = career_data
-    
     return processed_players
 
 
@@ -656,13 +683,98 @@ def diagnose_csv_issues(uploaded_file: Any) -> str:
         return f"Could not analyze file: {str(e)}"
 
 
+def _decode_sample(sample: bytes, is_complete: bool) -> Tuple[Optional[str], str]:
+    """Decode a byte prefix with the first candidate encoding that accepts it."""
+    for encoding in CANDIDATE_ENCODINGS:
+        try:
+            # Incremental decoding tolerates a multi-byte character cut off at the sample edge
+            decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+            return encoding, decoder.decode(sample, final=is_complete)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return None, ''
+
+
+def _delimiter_fits(lines: List[str], delimiter: str) -> bool:
+    """
+    Mirror the parse acceptance rule on a sample: at least MIN_UPLOAD_COLUMNS header
+    fields, at least one data row, and no row that the full parse would reject.
+    """
+    try:
+        rows = [
+            row for row in csv.reader(lines, delimiter=delimiter, quotechar='"', skipinitialspace=True)
+            if row
+        ]
+    except csv.Error:
+        return False
+    if len(rows) < 2 or len(rows[0]) < MIN_UPLOAD_COLUMNS:
+        return False
+    header_width = len(rows[0])
+    widths = {len(row) for row in rows[1:]}
+    # pandas treats a uniformly one-wider body as an implicit index column
+    return max(widths) <= header_width or widths == {header_width + 1}
+
+
+def sniff_csv_dialect(sample: bytes, is_complete: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Pick the encoding and delimiter of a CSV upload from a bounded byte prefix.
+
+    Args:
+        sample: Leading bytes of the file (at most SNIFF_SAMPLE_BYTES)
+        is_complete: True if the sample is the whole file
+
+    Returns:
+        Tuple of (encoding, delimiter); either is None if nothing plausible was found
+    """
+    encoding, text = _decode_sample(sample, is_complete)
+    if encoding is None:
+        return None, None
+
+    lines = text.splitlines()
+    if not is_complete and len(lines) > 1:
+        lines = lines[:-1]  # last line may be truncated by the sample boundary
+
+    for delimiter in CANDIDATE_DELIMITERS:
+        if _delimiter_fits(lines, delimiter):
+            return encoding, delimiter
+    return encoding, None
+
+
+def _read_upload(text_buffer: Any, delimiter: str, **kwargs: Any) -> Any:
+    """Parse decoded upload text with the sniffed delimiter (extra kwargs go to pd.read_csv)."""
+    return pd.read_csv(
+        text_buffer,
+        delimiter=delimiter,
+        engine='c',
+        skipinitialspace=True,
+        quotechar='"',
+        na_values=['', 'NA', 'N/A', 'null', 'NULL'],
+        on_bad_lines='error',
+        **kwargs,
+    )
+
+
+def _format_megabytes(num_bytes: int) -> str:
+    return f"{num_bytes / (1024 * 1024):.3g} MB"
+
+
+def _format_timings(timings: Dict[str, float]) -> str:
+    """Render stage timings (seconds) as a compact one-line breakdown."""
+    return "⏱️ " + " · ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timings.items())
+
+
 def validate_and_preview_data(uploaded_file: Any) -> Tuple[bool, pd.DataFrame, str]:
     """
     Validate uploaded file and return preview.
+
+    A bounded prefix of the upload is sniffed once to pick the encoding and
+    delimiter, then the file is parsed exactly once. The message ends with a
+    timing breakdown of the sniff, parse and validate stages.
     
     Returns:
         Tuple of (success, dataframe, message)
     """
+    timings: Dict[str, float] = {}
     try:
         file_size = getattr(uploaded_file, "size", 0)
         if file_size and file_size > MAX_UPLOAD_SIZE_BYTES:
@@ -671,50 +783,58 @@ def validate_and_preview_data(uploaded_file: Any) -> Tuple[bool, pd.DataFrame, s
                 pd.DataFrame(),
                 (
                     f"File is too large ({file_size} bytes). Maximum allowed size is "
-                    f"{MAX_UPLOAD_SIZE_BYTES} bytes (5 MB)."
+                    f"{MAX_UPLOAD_SIZE_BYTES} bytes ({_format_megabytes(MAX_UPLOAD_SIZE_BYTES)})."
                 ),
             )
 
-        # Reset file pointer to beginning
+        # Sniff encoding and delimiter from a bounded prefix
+        started = time.perf_counter()
         uploaded_file.seek(0)
-        
-        # Try different delimiters and encodings
-        delimiters = [',', ';', '\t', '|']
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        
-        df = None
-        successful_params = None
-        
-        for encoding in encodings:
-            for delimiter in delimiters:
-                try:
-                    uploaded_file.seek(0)  # Reset file pointer
-                    
-                    # Read with specific delimiter and encoding
-                    df = pd.read_csv(
-                        uploaded_file, 
-                        delimiter=delimiter, 
-                        encoding=encoding,
-                        engine='c',
-                        skipinitialspace=True,
-                        quotechar='"',
-                        na_values=['', 'NA', 'N/A', 'null', 'NULL'],
-                        on_bad_lines='error'
-                    )
-                    
-                    # Check if we got reasonable results
-                    if len(df.columns) >= 4 and len(df) > 0:
-                        successful_params = (delimiter, encoding)
-                        break
-                        
-                except Exception:
-                    continue
-                    
-            if df is not None and successful_params:
-                break
-        
-        if df is None or df.empty:
-            return False, pd.DataFrame(), "Could not parse CSV file. Please check the format and try again."
+        sample = uploaded_file.read(SNIFF_SAMPLE_BYTES + 1)
+        if isinstance(sample, str):
+            sample = sample.encode('utf-8')
+        is_complete = len(sample) <= SNIFF_SAMPLE_BYTES
+        encoding_used, delimiter_used = sniff_csv_dialect(sample[:SNIFF_SAMPLE_BYTES], is_complete)
+        timings['sniff'] = time.perf_counter() - started
+
+        if encoding_used is None or delimiter_used is None:
+            return (
+                False,
+                pd.DataFrame(),
+                "Could not parse CSV file. Please check the format and try again.\n\n"
+                + _format_timings(timings),
+            )
+
+        # Exactly one full parse with the sniffed dialect
+        started = time.perf_counter()
+        rest = uploaded_file.read()
+        if isinstance(rest, str):
+            rest = rest.encode('utf-8')
+        raw = sample + rest
+        try:
+            text = raw.decode(encoding_used)
+        except UnicodeDecodeError:
+            # The prefix was valid UTF-8 but a later byte is not; latin-1 accepts any byte
+            encoding_used = 'latin-1'
+            text = raw.decode(encoding_used)
+        try:
+            df = _read_upload(io.StringIO(text), delimiter_used)
+        except Exception as e:
+            timings['parse'] = time.perf_counter() - started
+            return (
+                False,
+                pd.DataFrame(),
+                f"Could not parse CSV file: {str(e)}\n\n{_format_timings(timings)}",
+            )
+        timings['parse'] = time.perf_counter() - started
+
+        if df.empty or len(df.columns) < MIN_UPLOAD_COLUMNS:
+            return (
+                False,
+                pd.DataFrame(),
+                "Could not parse CSV file. Please check the format and try again.\n\n"
+                + _format_timings(timings),
+            )
         
         # Clean column names - remove extra spaces
         df.columns = df.columns.str.strip()
@@ -734,14 +854,17 @@ def validate_and_preview_data(uploaded_file: Any) -> Tuple[bool, pd.DataFrame, s
                 ),
             )
         
-        # Show parsing info
-        delimiter_used, encoding_used = successful_params if successful_params else (',', 'utf-8')
-        
         # Validate format - this will automatically detect the format type
+        started = time.perf_counter()
         is_valid, validation_message = validate_csv_format(df)
+        timings['validate'] = time.perf_counter() - started
+        parse_info = (
+            f"📋 Parsed with delimiter: '{delimiter_used}', encoding: '{encoding_used}'\n"
+            f"{_format_timings(timings)}"
+        )
         
         if not is_valid:
-            return False, df, f"{validation_message}\n\n📋 Parsed with delimiter: '{delimiter_used}', encoding: '{encoding_used}'"
+            return False, df, f"{validation_message}\n\n{parse_info}"
         
         # Show success info based on detected format
         format_type = detect_csv_format(df)
@@ -760,13 +883,181 @@ def validate_and_preview_data(uploaded_file: Any) -> Tuple[bool, pd.DataFrame, s
             success_message = f"✅ Football statistics format detected! Found {num_players} players"
             if total_goals > 0:
                 success_message += f" with {int(total_goals)} total goals"
-            success_message += f"\n📋 Parsed with delimiter: '{delimiter_used}', encoding: '{encoding_used}'"
+            success_message += f"\n{parse_info}"
         else:
             # Custom template format
             total_goals = df['career_goals'].sum() if 'career_goals' in df.columns else 0
-            success_message = f"✅ Custom template format detected! Found {num_players} players with {total_goals} total career goals\n📋 Parsed with delimiter: '{delimiter_used}', encoding: '{encoding_used}'"
+            success_message = f"✅ Custom template format detected! Found {num_players} players with {total_goals} total career goals\n{parse_info}"
         
         return True, df, success_message
         
     except Exception as e:
         return False, pd.DataFrame(), f"Error reading file: {str(e)}\n\n💡 Tips:\n- Ensure your CSV uses comma (,) or semicolon (;) separators\n- Save as CSV (UTF-8) format\n- Check for special characters in player names"
+
+
+# ──────────────────────── Streaming ingestion ────────────────────────
+
+def _utf8_latin1_fallback(error: UnicodeDecodeError) -> Tuple[str, int]:
+    """Decode error handler: bytes that are not valid UTF-8 are read as latin-1."""
+    return error.object[error.start:error.end].decode('latin-1'), error.end
+
+
+codecs.register_error('laliga-latin1-fallback', _utf8_latin1_fallback)
+
+
+class UploadTooLargeError(ValueError):
+    """Raised while streaming when an upload exceeds the configured byte limit."""
+
+
+class _DecodedUploadStream(io.TextIOBase):
+    """
+    Text view over a binary upload, decoded block by block.
+
+    pandas pulls text through read(); only STREAM_READ_BYTES of raw input are
+    buffered at a time and the byte limit is enforced as data arrives, so the
+    declared upload size is not trusted.
+    """
+
+    def __init__(self, raw: Any, encoding: str, max_bytes: int):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='laliga-latin1-fallback')
+        self._max_bytes = max_bytes
+        self._eof = False
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        block_size = STREAM_READ_BYTES if size is None or size < 0 else max(size, 1)
+        parts: List[str] = []
+        while not self._eof and not parts:
+            block = self._raw.read(block_size)
+            if isinstance(block, str):
+                block = block.encode('utf-8')
+            self.bytes_read += len(block)
+            if self.bytes_read > self._max_bytes:
+                raise UploadTooLargeError(
+                    f"File is too large (over {self._max_bytes} bytes). Maximum allowed size is "
+                    f"{self._max_bytes} bytes ({_format_megabytes(self._max_bytes)})."
+                )
+            self._eof = not block
+            text = self._decoder.decode(block, final=self._eof)
+            if text:
+                parts.append(text)
+        return ''.join(parts)
+
+
+def ingest_csv_stream(
+    uploaded_file: Any,
+    chunk_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    max_rows: Optional[int] = None,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+) -> Tuple[bool, Dict[str, Any], str]:
+    """
+    Validate and convert a CSV upload chunk by chunk.
+
+    The dialect is sniffed from a bounded prefix as in validate_and_preview_data();
+    the file is then parsed in chunks of ``chunk_rows`` rows. The format is detected
+    from the first chunk and every chunk is validated and converted to the internal
+    player structure before the next one is read, so memory holds one chunk plus the
+    accumulated player dict. As with the in-memory path, a later row for the same
+    player name replaces the earlier one.
+
+    Args:
+        uploaded_file: Binary file-like upload
+        chunk_rows: Rows per chunk (defaults to STREAM_CHUNK_ROWS)
+        max_bytes: Byte limit (defaults to STREAM_MAX_SIZE_BYTES)
+        max_rows: Data row limit (defaults to STREAM_MAX_ROWS)
+        progress: Called after each chunk with (rows_done, bytes_read, total_bytes);
+                  total_bytes is 0 if the upload size is unknown
+
+    Returns:
+        Tuple of (success, players, message)
+    """
+    chunk_rows = chunk_rows or STREAM_CHUNK_ROWS
+    max_bytes = max_bytes or STREAM_MAX_SIZE_BYTES
+    max_rows = max_rows or STREAM_MAX_ROWS
+    total_bytes = getattr(uploaded_file, 'size', 0) or 0
+    if total_bytes > max_bytes:
+        return False, {}, (
+            f"File is too large ({total_bytes} bytes). Maximum allowed size is "
+            f"{max_bytes} bytes ({_format_megabytes(max_bytes)})."
+        )
+
+    timings: Dict[str, float] = {'sniff': 0.0, 'parse': 0.0, 'validate': 0.0, 'convert': 0.0}
+    started = time.perf_counter()
+    uploaded_file.seek(0)
+    sample = uploaded_file.read(SNIFF_SAMPLE_BYTES + 1)
+    if isinstance(sample, str):
+        sample = sample.encode('utf-8')
+    is_complete = len(sample) <= SNIFF_SAMPLE_BYTES
+    encoding_used, delimiter_used = sniff_csv_dialect(sample[:SNIFF_SAMPLE_BYTES], is_complete)
+    timings['sniff'] = time.perf_counter() - started
+    if encoding_used is None or delimiter_used is None:
+        return False, {}, (
+            "Could not parse CSV file. Please check the format and try again.\n\n"
+            + _format_timings(timings)
+        )
+
+    uploaded_file.seek(0)
+    stream = _DecodedUploadStream(uploaded_file, encoding_used, max_bytes)
+    players: Dict[str, Any] = {}
+    rows_done = 0
+    num_chunks = 0
+    validate_chunk = process_chunk = None
+
+    try:
+        started = time.perf_counter()
+        for chunk in _read_upload(stream, delimiter_used, chunksize=chunk_rows):
+            timings['parse'] += time.perf_counter() - started
+            chunk.columns = chunk.columns.str.strip()
+            if validate_chunk is None:
+                if len(chunk.columns) < MIN_UPLOAD_COLUMNS:
+                    return False, {}, "Could not parse CSV file. Please check the format and try again."
+                if len(chunk.columns) > MAX_UPLOAD_COLUMNS:
+                    return False, {}, (
+                        f"CSV contains too many columns ({len(chunk.columns)}). "
+                        f"Maximum allowed columns: {MAX_UPLOAD_COLUMNS}."
+                    )
+                if detect_csv_format(chunk) == 'football_stats':
+                    validate_chunk, process_chunk = validate_football_stats_format, transform_football_stats_data
+                else:
+                    validate_chunk, process_chunk = validate_csv_format, process_custom_template_data
+
+            if rows_done + len(chunk) > max_rows:
+                return False, {}, f"CSV contains too many rows (over {max_rows}). Maximum allowed rows: {max_rows}."
+
+            step = time.perf_counter()
+            is_valid, validation_message = validate_chunk(chunk)
+            timings['validate'] += time.perf_counter() - step
+            if not is_valid:
+                first_row = rows_done + 1
+                return False, {}, (
+                    f"Rows {first_row}-{rows_done + len(chunk)}: {validation_message}\n\n"
+                    + _format_timings(timings)
+                )
+
+            step = time.perf_counter()
+            players.update(process_chunk(chunk))
+            timings['convert'] += time.perf_counter() - step
+
+            rows_done += len(chunk)
+            num_chunks += 1
+            if progress is not None:
+                progress(rows_done, stream.bytes_read, total_bytes)
+            started = time.perf_counter()
+    except UploadTooLargeError as e:
+        return False, {}, str(e)
+    except Exception as e:
+        return False, {}, f"Could not parse CSV file: {str(e)}\n\n{_format_timings(timings)}"
+
+    if rows_done == 0:
+        return False, {}, "Could not parse CSV file. Please check the format and try again."
+
+    return True, players, (
+        f"✅ Streamed {rows_done} rows in {num_chunks} chunk(s) into {len(players)} players\n"
+        f"📋 Parsed with delimiter: '{delimiter_used}', encoding: '{encoding_used}'\n"
+        f"{_format_timings(timings)}"
+    )
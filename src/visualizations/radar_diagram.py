@@ -1,5 +1,7 @@
 """
 Radar chart visualization for multi-dimensional player comparison.
+
+Run from the project root with: python -m src.visualizations.radar_diagram
 """
 
 import pandas as pd
@@ -8,6 +10,8 @@ import matplotlib.pyplot as plt
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from ..core.aggregation import RADAR_METRICS, RADAR_STATS_COLUMNS, aggregate_player_stats
+
 
 # Default color scheme for players
 DEFAULT_COLORS: Dict[str, str] = {
@@ -31,56 +35,7 @@ def extract_player_stats(players: Dict[str, Any]) -> pd.DataFrame:
     Returns:
         DataFrame with player statistics
     """
-    player_stats = []
-    
-    for player_name, data in players.items():
-        stats = {}
-        stats['Player'] = player_name
-        stats['Career Goals'] = data.get('career_goals', 0)
-        stats['La Liga Titles'] = data.get('total_la_liga_titles', 0)
-        stats['Champions League Titles'] = data.get('total_champions_league_titles', 0)
-        
-        # Count Ballon d'Or Wins
-        ballon_dor_wins = data.get('career_awards', []).count("Ballon d'Or Win")
-        stats["Ballon d'Or Wins"] = ballon_dor_wins
-        
-        # Initialize counts
-        golden_boots = 0
-        seasons_20_goals = 0
-        seasons_10_assists = 0
-        cup_final_wins = 0
-        cl_top_scorer = 0
-        
-        for season in data.get('seasons', []):
-            # Check for La Liga Golden Boot awards
-            if 'La Liga Golden Boot' in season.get('awards', []):
-                golden_boots += 1
-            
-            # Check for seasons with 20+ goals
-            if season.get('goals', 0) >= 20:
-                seasons_20_goals += 1
-            
-            # Check for seasons with 10+ assists
-            if season.get('assists', 0) >= 10:
-                seasons_10_assists += 1
-            
-            # Check for cup final wins
-            if season.get('cup_final_winner', False):
-                cup_final_wins += 1
-            
-            # Check for CL Top Scorer awards
-            cl_achievements = season.get('cl_achievements', [])
-            cl_top_scorer += cl_achievements.count('CL Top Scorer')
-        
-        stats['La Liga Golden Boots'] = golden_boots
-        stats['20+ Goal Seasons'] = seasons_20_goals
-        stats['10+ Assist Seasons'] = seasons_10_assists
-        stats['Cup Final Wins'] = cup_final_wins
-        stats['CL Top Scorer Awards'] = cl_top_scorer
-        
-        player_stats.append(stats)
-    
-    return pd.DataFrame(player_stats)
+    return aggregate_player_stats(players)[RADAR_STATS_COLUMNS]
 
 
 def normalize_stats(stats_df: pd.DataFrame, metrics: List[str]) -> pd.DataFrame:
@@ -135,11 +90,7 @@ def create_radar_chart(
     # Extract and prepare data
     stats_df = extract_player_stats(players)
     
-    metrics = [
-        'Career Goals', 'La Liga Titles', 'Champions League Titles',
-        "Ballon d'Or Wins", 'La Liga Golden Boots', '20+ Goal Seasons',
-        '10+ Assist Seasons', 'Cup Final Wins', 'CL Top Scorer Awards'
-    ]
+    metrics = RADAR_METRICS
     
     normalized_stats = normalize_stats(stats_df, metrics)
     
@@ -189,13 +140,9 @@ def create_radar_chart(
 
 def main():
     """Run radar chart generation as a standalone script."""
-    import sys
+    from ..core.players_data import players
     
-    # Add parent directories to path
     project_root = Path(__file__).parent.parent.parent
-    sys.path.insert(0, str(project_root / 'src'))
-    
-    from core.players_data import players
     
     outputs_dir = project_root / 'outputs'
     outputs_dir.mkdir(exist_ok=True)
@@ -0,0 +1,96 @@
+"""
+Tests for the shared stat aggregation engine.
+"""
+
+import os
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.aggregation import (
+    APP_STATS_COLUMNS,
+    RADAR_STATS_COLUMNS,
+    STATIC_STATS_COLUMNS,
+    aggregate_player_stats,
+    rank_scores,
+)
+from core.analysis import calculate_player_score
+from core.players_data import load_players, _fallback_players, points_system
+
+
+def _reference_stats(data):
+    """Per-season loop equivalent of the aggregated columns."""
+    seasons = data.get('seasons', [])
+    return {
+        'Career Goals': data.get('career_goals', 0),
+        "Ballon d'Or Wins": data.get('career_awards', []).count("Ballon d'Or Win"),
+        'Total Score': calculate_player_score(data, points_system),
+        'La Liga Golden Boots': sum('La Liga Golden Boot' in s.get('awards', []) for s in seasons),
+        'La Liga Best Player Awards': sum(
+            'La Liga Best Player Award' in s.get('awards', []) for s in seasons
+        ),
+        '20+ Goal Seasons': sum(s.get('goals', 0) >= 20 for s in seasons),
+        '10+ Assist Seasons': sum(s.get('assists', 0) >= 10 for s in seasons),
+        'Cup Final Wins': sum(bool(s.get('cup_final_winner', False)) for s in seasons),
+        'CL Top Scorer Awards': sum(s.get('cl_achievements', []).count('CL Top Scorer') for s in seasons),
+        'Season Goals (Sample)': sum(s.get('goals', 0) for s in seasons),
+    }
+
+
+class TestAggregatePlayerStats:
+    """Test vectorised aggregation against a per-season reference loop."""
+
+    @pytest.mark.parametrize('loader', [load_players, _fallback_players])
+    def test_matches_reference_loop(self, loader):
+        """Every derived column should equal the nested-loop count."""
+        players = loader()
+        stats_df = aggregate_player_stats(players, points_system).set_index('Player')
+        for name, data in players.items():
+            row = stats_df.loc[name]
+            for column, expected in _reference_stats(data).items():
+                assert row[column] == expected, f"{name}: {column}"
+
+    def test_column_sets_are_available(self):
+        """Each consumer's column selection should exist in the aggregated frame."""
+        stats_df = aggregate_player_stats(_fallback_players(), points_system)
+        for columns in (APP_STATS_COLUMNS, STATIC_STATS_COLUMNS, RADAR_STATS_COLUMNS):
+            assert list(stats_df[columns].columns) == columns
+
+    def test_no_score_without_points_system(self):
+        """Total Score should only be computed when a points system is given."""
+        stats_df = aggregate_player_stats(_fallback_players())
+        assert 'Total Score' not in stats_df.columns
+
+    def test_rank_scores_sorted_descending(self):
+        """Ranking table should list the highest score first."""
+        stats_df = aggregate_player_stats(_fallback_players(), points_system)
+        scores_df = rank_scores(stats_df)
+        assert list(scores_df.columns) == ['Player', 'Score']
+        assert scores_df['Score'].is_monotonic_decreasing
+
+
+class TestRadarImport:
+    """The radar module should import without src/ on sys.path."""
+
+    def test_package_import_without_src_on_path(self):
+        """Importing src.visualizations from the project root should not need 'core' on the path."""
+        code = (
+            "import sys; sys.path = [p for p in sys.path if not p.endswith('src')]; "
+            "from src.visualizations.radar_diagram import extract_player_stats; "
+            "from src.core.players_data import load_players; "
+            "print(len(extract_player_stats(load_players())))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=project_root,
+                                capture_output=True, text=True, env={**os.environ, 'MPLBACKEND': 'Agg'})
+
+        assert result.returncode == 0, result.stderr
+        assert int(result.stdout) > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -10,8 +10,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-from core.analysis import calculate_player_score
-from core.players_data import load_players, points_system
+from core.analysis import calculate_player_score, score_players
+from core.players_data import load_players, _fallback_players, points_system
 
 # Load player data (from JSON if available, else fallback)
 players = load_players()
@@ -232,6 +232,45 @@ class TestScoreEdgeCases:
         assert score == expected
 
 
+class TestBatchScoring:
+    """Test the vectorised batch scoring engine against the per-player function."""
+
+    def test_score_players_matches_loaded_players(self):
+        """Batch scores should equal per-player scores for the loaded dataset."""
+        expected = [calculate_player_score(data, points_system) for data in players.values()]
+        assert score_players(players, points_system).tolist() == expected
+
+    def test_score_players_matches_fallback_players(self):
+        """Batch scores should equal per-player scores for the fallback dataset."""
+        fallback = _fallback_players()
+        expected = [calculate_player_score(data, points_system) for data in fallback.values()]
+        assert score_players(fallback, points_system).tolist() == expected
+
+    def test_score_players_empty(self):
+        """An empty mapping should produce an empty score array."""
+        assert len(score_players({}, points_system)) == 0
+
+    def test_score_players_handles_missing_keys_and_cups(self):
+        """Missing season keys, cup trophies and unknown awards should score identically."""
+        sample = {
+            'Minimal': {'career_goals': 120, 'seasons': [{'goals': 21, 'assists': 3}]},
+            'Cups': {
+                'career_goals': 10,
+                'career_awards': ["Ballon d'Or Win", "Ballon d'Or 2nd Place"],
+                'seasons': [{
+                    'goals': 5, 'assists': 12,
+                    'awards': ["Ballon d'Or Win", 'La Liga Golden Boot', 'Unknown Award'],
+                    'team_achievements': ['Copa del Rey', 'UEFA Super Cup', 'La Liga Title'],
+                    'cup_final_winner': True,
+                    'cl_achievements': ['CL Top Scorer', 'CL Top Scorer'],
+                }],
+            },
+            'Empty': {},
+        }
+        expected = [calculate_player_score(data, points_system) for data in sample.values()]
+        assert score_players(sample, points_system).tolist() == expected
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
 
@@ -21,6 +21,8 @@ from handlers.csv_handler import (
     process_uploaded_data,
     create_sample_csv_content,
     validate_and_preview_data,
+    sniff_csv_dialect,
+    ingest_csv_stream,
     MAX_UPLOAD_SIZE_BYTES,
 )
 
@@ -121,7 +123,56 @@ class TestDataProcessing:
         assert 'Test Player' in processed
         assert processed['Test Player']['career_goals'] == 100
         assert processed['Test Player']['total_la_liga_titles'] == 2
-    
+
+    def test_process_custom_template_seasons(self):
+        """Season columns should become season dicts with parsed labels."""
+        df = pd.read_csv(io.StringIO(create_sample_csv_content()))
+        processed = process_uploaded_data(df)
+
+        assert list(processed) == df['player_name'].tolist()
+        messi = processed['Lionel Messi']
+        assert messi['career_awards'] == ["Ballon d'Or Win"] * 4
+        assert [s['goals'] for s in messi['seasons']] == [50, 43]
+        assert messi['seasons'][0]['awards'] == ["Ballon d'Or Win", 'La Liga Golden Boot']
+        assert messi['seasons'][0]['cup_final_winner'] is True
+        assert messi['seasons'][1]['cl_achievements'] == ['CL Top Scorer']
+        # Empty label cells give empty lists rather than a 'nan' label
+        assert processed['Robert Lewandowski']['seasons'][0]['awards'] == []
+
+    def test_process_custom_template_skips_unparseable_seasons(self):
+        """Seasons with non-numeric goals or assists are dropped; others are kept."""
+        df = pd.DataFrame({
+            'player_name': ['A', 'B'],
+            'career_goals': ['12.0', 'n/a'],
+            'total_la_liga_titles': [1, 0],
+            'total_champions_league_titles': [0, 0],
+            'season_1_goals': ['7', 'x'],
+            'season_1_assists': [None, 3],
+            'season_2_goals': [4, 5],
+            'season_2_assists': ['bad', 2],
+        })
+        processed = process_uploaded_data(df)
+        assert processed['A']['career_goals'] == 12
+        assert processed['B']['career_goals'] == 0
+        assert [(s['goals'], s['assists']) for s in processed['A']['seasons']] == [(7, 0)]
+        assert [(s['goals'], s['assists']) for s in processed['B']['seasons']] == [(5, 2)]
+
+    def test_transform_football_stats_coerces_columns(self):
+        """Non-numeric stats become 0 and players without output get no season."""
+        from handlers.csv_handler import transform_football_stats_data
+
+        df = pd.DataFrame({
+            'Player': [' Striker ', None, 'Keeper'],
+            'Squad': ['FC', 'FC', None],
+            'Goals': ['12', 3, 'n/a'],
+            'Assists': [2.0, 1, None],
+        })
+        processed = transform_football_stats_data(df)
+        assert list(processed) == ['Striker', 'Keeper']
+        assert processed['Striker']['seasons'][0]['squad'] == 'FC'
+        assert processed['Striker']['career_goals'] == 12
+        assert processed['Keeper']['seasons'] == []
+
     def test_create_sample_csv_content(self):
         """Test sample CSV content creation."""
         sample = create_sample_csv_content()
@@ -174,6 +225,96 @@ class TestCSVSecurityHardening:
         assert "Maximum allowed size" in message
 
 
+class TestUploadSniffing:
+    """Test single-pass dialect sniffing for uploads."""
+
+    HEADER = "player_name{d}career_goals{d}total_la_liga_titles{d}total_champions_league_titles\n"
+
+    @pytest.mark.parametrize('delimiter', [',', ';', '\t', '|'])
+    def test_sniff_detects_delimiter(self, delimiter):
+        """Each supported delimiter should be detected from the sample."""
+        content = self.HEADER.format(d=delimiter) + delimiter.join(['A', '1', '0', '0']) + "\n"
+        assert sniff_csv_dialect(content.encode('utf-8'), is_complete=True) == ('utf-8', delimiter)
+
+    def test_sniff_falls_back_to_latin1(self):
+        """Bytes that are not valid UTF-8 should be decoded as latin-1."""
+        content = (self.HEADER.format(d=',') + "Jos\xe9,1,0,0\n").encode('latin-1')
+        assert sniff_csv_dialect(content, is_complete=True) == ('latin-1', ',')
+
+    def test_sniff_tolerates_truncated_multibyte_sample(self):
+        """A UTF-8 character split by the sample boundary should not force latin-1."""
+        content = (self.HEADER.format(d=',') + "Raúl,1,0,0\nJosé,1,0,0\n").encode('utf-8')
+        cut = content.index("é".encode('utf-8')) + 1
+        assert sniff_csv_dialect(content[:cut], is_complete=False) == ('utf-8', ',')
+
+    def test_preview_reports_timings(self):
+        """Successful previews should include the dialect and a timing breakdown."""
+        uploaded_file = _UploadedFileMock(create_sample_csv_content())
+        success, preview_df, message = validate_and_preview_data(uploaded_file)
+        assert success is True
+        assert len(preview_df) == 5
+        assert "delimiter: ','" in message
+        assert "sniff" in message and "parse" in message and "validate" in message
+
+    def test_unrecognised_upload_fails_before_parsing(self):
+        """Uploads with no plausible delimiter should be rejected by the sniff stage alone."""
+        uploaded_file = _UploadedFileMock("not a csv at all\n" * 1000)
+        success, preview_df, message = validate_and_preview_data(uploaded_file)
+        assert success is False
+        assert preview_df.empty
+        assert "Could not parse CSV file" in message
+        assert "parse " not in message.split("⏱️")[-1]
+
+
+class TestStreamingIngestion:
+    """Test chunked ingestion of uploads."""
+
+    def test_stream_matches_in_memory_processing(self):
+        """Chunked ingestion should give the same players as a single parse."""
+        content = create_sample_csv_content()
+        progress_calls = []
+        success, players, message = ingest_csv_stream(
+            _UploadedFileMock(content),
+            chunk_rows=2,
+            progress=lambda *args: progress_calls.append(args),
+        )
+        assert success is True
+        assert players == process_uploaded_data(pd.read_csv(io.StringIO(content)))
+        assert [rows for rows, _, _ in progress_calls] == [2, 4, 5]
+        assert "5 rows in 3 chunk(s)" in message
+
+    def test_stream_accepts_files_above_in_memory_limits(self):
+        """Streaming should accept uploads larger than the preview limits."""
+        rows = "".join(f"Player {i};Club;{i % 30};{i % 7};FW\n" for i in range(60000))
+        content = "Player;Squad;Goals;Assists;Pos\n" + rows
+        uploaded_file = _UploadedFileMock(content, size_override=MAX_UPLOAD_SIZE_BYTES + 1)
+        success, players, _ = ingest_csv_stream(uploaded_file, max_bytes=2 * MAX_UPLOAD_SIZE_BYTES)
+        assert success is True
+        assert len(players) == 60000
+        assert players['Player 59999']['seasons'][0]['goals'] == 59999 % 30
+
+    def test_stream_enforces_configured_limits(self):
+        """Row and byte limits should be checked while reading."""
+        content = create_sample_csv_content()
+        success, _, message = ingest_csv_stream(_UploadedFileMock(content), chunk_rows=2, max_rows=3)
+        assert success is False
+        assert "too many rows" in message
+
+        # The declared size is not trusted; bytes are counted as they are read
+        uploaded_file = _UploadedFileMock(content, size_override=10)
+        success, _, message = ingest_csv_stream(uploaded_file, max_bytes=100)
+        assert success is False
+        assert "too large" in message
+
+    def test_stream_reports_invalid_chunk(self):
+        """Validation errors should name the rows of the failing chunk."""
+        content = create_sample_csv_content().replace("Ballon d'Or Win,La Liga Best", "Fake Award,La Liga Best")
+        success, players, message = ingest_csv_stream(_UploadedFileMock(content), chunk_rows=2)
+        assert success is False
+        assert players == {}
+        assert message.startswith("Rows 3-4")
+
+
 class TestNoFakeAwards:
     """Regression tests ensuring no fake award names are injected."""
 
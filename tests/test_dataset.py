@@ -0,0 +1,94 @@
+"""
+Tests for the columnar player dataset.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.dataset import PlayerDataset
+from core.players_data import load_players, load_dataset, _fallback_players
+
+
+class TestPlayerDatasetRoundTrip:
+    """Test that the dict-compatible view matches the nested source data."""
+
+    def test_round_trip_loaded_players(self):
+        """The JSON dataset uses the full schema, so the view should match exactly."""
+        players = load_players()
+        dataset = PlayerDataset.from_players(players)
+        assert dataset.to_dict() == players
+
+    def test_mapping_interface(self):
+        """Dataset should behave like a read-only dict keyed by player name."""
+        players = _fallback_players()
+        dataset = PlayerDataset.from_players(players)
+        assert len(dataset) == len(players)
+        assert list(dataset) == list(players)
+        assert 'Lionel Messi' in dataset
+        assert 'Nobody' not in dataset
+        assert dataset.get('Nobody') is None
+        messi = dataset['Lionel Messi']
+        assert messi['career_goals'] == 474
+        assert messi['seasons'][0]['awards'] == players['Lionel Messi']['seasons'][0]['awards']
+
+    def test_missing_fields_get_defaults(self):
+        """Fields absent from the source should be filled with schema defaults."""
+        dataset = PlayerDataset.from_players({'Solo': {'seasons': [{'goals': 3}]}})
+        solo = dataset['Solo']
+        assert solo['career_goals'] == 0
+        assert solo['teams'] == []
+        assert solo['seasons'][0]['awards'] == []
+        assert solo['seasons'][0]['cup_final_winner'] is False
+
+    def test_from_players_returns_existing_dataset(self):
+        """Passing a dataset through from_players should not rebuild it."""
+        dataset = load_dataset()
+        assert PlayerDataset.from_players(dataset) is dataset
+
+
+class TestPlayerDatasetGroupBys:
+    """Test vectorised aggregations over the season and label tables."""
+
+    def setup_method(self):
+        self.players = _fallback_players()
+        self.dataset = PlayerDataset.from_players(self.players)
+
+    def test_category_codes_are_small_ints(self):
+        """Label tables should store compact integer codes."""
+        assert self.dataset.labels['awards']['code'].dtype == np.int16
+
+    def test_per_player_sum(self):
+        """Summing season goals per player should match the nested data."""
+        totals = self.dataset.per_player(self.dataset.seasons['goals'])
+        expected = [sum(s['goals'] for s in p['seasons']) for p in self.players.values()]
+        assert totals.tolist() == expected
+
+    def test_label_count(self):
+        """Counting a label per player should match list.count on the nested data."""
+        counts = self.dataset.label_count('career_awards', "Ballon d'Or Win")
+        expected = [p['career_awards'].count("Ballon d'Or Win") for p in self.players.values()]
+        assert counts.tolist() == expected
+
+    def test_seasons_with_label(self):
+        """Season mask should flag seasons whose awards contain the label."""
+        mask = self.dataset.seasons_with_label('awards', 'La Liga Golden Boot')
+        expected = [
+            'La Liga Golden Boot' in s['awards']
+            for p in self.players.values() for s in p['seasons']
+        ]
+        assert mask.tolist() == expected
+
+    def test_unknown_label(self):
+        """Labels that never occur should count as zero."""
+        assert self.dataset.label_count('awards', 'Not An Award').sum() == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
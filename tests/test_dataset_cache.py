@@ -0,0 +1,106 @@
+"""
+Tests for the compiled binary dataset cache.
+"""
+
+import pytest
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.dataset_cache import cache_dir_for, load_cached_dataset, MANIFEST_NAME
+from core.players_data import _fallback_players, _load_from_json
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A small JSON dataset in the pipeline's {metadata, players} layout."""
+    path = tmp_path / "players.json"
+    path.write_text(
+        json.dumps({"metadata": {}, "players": _fallback_players()}, indent=2),
+        encoding="utf-8",
+    )
+    return path
+
+
+class _CountingLoader:
+    """Wraps _load_from_json and records how often the JSON is parsed."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return _load_from_json(path)
+
+
+class TestDatasetCache:
+    """Test cache compilation, memory-mapped loads and invalidation."""
+
+    def test_first_load_compiles_cache(self, source):
+        """The first load should parse the JSON and write the sidecar cache."""
+        loader = _CountingLoader()
+        dataset = load_cached_dataset(source, loader)
+        assert loader.calls == 1
+        assert (cache_dir_for(source) / MANIFEST_NAME).exists()
+        assert len(dataset) == 7
+
+    def test_warm_load_is_memory_mapped(self, source):
+        """A warm load should not parse the JSON and should map the arrays."""
+        load_cached_dataset(source, _load_from_json)
+        loader = _CountingLoader()
+        dataset = load_cached_dataset(source, loader)
+        assert loader.calls == 0
+        assert isinstance(dataset.seasons['goals'], np.memmap)
+
+    def test_cached_view_matches_source(self, source):
+        """Players read back from the cache should match a fresh parse."""
+        load_cached_dataset(source, _load_from_json)
+        cached = load_cached_dataset(source, _load_from_json)
+        fresh = load_cached_dataset(source, _load_from_json, cache_dir=source.parent / "other")
+        assert cached.to_dict() == fresh.to_dict()
+        assert cached['Lionel Messi']['career_goals'] == 474
+
+    def test_content_change_rebuilds(self, source):
+        """Changing the JSON should invalidate the cache."""
+        load_cached_dataset(source, _load_from_json)
+        data = json.loads(source.read_text(encoding="utf-8"))
+        data["players"]["Lionel Messi"]["career_goals"] = 999
+        source.write_text(json.dumps(data), encoding="utf-8")
+
+        loader = _CountingLoader()
+        dataset = load_cached_dataset(source, loader)
+        assert loader.calls == 1
+        assert dataset['Lionel Messi']['career_goals'] == 999
+
+    def test_touch_without_change_reuses_cache(self, source):
+        """A new mtime with identical content should be confirmed by hash, not rebuilt."""
+        load_cached_dataset(source, _load_from_json)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        loader = _CountingLoader()
+        load_cached_dataset(source, loader)
+        assert loader.calls == 0
+
+    def test_schema_version_mismatch_rebuilds(self, source):
+        """A cache written with another schema version should be ignored."""
+        load_cached_dataset(source, _load_from_json)
+        manifest_path = cache_dir_for(source) / MANIFEST_NAME
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["schema_version"] = -1
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+        loader = _CountingLoader()
+        load_cached_dataset(source, loader)
+        assert loader.calls == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
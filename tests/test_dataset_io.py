@@ -0,0 +1,178 @@
+"""
+Tests for reading and writing the processed dataset file (src/core/dataset_io.py).
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.dataset_io import (
+    DATASET_FORMATS,
+    is_gzip_file,
+    load_ndjson_index,
+    ndjson_paths,
+    read_dataset_json,
+    read_ndjson_player,
+    write_dataset_json,
+    write_dataset_ndjson,
+)
+
+METADATA = {"total_players": 2, "sources": ["FBref", "Wikipedia"]}
+PLAYERS = {
+    "Lionel Messi": {
+        "career_goals": 474,
+        "seasons": [{"season": "2011-12", "team": "Barcelona", "goals": 50, "awards": ["La Liga Golden Boot"]}],
+        "career_awards": ["Ballon d'Or Win"],
+    },
+    "Raúl González": {"career_goals": 228, "seasons": [], "career_awards": []},
+}
+
+
+class TestWriteDatasetJson:
+    """Test the streaming dataset writers."""
+
+    def test_pretty_matches_json_dump(self, tmp_path):
+        """The pretty writer should produce exactly what json.dump(indent=2) does."""
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, PLAYERS)
+
+        expected = json.dumps({"metadata": METADATA, "players": PLAYERS}, indent=2, ensure_ascii=False)
+        assert path.read_text(encoding='utf-8') == expected
+
+    def test_pretty_empty_players_matches_json_dump(self, tmp_path):
+        """An empty player set should still match json.dump."""
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, {})
+
+        expected = json.dumps({"metadata": METADATA, "players": {}}, indent=2, ensure_ascii=False)
+        assert path.read_text(encoding='utf-8') == expected
+
+    @pytest.mark.parametrize('fmt', DATASET_FORMATS)
+    def test_round_trip_preserves_content_and_order(self, tmp_path, fmt):
+        """Every format should read back to the same document, in player order."""
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, PLAYERS.items(), fmt=fmt)
+
+        document = read_dataset_json(path)
+        assert document == {"metadata": METADATA, "players": PLAYERS}
+        assert list(document["players"]) == list(PLAYERS)
+
+    def test_compact_writes_one_player_per_line(self, tmp_path):
+        """Compact output should be smaller and keep one player per line."""
+        pretty, compact = tmp_path / 'pretty.json', tmp_path / 'compact.json'
+        write_dataset_json(pretty, METADATA, PLAYERS)
+        write_dataset_json(compact, METADATA, PLAYERS, fmt='compact')
+
+        assert compact.stat().st_size < pretty.stat().st_size
+        assert len(compact.read_text(encoding='utf-8').splitlines()) == len(PLAYERS) + 1
+
+    def test_gzip_is_detected_and_reproducible(self, tmp_path):
+        """Gzip output should be recognised by its magic bytes and not embed a timestamp."""
+        first, second = tmp_path / 'a.json', tmp_path / 'b.json'
+        write_dataset_json(first, METADATA, PLAYERS, fmt='gzip')
+        write_dataset_json(second, METADATA, PLAYERS, fmt='gzip')
+
+        assert is_gzip_file(first)
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_unknown_format_rejected(self, tmp_path):
+        """An unknown format should raise before anything is written."""
+        path = tmp_path / 'players.json'
+        with pytest.raises(ValueError):
+            write_dataset_json(path, METADATA, PLAYERS, fmt='zstd')
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """A writer that fails midway should leave the existing file untouched."""
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, PLAYERS)
+        before = path.read_bytes()
+
+        def broken_players():
+            yield "Lionel Messi", PLAYERS["Lionel Messi"]
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_dataset_json(path, METADATA, broken_players(), fmt='compact')
+        assert path.read_bytes() == before
+        assert [p.name for p in tmp_path.iterdir()] == ['players.json']
+
+
+class TestNdjsonIndex:
+    """Test the NDJSON copy and its byte offset index."""
+
+    def _write(self, tmp_path):
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, PLAYERS)
+        write_dataset_ndjson(path, METADATA, PLAYERS)
+        return path
+
+    def test_each_player_read_back_by_offset(self, tmp_path):
+        """Every indexed player should parse back from its own line."""
+        path = self._write(tmp_path)
+        index = load_ndjson_index(path)
+
+        assert index['metadata'] == METADATA
+        assert list(index['offsets']) == list(PLAYERS)
+        for name, profile in PLAYERS.items():
+            assert read_ndjson_player(path, index, name) == profile
+
+    def test_one_player_per_line(self, tmp_path):
+        """The NDJSON copy should hold one record per line."""
+        path = self._write(tmp_path)
+        lines = ndjson_paths(path)[0].read_text(encoding='utf-8').splitlines()
+
+        assert [json.loads(line)['name'] for line in lines] == list(PLAYERS)
+
+    def test_unknown_player_returns_none(self, tmp_path):
+        """A name missing from the index should return None."""
+        path = self._write(tmp_path)
+        assert read_ndjson_player(path, load_ndjson_index(path), 'Nobody') is None
+
+    def test_index_rejected_when_dataset_replaced(self, tmp_path):
+        """Rewriting the dataset without the NDJSON copy should invalidate the index."""
+        path = self._write(tmp_path)
+        write_dataset_json(path, METADATA, {"Lionel Messi": PLAYERS["Lionel Messi"]})
+
+        assert load_ndjson_index(path) is None
+
+    def test_index_rejected_after_same_size_edit(self, tmp_path):
+        """An edit that keeps the dataset's byte length should still invalidate the index."""
+        path = self._write(tmp_path)
+        text = path.read_text(encoding='utf-8')
+        path.write_text(text.replace('"career_goals": 474', '"career_goals": 475'), encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert path.stat().st_size == len(text.encode('utf-8'))
+        assert load_ndjson_index(path) is None
+
+    def test_index_kept_when_only_mtime_changed(self, tmp_path):
+        """Touching the dataset without changing its bytes shouldn't invalidate the index."""
+        path = self._write(tmp_path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_ndjson_index(path) is not None
+
+    def test_missing_index_returns_none(self, tmp_path):
+        """A dataset without an NDJSON copy has no index."""
+        path = tmp_path / 'players.json'
+        write_dataset_json(path, METADATA, PLAYERS)
+        assert load_ndjson_index(path) is None
+
+    def test_mismatched_offset_raises(self, tmp_path):
+        """An offset that points at another player's line should raise ValueError."""
+        path = self._write(tmp_path)
+        index = load_ndjson_index(path)
+        index['offsets']['Raúl González'] = index['offsets']['Lionel Messi']
+
+        with pytest.raises(ValueError):
+            read_ndjson_player(path, index, 'Raúl González')
@@ -0,0 +1,162 @@
+"""
+Tests for the normalized table export (src/core/dataset_tables.py).
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+import core.dataset_tables as dataset_tables
+from core.aggregation import aggregate_player_stats
+from core.dataset import PlayerDataset
+from core.dataset_io import write_dataset_json
+from core.dataset_tables import TABLE_NAMES, dataset_frames
+from core.players_data import load_dataset, load_tables, points_system
+
+PLAYERS = {
+    "Lionel Messi": {
+        "career_goals": 474, "team": "Barcelona", "position": "FW", "nationality": "ARG",
+        "teams": ["Barcelona"], "career_awards": ["Ballon d'Or Win", "Ballon d'Or Win"],
+        "total_la_liga_titles": 10, "total_champions_league_titles": 4,
+        "seasons": [
+            {"season": "2011-12", "team": "Barcelona", "goals": 50, "assists": 16,
+             "matches_played": 37, "minutes": 3200, "awards": ["La Liga Golden Boot"],
+             "team_achievements": [], "cup_final_winner": True, "cl_achievements": ["CL Top Scorer"]},
+            {"season": "2012-13", "team": "Barcelona", "goals": 46, "assists": 12,
+             "matches_played": 32, "minutes": 2800, "awards": ["La Liga Golden Boot"],
+             "team_achievements": ["La Liga Title"], "cup_final_winner": False, "cl_achievements": []},
+        ],
+    },
+    "Raúl González": {
+        "career_goals": 228, "team": "Real Madrid", "position": "FW", "nationality": "ESP",
+        "teams": ["Real Madrid"], "career_awards": [],
+        "total_la_liga_titles": 6, "total_champions_league_titles": 3,
+        "seasons": [
+            {"season": "2000-01", "team": "Real Madrid", "goals": 24, "assists": 9,
+             "matches_played": 36, "minutes": 3100, "awards": [],
+             "team_achievements": ["La Liga Title"], "cup_final_winner": False, "cl_achievements": []},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    path = tmp_path / 'players.json'
+    write_dataset_json(path, {}, PLAYERS)
+    return path
+
+
+class TestDatasetFrames:
+    """Test the normalized frames built from a PlayerDataset."""
+
+    def test_every_table_present(self):
+        """All tables should be built, one row per player / season / label."""
+        frames = dataset_frames(PlayerDataset.from_players(PLAYERS))
+
+        assert set(frames) == set(TABLE_NAMES)
+        assert frames['players']['name'].tolist() == list(PLAYERS)
+        assert len(frames['seasons']) == 3
+        assert len(frames['career_awards']) == 2
+
+    def test_season_labels_carry_player_and_season_ids(self):
+        """Season label rows should point at both their season and their player."""
+        frames = dataset_frames(PlayerDataset.from_players(PLAYERS))
+        achievements = frames['team_achievements']
+
+        assert achievements['label'].astype(str).tolist() == ['La Liga Title', 'La Liga Title']
+        assert achievements['season_id'].tolist() == [1, 2]
+        assert achievements['player_id'].tolist() == [0, 1]
+
+    def test_load_tables_without_pyarrow(self, dataset_path, monkeypatch):
+        """Without pyarrow the projected tables should come from the JSON dataset."""
+        monkeypatch.setattr(dataset_tables, 'HAS_PYARROW', False)
+        tables = load_tables({'seasons': ['player_id', 'goals']}, dataset_path)
+
+        assert list(tables) == ['seasons']
+        assert list(tables['seasons'].columns) == ['player_id', 'goals']
+        assert tables['seasons']['goals'].tolist() == [50, 46, 24]
+
+
+class TestArrowTables:
+    """Test the Arrow IPC export and memory-mapped loader."""
+
+    @pytest.fixture
+    def arrow_path(self, dataset_path):
+        pytest.importorskip('pyarrow')
+        from core.dataset_tables import write_arrow_tables
+        write_arrow_tables(dataset_path, PlayerDataset.from_players(PLAYERS))
+        return dataset_path
+
+    def test_dataset_round_trip(self, arrow_path):
+        """load_dataset() should read the Arrow tables and match the JSON exactly."""
+        with patch('core.players_data.load_cached_dataset', side_effect=AssertionError('npy cache used')):
+            dataset = load_dataset(arrow_path)
+
+        assert dataset.to_dict() == PlayerDataset.from_players(PLAYERS).to_dict()
+        pd.testing.assert_frame_equal(
+            aggregate_player_stats(dataset, points_system),
+            aggregate_player_stats(PLAYERS, points_system),
+        )
+
+    def test_projection_reads_only_requested_columns(self, arrow_path):
+        """A projection should return only the requested tables and columns."""
+        tables = load_tables({'seasons': ['player_id', 'season', 'goals'], 'players': None}, arrow_path)
+
+        assert set(tables) == {'seasons', 'players'}
+        assert list(tables['seasons'].columns) == ['player_id', 'season', 'goals']
+        assert tables['seasons']['season'].astype(str).tolist() == ['2011-12', '2012-13', '2000-01']
+        assert len(tables['players'].columns) == 8
+
+    def test_matches_json_fallback(self, arrow_path, monkeypatch):
+        """Arrow and JSON-built tables should hold the same rows."""
+        from_arrow = load_tables(path=arrow_path)
+        monkeypatch.setattr(dataset_tables, 'HAS_PYARROW', False)
+        from_json = load_tables(path=arrow_path)
+
+        for name in TABLE_NAMES:
+            if len(from_json[name]):
+                pd.testing.assert_frame_equal(from_arrow[name], from_json[name])
+
+    def test_numeric_columns_view_mapped_buffers(self, arrow_path):
+        """Numeric columns and category codes should point into the memory-mapped files, not copies."""
+        read = dataset_tables.read_arrow_tables
+        mapped = {}
+
+        def capturing_read(*args, **kwargs):
+            mapped.update(read(*args, **kwargs))
+            return mapped
+
+        with patch.object(dataset_tables, 'read_arrow_tables', capturing_read):
+            dataset = dataset_tables.dataset_from_arrow(dataset_tables.tables_dir_for(arrow_path))
+
+        def buffer_address(table, column):
+            array = mapped[table].column(column).chunk(0)
+            return (array.indices if hasattr(array, 'indices') else array).buffers()[1].address
+
+        for column in ('player_id', 'goals', 'minutes', 'season', 'team'):
+            array = dataset.seasons[column]
+            assert array.ctypes.data == buffer_address('seasons', column), column
+            assert not array.flags.writeable
+        assert dataset.players['career_goals'].ctypes.data == buffer_address('players', 'career_goals')
+        assert dataset.labels['awards']['code'].ctypes.data == buffer_address('awards', 'label')
+
+    def test_stale_tables_ignored(self, arrow_path):
+        """Rewriting the JSON dataset should make the Arrow tables stale."""
+        from core.dataset_tables import fresh_tables_dir
+        assert fresh_tables_dir(arrow_path) is not None
+
+        write_dataset_json(arrow_path, {}, {"Raúl González": PLAYERS["Raúl González"]})
+        assert fresh_tables_dir(arrow_path) is None
+        assert list(load_dataset(arrow_path)) == ["Raúl González"]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,138 @@
+"""
+Tests for the reusable driver pool (scripts/driver_pool.py).
+"""
+
+import itertools
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.alive = True
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(**kwargs):
+    created = []
+
+    def factory():
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    pool = DriverPool(factory, is_alive=lambda d: d.alive, **kwargs)
+    return pool, created
+
+
+class TestDriverPool:
+    """Test reuse, recycling, health checks and the size cap."""
+
+    def test_driver_reused_across_pages(self):
+        """Sequential checkouts should share one driver."""
+        pool, created = _pool(size=2)
+        for _ in range(5):
+            with pool.driver():
+                pass
+
+        assert len(created) == 1
+
+    def test_recycled_after_max_pages(self):
+        """A driver should be quit and replaced after max_pages checkouts."""
+        pool, created = _pool(size=1, max_pages=2)
+        seen = []
+        for _ in range(5):
+            with pool.driver() as driver:
+                seen.append(driver.id)
+
+        assert len(created) == 3
+        assert seen[0] == seen[1] != seen[2] == seen[3] != seen[4]
+        assert created[0].quit_called and created[1].quit_called
+
+    def test_crashed_driver_replaced(self):
+        """A failed page whose driver no longer responds should retire that driver."""
+        pool, created = _pool(size=1)
+        with pytest.raises(RuntimeError):
+            with pool.driver() as driver:
+                driver.alive = False
+                raise RuntimeError('chrome crashed')
+        with pool.driver() as driver:
+            assert driver is created[1]
+
+        assert created[0].quit_called
+        assert pool.retired == 1
+
+    def test_page_error_keeps_healthy_driver(self):
+        """A page-level error from a healthy driver shouldn't cost a browser restart."""
+        pool, created = _pool(size=1)
+        with pytest.raises(ValueError):
+            with pool.driver():
+                raise ValueError('no table on page')
+        with pool.driver():
+            pass
+
+        assert len(created) == 1
+
+    def test_dead_idle_driver_replaced_on_checkout(self):
+        """An idle driver that died should be health-checked out and replaced."""
+        pool, created = _pool(size=1)
+        with pool.driver():
+            pass
+        created[0].alive = False
+        with pool.driver() as driver:
+            assert driver is created[1]
+
+    def test_size_caps_live_drivers(self):
+        """Concurrent borrowers beyond size should wait for a driver."""
+        pool, created = _pool(size=2)
+        held, peak, lock = [0], [0], threading.Lock()
+
+        def borrow():
+            with pool.driver():
+                with lock:
+                    held[0] += 1
+                    peak[0] = max(peak[0], held[0])
+                time.sleep(0.05)
+                with lock:
+                    held[0] -= 1
+
+        threads = [threading.Thread(target=borrow) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak[0] == 2
+        assert len(created) == 2
+
+    def test_close_quits_drivers(self):
+        """Closing the pool should quit every driver and refuse new checkouts."""
+        pool, created = _pool(size=2)
+        with pool:
+            with pool.driver():
+                pass
+
+        assert created[0].quit_called
+        with pytest.raises(RuntimeError):
+            with pool.driver():
+                pass
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
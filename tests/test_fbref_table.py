@@ -0,0 +1,108 @@
+"""
+Tests for the single-pass FBref table extractor (scripts/fbref_table.py).
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import scrape_fbref
+from fbref_table import extract_player_stats, standard_column_names, stats_table_html
+
+PAGE = (project_root / 'tests' / 'fixtures' / 'fbref_season.html').read_text(encoding='utf-8')
+TABLE = stats_table_html(PAGE)
+SEASON = '2016-2017'
+
+
+def _generic(table_html):
+    """The read_html + _clean_player_stats path the extractor replaces."""
+    return scrape_fbref._clean_player_stats(scrape_fbref._parse_stats_table(table_html), SEASON)
+
+
+def _messi_row(table_html):
+    return re.search(r'<tr><th scope="row".*?</tr>', table_html, flags=re.S).group(0)
+
+
+class TestExtractPlayerStats:
+    """Test the extractor against the generic parser and FBref's markup quirks."""
+
+    def test_matches_generic_parser(self):
+        """The extractor should write the same CSV as read_html + _clean_player_stats."""
+        df = extract_player_stats(TABLE, SEASON)
+
+        assert df.to_csv(index=False) == _generic(TABLE).to_csv(index=False)
+
+    def test_matches_generic_dtypes_without_header_repeats(self):
+        """Without repeated header rows read_html infers types; the extractor should agree."""
+        table = re.sub(r'<tr class="thead">.*?</tr>\n?', '', TABLE, flags=re.S)
+
+        pd.testing.assert_frame_equal(extract_player_stats(table, SEASON), _generic(table))
+
+    def test_header_repeat_rows_skipped(self):
+        """Repeated header rows shouldn't become players."""
+        df = extract_player_stats(TABLE, SEASON)
+
+        assert len(df) == 7
+        assert 'Player' not in set(df['player'])
+        assert df['goals'].dtype == int and df['Rk'].tolist() == list(range(1, 8))
+
+    def test_cells_placed_by_data_stat(self):
+        """A row missing a cell shouldn't shift the columns after it."""
+        row = _messi_row(TABLE)
+        short = re.sub(r'<td[^>]*data-stat="games_starts"[^>]*>.*?</td>', '', row)
+        df = extract_player_stats(TABLE.replace(row, short), SEASON)
+        messi = df.iloc[0]
+
+        assert (messi['goals'], messi['assists'], messi['Playing Time_Min']) == (37, 9, 2832)
+        assert pd.isna(messi['Playing Time_Starts'])
+
+    def test_blank_counts_become_zero(self):
+        """Empty count cells should be 0, like _clean_player_stats makes them."""
+        row = _messi_row(TABLE)
+        blank = row.replace('data-stat="assists">9<', 'data-stat="assists"><')
+        df = extract_player_stats(TABLE.replace(row, blank), SEASON)
+
+        assert df.iloc[0]['assists'] == 0
+
+    def test_unrecognised_markup_returns_none(self):
+        """A table without thead/tbody should be left to the generic parser."""
+        table = '<table class="stats_table"><tr><th>Player</th></tr><tr><td>X</td></tr></table>'
+
+        assert extract_player_stats(table, SEASON) is None
+
+    def test_save_season_falls_back(self, tmp_path):
+        """_save_season should still save tables the extractor doesn't recognise."""
+        table = ('<table><tr><th></th><th></th><th>Performance</th></tr>'
+                 '<tr><th>Player</th><th>Squad</th><th>Gls</th></tr>'
+                 '<tr><td>X</td><td>Y</td><td>3</td></tr></table>')
+        players = scrape_fbref._save_season(table, SEASON, tmp_path / 'out.csv')
+
+        assert players == 1
+        assert pd.read_csv(tmp_path / 'out.csv').iloc[0]['goals'] == 3
+
+
+class TestHelpers:
+    """Test the table lookup and the shared column rules."""
+
+    def test_stats_table_html(self):
+        """The stats table should be found in a page; a page without one gives None."""
+        assert TABLE.startswith('<table') and 'stats_standard' in TABLE
+        assert stats_table_html('<html><body><table><tr><td>1</td></tr></table></body></html>') is None
+
+    def test_per_90_rates_not_renamed(self):
+        """Only the Performance totals become goals/assists, not the per-90 rates."""
+        names = standard_column_names(['Player', 'Performance_Gls', 'Performance_Ast',
+                                       'Per 90 Minutes_Gls', 'Per 90 Minutes_Ast'])
+
+        assert names == {'Player': 'player', 'Performance_Gls': 'goals', 'Performance_Ast': 'assists'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
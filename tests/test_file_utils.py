@@ -0,0 +1,78 @@
+"""
+Tests for the shared atomic write and hashing helpers (src/core/file_utils.py).
+"""
+
+import hashlib
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.file_utils import atomic_path, atomic_write, file_sha256
+
+posix_modes = pytest.mark.skipif(os.name != 'posix', reason='POSIX permission bits')
+
+
+def _mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+class TestAtomicWrite:
+    """Test temp-file-and-rename writes and the modes they leave behind."""
+
+    @posix_modes
+    def test_new_file_gets_umask_mode(self, tmp_path):
+        """A new file should get the mode open() would give it, not mkstemp's 0600."""
+        umask = os.umask(0)
+        os.umask(umask)
+
+        atomic_write(tmp_path / 'sub' / 'new.txt', lambda f: f.write('x'), mode='w')
+
+        assert _mode(tmp_path / 'sub' / 'new.txt') == 0o666 & ~umask
+
+    @posix_modes
+    def test_existing_file_keeps_its_mode(self, tmp_path):
+        """Replacing a file should keep its permission bits."""
+        path = tmp_path / 'season.csv'
+        path.write_text('old')
+        path.chmod(0o640)
+
+        atomic_write(path, lambda f: f.write(b'new'))
+
+        assert path.read_bytes() == b'new'
+        assert _mode(path) == 0o640
+
+    @posix_modes
+    def test_atomic_path_for_named_writers(self, tmp_path):
+        """atomic_path should rename a file built by name, with the same mode rules."""
+        path = tmp_path / 'db.sqlite'
+        path.write_bytes(b'old')
+        path.chmod(0o644)
+
+        with atomic_path(path) as tmp:
+            assert tmp.parent == tmp_path and tmp != path
+            tmp.write_bytes(b'new')
+
+        assert path.read_bytes() == b'new'
+        assert _mode(path) == 0o644
+        assert [p.name for p in tmp_path.iterdir()] == ['db.sqlite']
+
+
+class TestFileSha256:
+
+    def test_matches_hashlib(self, tmp_path):
+        path = tmp_path / 'data.bin'
+        data = os.urandom(3 * (1 << 20) + 7)
+        path.write_bytes(data)
+
+        assert file_sha256(path) == hashlib.sha256(data).hexdigest()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,144 @@
+"""
+Tests for the HTTP response cache (scripts/http_cache.py) and offline Wikipedia replay.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import scrape_wikipedia
+from config import WIKI_URLS
+from http_cache import HttpCache, OfflineCacheMiss
+
+PICHICHI_HTML = """
+<html><body>
+<table class="wikitable">
+  <tr><th>Season</th><th>Player</th><th>Club</th><th>Apps</th><th>Goals</th><th>Ratio</th></tr>
+  <tr><td rowspan="2">2016–17</td><td>Lionel Messi (4)</td><td>Barcelona</td><td>34</td><td>37</td><td>1.09</td></tr>
+  <tr><td>Luis Suárez</td><td>Barcelona</td><td>35</td><td>29[1]</td><td>0.83</td></tr>
+  <tr><td>2017–18</td><td>Lionel Messi</td><td>Barcelona</td><td>36</td><td>34</td><td>0.94</td></tr>
+</table>
+</body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+        self.encoding = 'utf-8'
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} error')
+
+
+class FakeSession:
+    """Serves one page with an ETag and answers matching conditional requests with 304."""
+
+    def __init__(self, body=b'<html>page</html>', etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {'ETag': self.etag, 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+
+class TestHttpCache:
+    """Test storage, conditional revalidation and offline mode."""
+
+    def test_refresh_is_conditional(self, tmp_path):
+        """A second fetch should send the stored validators and reuse the body on 304."""
+        cache, session = HttpCache(tmp_path), FakeSession()
+
+        first = cache.fetch('https://example.org/a', session=session)
+        second = cache.fetch('https://example.org/a', session=session)
+
+        assert (first.source, second.source) == ('fetched', 'not-modified')
+        assert second.text == '<html>page</html>'
+        assert session.requests[1]['If-None-Match'] == '"v1"'
+        assert session.requests[1]['If-Modified-Since'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+    def test_changed_page_replaces_cached_body(self, tmp_path):
+        """A 200 on revalidation should overwrite the cached copy."""
+        cache = HttpCache(tmp_path)
+        cache.fetch('https://example.org/a', session=FakeSession(b'old', '"v1"'))
+        cache.fetch('https://example.org/a', session=FakeSession(b'new', '"v2"'))
+
+        cache.offline = True
+        assert cache.fetch('https://example.org/a').text == 'new'
+
+    def test_bodies_are_compressed(self, tmp_path):
+        """Stored bodies should be gzip files, smaller than repetitive HTML."""
+        body = b'<tr><td>row</td></tr>' * 1000
+        HttpCache(tmp_path).fetch('https://example.org/a', session=FakeSession(body))
+
+        stored = next(tmp_path.glob('*.html.gz')).read_bytes()
+        assert stored[:2] == b'\x1f\x8b'
+        assert len(stored) < len(body) / 10
+
+    def test_offline_never_touches_network(self, tmp_path):
+        """Offline mode should serve cached pages and raise for unknown URLs."""
+        HttpCache(tmp_path).fetch('https://example.org/a', session=FakeSession())
+        session = FakeSession()
+        offline = HttpCache(tmp_path, offline=True)
+
+        assert offline.fetch('https://example.org/a', session=session).source == 'offline'
+        with pytest.raises(OfflineCacheMiss):
+            offline.fetch('https://example.org/b', session=session)
+        assert session.requests == []
+
+    def test_damaged_entry_is_a_miss(self, tmp_path):
+        """A truncated body should be refetched rather than served."""
+        cache = HttpCache(tmp_path)
+        cache.fetch('https://example.org/a', session=FakeSession())
+        body_path = next(tmp_path.glob('*.html.gz'))
+        body_path.write_bytes(body_path.read_bytes()[:10])
+
+        assert cache.lookup('https://example.org/a') is None
+
+
+class TestOfflineReplay:
+    """Test re-running the Wikipedia parsers from cached HTML."""
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch):
+        cache = HttpCache(tmp_path / 'http')
+        cache.store(WIKI_URLS['pichichi'], PICHICHI_HTML.encode(), {}, 'utf-8')
+        monkeypatch.setattr(scrape_wikipedia, 'HTTP_CACHE', cache)
+        return cache
+
+    def test_parser_runs_from_cache(self, cache, tmp_path):
+        """Offline scraping should re-parse cached pages, handling rowspans and citations."""
+        data = scrape_wikipedia.scrape_categories(['pichichi'], wiki_dir=tmp_path, offline=True)
+
+        assert [(r['season'], r['player'], r['goals']) for r in data['pichichi']] == [
+            ('2016–17', 'Lionel Messi', 37),
+            ('2016–17', 'Luis Suárez', 29),
+            ('2017–18', 'Lionel Messi', 34),
+        ]
+        assert (tmp_path / 'pichichi.json').exists()
+        assert not cache.offline
+
+    def test_uncached_category_keeps_saved_json(self, cache, tmp_path):
+        """A page that was never fetched shouldn't wipe the category's saved records."""
+        (tmp_path / 'ballon_dor.json').write_text('[{"year": 2009}]')
+
+        data = scrape_wikipedia.scrape_categories(['ballon_dor'], wiki_dir=tmp_path, offline=True)
+
+        assert data['ballon_dor'] == [{'year': 2009}]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
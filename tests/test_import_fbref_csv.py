@@ -0,0 +1,157 @@
+"""
+Tests for the FBref CSV importer (scripts/import_fbref_csv.py).
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import import_fbref_csv
+from import_fbref_csv import import_csv_dir
+
+RAW_EXPORT = (
+    'Rk,Player,Nation,Pos,Squad,Age,Born,MP,Starts,Min,Gls,Ast,Matches\n'
+    '1,Lionel Messi,ar ARG,FW,Barcelona,30-161,1987,36,32,"2,996",34,12,Matches\n'
+    '2,Player,,,,,,,,,,,\n'
+    '3,Luis Suárez,uy URU,FW,Barcelona,30-100,1987,33,33,"2,900",25,6,Matches\n'
+)
+
+
+@pytest.fixture
+def fbref_dir(tmp_path):
+    directory = tmp_path / 'fbref'
+    directory.mkdir()
+    for season in ('2016-2017', '2017-2018', '2018-2019'):
+        (directory / f'{season}.csv').write_text(RAW_EXPORT, encoding='utf-8')
+    (directory / '_notes.csv').write_text('ignored\n1\n')
+    return directory
+
+
+@pytest.fixture
+def cleaned(monkeypatch):
+    """Names of the files _clean_file processed (in-process runs only)."""
+    names = []
+    clean = import_fbref_csv._clean_file
+
+    def tracking_clean(path):
+        names.append(path.name)
+        return clean(path)
+
+    monkeypatch.setattr(import_fbref_csv, '_clean_file', tracking_clean)
+    return names
+
+
+def _import(fbref_dir, **kwargs):
+    kwargs.setdefault('workers', 1)
+    return import_csv_dir(fbref_dir, cache_dir=fbref_dir.parent / 'cache', **kwargs)
+
+
+class TestImportCsvDir:
+    """Test cleaning, the cleaned-file manifest and atomic rewrites."""
+
+    def test_exports_cleaned_in_place(self, fbref_dir):
+        """Raw exports should be rewritten in the cleaned schema."""
+        assert _import(fbref_dir) == 6
+
+        df = pd.read_csv(fbref_dir / '2017-2018.csv')
+        assert list(df['player']) == ['Lionel Messi', 'Luis Suárez']
+        assert list(df['goals']) == [34, 25]
+        assert set(df['season']) == {'2017-2018'}
+        assert (fbref_dir / '_notes.csv').read_text() == 'ignored\n1\n'
+
+    def test_unchanged_files_skipped(self, fbref_dir, cleaned):
+        """A rerun on an unchanged directory shouldn't read or rewrite any file."""
+        _import(fbref_dir)
+        mtimes = {f.name: f.stat().st_mtime_ns for f in fbref_dir.glob('*.csv')}
+        cleaned.clear()
+
+        assert _import(fbref_dir) == 6
+        assert cleaned == []
+        assert {f.name: f.stat().st_mtime_ns for f in fbref_dir.glob('*.csv')} == mtimes
+
+    def test_changed_file_recleaned(self, fbref_dir, cleaned):
+        """Only a file replaced since the last run should be cleaned again."""
+        _import(fbref_dir)
+        cleaned.clear()
+        (fbref_dir / '2018-2019.csv').write_text(RAW_EXPORT.replace('34,12', '40,12'), encoding='utf-8')
+
+        _import(fbref_dir)
+
+        assert cleaned == ['2018-2019.csv']
+        assert pd.read_csv(fbref_dir / '2018-2019.csv')['goals'].iloc[0] == 40
+
+    def test_already_clean_file_not_rewritten(self, fbref_dir):
+        """A file already in the cleaned schema should be recorded but left untouched."""
+        _import(fbref_dir)
+        path = fbref_dir / '2016-2017.csv'
+        data, mtime = path.read_bytes(), path.stat().st_mtime_ns
+
+        _import(fbref_dir, force=True)
+
+        assert path.read_bytes() == data
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_failed_write_keeps_original(self, fbref_dir, monkeypatch):
+        """A crash while writing the cleaned CSV should leave the raw export intact."""
+        atomic_write = import_fbref_csv.atomic_write
+
+        def crash_mid_write(path, write, mode='wb'):
+            def partial(f):
+                f.write(b'Rk,player,nat')
+                raise KeyboardInterrupt
+            atomic_write(path, partial, mode)
+
+        monkeypatch.setattr(import_fbref_csv, 'atomic_write', crash_mid_write)
+        with pytest.raises(KeyboardInterrupt):
+            _import(fbref_dir)
+
+        assert (fbref_dir / '2016-2017.csv').read_text(encoding='utf-8') == RAW_EXPORT
+        assert not list(fbref_dir.glob('.*.tmp'))
+
+    @pytest.mark.skipif(os.name != 'posix', reason='POSIX permission bits')
+    def test_cleaned_file_keeps_its_mode(self, fbref_dir):
+        """Cleaning a hand-exported CSV shouldn't narrow its permissions to 0600."""
+        path = fbref_dir / '2016-2017.csv'
+        path.chmod(0o644)
+
+        _import(fbref_dir)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    def test_process_pool_matches_serial(self, fbref_dir, tmp_path):
+        """Cleaning in worker processes should write the same files as cleaning inline."""
+        serial_dir = tmp_path / 'serial'
+        serial_dir.mkdir()
+        for f in fbref_dir.glob('*.csv'):
+            (serial_dir / f.name).write_bytes(f.read_bytes())
+
+        assert _import(fbref_dir, workers=2) == _import(serial_dir, workers=1)
+        for f in fbref_dir.glob('*.csv'):
+            assert f.read_bytes() == (serial_dir / f.name).read_bytes()
+
+    def test_empty_file_retried(self, fbref_dir, cleaned):
+        """A file without player rows shouldn't be recorded as cleaned."""
+        (fbref_dir / '2019-2020.csv').write_text('Rk,Player\n')
+        _import(fbref_dir)
+        cleaned.clear()
+
+        _import(fbref_dir)
+
+        assert cleaned == ['2019-2020.csv']
+
+    def test_no_csv_files(self, tmp_path):
+        """An empty directory should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            _import(tmp_path)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
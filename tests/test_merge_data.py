@@ -0,0 +1,357 @@
+"""
+Tests for the FBref + Wikipedia merge step (scripts/merge_data.py).
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import merge_data
+from merge_data import (
+    _season_key,
+    build_player_profiles,
+    load_fbref_data,
+    load_wikipedia_data,
+    merge,
+)
+from src.core.dataset_io import load_ndjson_index, read_ndjson_player
+from src.core.query import database_is_current, open_database, query
+
+
+def _fbref_frame(rows):
+    columns = ['player', 'team', 'season', 'goals', 'assists', 'matches_played', 'minutes',
+               'position', 'nationality']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _write_season_csv(directory, season, rows):
+    df = pd.DataFrame(rows, columns=['player', 'team', 'goals', 'assists'])
+    df['season'] = season
+    df.to_csv(directory / f'{season}.csv', index=False)
+
+
+class TestLoadFbrefData:
+    """Test the cached, concurrent FBref CSV loader."""
+
+    @pytest.fixture
+    def fbref_dir(self, tmp_path):
+        directory = tmp_path / 'fbref'
+        directory.mkdir()
+        _write_season_csv(directory, '2021-2022', [['A', 'Getafe', 5, 1], ['B', 'Sevilla', 3, 2]])
+        _write_season_csv(directory, '2022-2023', [['A', 'Getafe', 7, 0]])
+        _write_season_csv(directory, '2023-2024', [['C', 'Girona', 9, 4]])
+        (directory / '_notes.csv').write_text('ignored\n1\n')
+        return directory
+
+    @pytest.fixture
+    def parsed_files(self, monkeypatch):
+        parsed = []
+        read = merge_data._read_fbref_csv
+
+        def tracking_read(path):
+            parsed.append(path.name)
+            return read(path)
+
+        monkeypatch.setattr(merge_data, '_read_fbref_csv', tracking_read)
+        return parsed
+
+    def test_concatenates_seasons_in_file_order(self, fbref_dir, tmp_path):
+        """Rows come back in sorted file order, skipping underscore-prefixed files."""
+        df = load_fbref_data(fbref_dir, tmp_path / 'cache')
+        assert df['player'].tolist() == ['A', 'B', 'A', 'C']
+        assert df['season'].tolist() == ['2021-2022', '2021-2022', '2022-2023', '2023-2024']
+        assert '_source' not in df.columns
+
+    def test_only_changed_seasons_are_reparsed(self, fbref_dir, tmp_path, parsed_files):
+        """A warm run parses nothing; editing one season re-parses only that file."""
+        cache_dir = tmp_path / 'cache'
+        load_fbref_data(fbref_dir, cache_dir)
+        assert len(parsed_files) == 3
+
+        parsed_files.clear()
+        load_fbref_data(fbref_dir, cache_dir)
+        assert parsed_files == []
+
+        _write_season_csv(fbref_dir, '2022-2023', [['A', 'Getafe', 8, 0], ['D', 'Getafe', 1, 0]])
+        df = load_fbref_data(fbref_dir, cache_dir)
+        assert parsed_files == ['2022-2023.csv']
+        assert df['player'].tolist() == ['A', 'B', 'A', 'D', 'C']
+        assert df['goals'].tolist() == [5, 3, 8, 1, 9]
+
+    def test_touched_season_is_not_reparsed(self, fbref_dir, tmp_path, parsed_files):
+        """A file whose mtime changed but whose content didn't keeps its cached rows."""
+        cache_dir = tmp_path / 'cache'
+        load_fbref_data(fbref_dir, cache_dir)
+        path = fbref_dir / '2022-2023.csv'
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        parsed_files.clear()
+        df = load_fbref_data(fbref_dir, cache_dir)
+        assert parsed_files == []
+        assert df['goals'].tolist() == [5, 3, 7, 9]
+
+    def test_removed_season_is_dropped(self, fbref_dir, tmp_path, parsed_files):
+        """Deleting a season file removes its rows from the cached frame."""
+        cache_dir = tmp_path / 'cache'
+        load_fbref_data(fbref_dir, cache_dir)
+        (fbref_dir / '2021-2022.csv').unlink()
+        parsed_files.clear()
+        df = load_fbref_data(fbref_dir, cache_dir)
+        assert parsed_files == []
+        assert df['player'].tolist() == ['A', 'C']
+
+    def test_corrupt_cache_is_rebuilt(self, fbref_dir, tmp_path, parsed_files):
+        """An unreadable cached frame falls back to parsing every file."""
+        cache_dir = tmp_path / 'cache'
+        load_fbref_data(fbref_dir, cache_dir)
+        (cache_dir / 'combined.pkl').write_bytes(b'not a pickle')
+        parsed_files.clear()
+        df = load_fbref_data(fbref_dir, cache_dir)
+        assert len(parsed_files) == 3
+        assert len(df) == 4
+
+
+class TestSeasonKey:
+    """Test the canonical season key."""
+
+    @pytest.mark.parametrize('season', ['2023-2024', '2023/2024', '2023–24'])
+    def test_spellings_share_key(self, season):
+        """FBref and Wikipedia spellings of a season should share its (start, end) key."""
+        assert _season_key(season) == (2023, 2024)
+
+    def test_century_rollover(self):
+        """'1999–2000' and '1999–00' should both key on (1999, 2000)."""
+        assert _season_key('1999–2000') == _season_key('1999–00') == (1999, 2000)
+
+    def test_single_year_season_is_distinct(self):
+        """The single-year 1929 season shouldn't collide with 1929–30."""
+        assert _season_key('1929') == (1929, 1929)
+        assert _season_key('1929') != _season_key('1929–30')
+
+
+class TestFbrefProfiles:
+    """Test building player profiles from FBref season rows."""
+
+    def test_profile_fields_aggregated_per_player(self):
+        """Goals, teams, position, nationality and primary team come from all rows."""
+        nan = float('nan')
+        fbref_df = _fbref_frame([
+            ['Striker A', 'Sevilla FC', '2010-2011', 10, 2, 30, 2500, 'FW', nan],
+            ['Striker B', 'Getafe', '2010-2011', 3, 1, 20, 1200, 'MF', 'es ESP'],
+            ['Striker A', 'FC Barcelona', '2011-2012', 12, 4, 30, 2600, 'FW,MF', 'ar ARG'],
+            [nan, 'Getafe', '2011-2012', 7, 0, 10, 800, 'FW', 'es ESP'],
+            ['Striker A', 'Barcelona', '2012-2013', 8, 3, 25, 2000, 'FW', 'ar ARG'],
+        ])
+        players = build_player_profiles(fbref_df, {})
+
+        assert list(players) == ['Striker A', 'Striker B']
+        striker = players['Striker A']
+        assert striker['career_goals'] == 30
+        assert striker['teams'] == ['Sevilla', 'Barcelona']
+        assert striker['team'] == 'Barcelona'
+        assert striker['position'] == 'FW'
+        assert striker['nationality'] == 'ar ARG'
+        assert [s['season'] for s in striker['seasons']] == ['2010/2011', '2011/2012', '2012/2013']
+
+    def test_primary_team_tie_goes_to_first_team(self):
+        """With equal season counts, the team seen first is the primary team."""
+        fbref_df = _fbref_frame([
+            ['Striker A', 'Getafe', '2010-2011', 1, 0, 1, 90, 'FW', 'es ESP'],
+            ['Striker A', 'Valencia CF', '2011-2012', 1, 0, 1, 90, 'FW', 'es ESP'],
+        ])
+        players = build_player_profiles(fbref_df, {})
+        assert players['Striker A']['team'] == 'Getafe'
+
+
+class TestTitleAttribution:
+    """Test La Liga / Champions League title attribution."""
+
+    def test_titles_joined_on_season_and_team(self):
+        """Only players of the winning team in the winning season get the title."""
+        fbref_df = _fbref_frame([
+            ['Striker A', 'FC Barcelona', '2014-2015', 20, 5, 30, 2500, 'FW', 'es ESP'],
+            ['Striker A', 'FC Barcelona', '2015-2016', 15, 5, 30, 2500, 'FW', 'es ESP'],
+            ['Striker B', 'Real Madrid CF', '2014-2015', 25, 5, 30, 2500, 'FW', 'pt POR'],
+        ])
+        wiki_data = {
+            'la_liga_titles': [
+                {'season': '2014–15', 'champion': 'Barcelona'},
+                {'season': '2015–16', 'champion': 'Barcelona'},
+            ],
+            'champions_league': [{'season': '2014–15', 'winner': 'FC Barcelona'}],
+        }
+        players = build_player_profiles(fbref_df, wiki_data)
+
+        assert players['Striker A']['total_la_liga_titles'] == 2
+        assert players['Striker A']['total_champions_league_titles'] == 1
+        assert players['Striker A']['seasons'][0]['team_achievements'] == [
+            'La Liga Title', 'Champions League Win',
+        ]
+        assert players['Striker B']['total_la_liga_titles'] == 0
+        assert players['Striker B']['seasons'][0]['team_achievements'] == []
+
+    def test_award_only_players_get_titles(self):
+        """Players created from Wikipedia award records are included in the join."""
+        wiki_data = {
+            'pichichi': [{'season': '1929–30', 'player': 'Gorostiza', 'team': 'Athletic Bilbao', 'goals': 19}],
+            'la_liga_titles': [
+                {'season': '1929', 'champion': 'Barcelona'},
+                {'season': '1929–30', 'champion': 'Athletic Bilbao'},
+            ],
+        }
+        players = build_player_profiles(pd.DataFrame(), wiki_data)
+        assert players['Gorostiza']['total_la_liga_titles'] == 1
+        assert 'La Liga Title' in players['Gorostiza']['seasons'][0]['team_achievements']
+
+    def test_single_year_title_not_given_to_next_season(self):
+        """Barcelona's 1929 title shouldn't be attributed to its 1929–30 season."""
+        wiki_data = {
+            'pichichi': [
+                {'season': '1929', 'player': 'Bienzobas', 'team': 'Real Sociedad', 'goals': 14},
+                {'season': '1929–30', 'player': 'Samitier', 'team': 'Barcelona', 'goals': 15},
+            ],
+            'la_liga_titles': [
+                {'season': '1929', 'champion': 'Barcelona'},
+                {'season': '1929–30', 'champion': 'Athletic Bilbao'},
+            ],
+        }
+        players = build_player_profiles(pd.DataFrame(), wiki_data)
+
+        assert players['Samitier']['total_la_liga_titles'] == 0
+        assert players['Samitier']['seasons'][0]['team_achievements'] == []
+
+
+class TestIncrementalMerge:
+    """Incremental merges must match a full rebuild of the same inputs."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        fbref_dir = tmp_path / 'fbref'
+        wiki_dir = tmp_path / 'wikipedia'
+        fbref_dir.mkdir()
+        shutil.copytree(project_root / 'data' / 'raw' / 'wikipedia', wiki_dir)
+        _write_season_csv(fbref_dir, '2014-2015', [
+            ['Lionel Messi', 'FC Barcelona', 43, 18], ['Karim Benzema', 'Real Madrid CF', 15, 9],
+            ['Aritz Aduriz', 'Athletic Club', 18, 4],
+        ])
+        _write_season_csv(fbref_dir, '2015-2016', [
+            ['Lionel Messi', 'FC Barcelona', 26, 16], ['Luis Suárez', 'FC Barcelona', 40, 16],
+        ])
+        return tmp_path
+
+    def _merge(self, workspace, incremental, output='la_liga_all_players.json'):
+        return merge(
+            output_path=workspace / output,
+            incremental=incremental,
+            fbref_dir=workspace / 'fbref',
+            wiki_dir=workspace / 'wikipedia',
+            fbref_cache_dir=workspace / 'cache' / 'fbref',
+            state_path=workspace / 'cache' / 'merge' / 'state.json',
+        )
+
+    def _assert_matches_full_rebuild(self, workspace, players):
+        full = build_player_profiles(
+            load_fbref_data(workspace / 'fbref', workspace / 'full-cache', use_cache=False),
+            load_wikipedia_data(workspace / 'wikipedia'),
+        )
+        assert players == full
+        assert list(players) == list(full)
+        with open(workspace / 'la_liga_all_players.json', encoding='utf-8') as f:
+            saved = json.load(f)['players']
+        assert saved == full
+        assert list(saved) == list(full)
+
+        index = load_ndjson_index(workspace / 'la_liga_all_players.json')
+        assert list(index['offsets']) == list(full)
+        for name, profile in full.items():
+            assert read_ndjson_player(workspace / 'la_liga_all_players.json', index, name) == profile
+
+    def test_changed_inputs_match_full_rebuild(self, workspace):
+        """Edited seasons, new award records and removed files all match a full build."""
+        self._merge(workspace, incremental=False)
+
+        _write_season_csv(workspace / 'fbref', '2015-2016', [
+            ['Lionel Messi', 'FC Barcelona', 26, 16], ['Luis Suárez', 'FC Barcelona', 41, 16],
+            ['Test Striker', 'Getafe', 22, 5],
+        ])
+        players, delta = self._merge(workspace, incremental=True)
+        self._assert_matches_full_rebuild(workspace, players)
+        assert delta == {'added': ['Test Striker'], 'changed': ['Luis Suárez'], 'removed': []}
+        delta_bytes = (workspace / 'cache' / 'merge' / 'delta.json').read_bytes()
+        assert json.loads(delta_bytes.decode('utf-8')) == delta
+
+        ballon_dor_path = workspace / 'wikipedia' / 'ballon_dor.json'
+        records = json.loads(ballon_dor_path.read_text(encoding='utf-8'))
+        records.append({'year': '2016', 'player': 'luis suárez', 'team': 'Barcelona', 'award': "Ballon d'Or Win"})
+        records.append({'year': '2016', 'player': 'New Winner', 'team': 'Sevilla', 'award': "Ballon d'Or Win"})
+        ballon_dor_path.write_text(json.dumps(records), encoding='utf-8')
+        players, delta = self._merge(workspace, incremental=True)
+        self._assert_matches_full_rebuild(workspace, players)
+        assert delta == {'added': ['New Winner'], 'changed': ['Luis Suárez'], 'removed': []}
+
+        (workspace / 'fbref' / '2014-2015.csv').unlink()
+        players, delta = self._merge(workspace, incremental=True)
+        self._assert_matches_full_rebuild(workspace, players)
+        # Benzema keeps an award-only profile from his Ballon d'Or record
+        assert delta['removed'] == ['Aritz Aduriz']
+        assert {'Lionel Messi', 'Karim Benzema'} <= set(delta['changed'])
+
+    def test_title_table_change_falls_back_to_full_rebuild(self, workspace):
+        """New title winners can touch any player, so the whole dataset is rebuilt."""
+        self._merge(workspace, incremental=False)
+        titles_path = workspace / 'wikipedia' / 'la_liga_titles.json'
+        records = json.loads(titles_path.read_text(encoding='utf-8'))
+        records.append({'season': '2014–15', 'champion': 'Athletic Club'})
+        titles_path.write_text(json.dumps(records), encoding='utf-8')
+
+        players, delta = self._merge(workspace, incremental=True)
+        self._assert_matches_full_rebuild(workspace, players)
+        assert delta['changed'] == ['Aritz Aduriz']
+
+    def test_unchanged_inputs_leave_output_untouched(self, workspace):
+        """An incremental run with no input changes reports an empty delta and skips the write."""
+        self._merge(workspace, incremental=False)
+        output = workspace / 'la_liga_all_players.json'
+        before = output.stat().st_mtime_ns
+
+        _, delta = self._merge(workspace, incremental=True)
+        assert delta == {'added': [], 'changed': [], 'removed': []}
+        assert output.stat().st_mtime_ns == before
+        assert load_ndjson_index(output) is not None
+        recorded = json.loads((workspace / 'cache' / 'merge' / 'delta.json').read_text(encoding='utf-8'))
+        assert recorded == delta
+
+    def test_sqlite_database_follows_output(self, workspace):
+        """--sqlite should write a query database that tracks the merged output."""
+        output = workspace / 'la_liga_all_players.json'
+        players, _ = merge(
+            output_path=output,
+            fbref_dir=workspace / 'fbref',
+            wiki_dir=workspace / 'wikipedia',
+            fbref_cache_dir=workspace / 'cache' / 'fbref',
+            state_path=workspace / 'cache' / 'merge' / 'state.json',
+            sqlite=True,
+        )
+        db_path = workspace / 'la_liga_all_players.sqlite'
+        assert database_is_current(db_path, output)
+
+        connection = open_database(output)
+        try:
+            names = query(connection, "SELECT name FROM players ORDER BY player_id")['name'].tolist()
+        finally:
+            connection.close()
+        assert names == list(players)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
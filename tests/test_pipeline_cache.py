@@ -0,0 +1,77 @@
+"""
+Tests for the pipeline cache helpers (scripts/pipeline_cache.py).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import pipeline_cache
+from pipeline_cache import atomic_write, file_signature, load_manifest, save_manifest
+
+
+class TestFileSignature:
+    """Test size/mtime/sha256 file signatures."""
+
+    def test_hash_reused_when_stat_unchanged(self, tmp_path, monkeypatch):
+        """An unchanged size/mtime should reuse the previous hash without reading."""
+        path = tmp_path / 'season.csv'
+        path.write_text('player,goals\nA,1\n')
+        first = file_signature(path)
+
+        monkeypatch.setattr(pipeline_cache, 'file_sha256', lambda p: pytest.fail('file was re-hashed'))
+        assert file_signature(path, first) == first
+
+    def test_touched_file_with_same_content_keeps_hash(self, tmp_path):
+        """A new mtime alone changes the signature but not the content hash."""
+        path = tmp_path / 'season.csv'
+        path.write_text('player,goals\nA,1\n')
+        first = file_signature(path)
+        os.utime(path, ns=(first['mtime_ns'] + 10**9, first['mtime_ns'] + 10**9))
+
+        second = file_signature(path, first)
+        assert second['mtime_ns'] != first['mtime_ns']
+        assert second['sha256'] == first['sha256']
+
+
+class TestManifest:
+    """Test manifest round trips and atomic writes."""
+
+    def test_round_trip(self, tmp_path):
+        """A saved manifest loads back with its schema version."""
+        path = tmp_path / 'cache' / 'manifest.json'
+        save_manifest(path, {'files': {'a.csv': {'sha256': 'x'}}}, schema_version=2)
+        assert load_manifest(path, 2)['files'] == {'a.csv': {'sha256': 'x'}}
+
+    def test_outdated_or_corrupt_manifest_reads_empty(self, tmp_path):
+        """A schema bump or unreadable file should behave like no manifest."""
+        path = tmp_path / 'manifest.json'
+        save_manifest(path, {'files': {}}, schema_version=1)
+        assert load_manifest(path, 2) == {}
+        path.write_text('{not json')
+        assert load_manifest(path, 1) == {}
+        assert load_manifest(tmp_path / 'missing.json', 1) == {}
+
+    def test_failed_atomic_write_keeps_old_file(self, tmp_path):
+        """An exception mid-write should leave the previous content and no temp files."""
+        path = tmp_path / 'out.bin'
+        path.write_bytes(b'old')
+
+        def fail(f):
+            f.write(b'partial')
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            atomic_write(path, fail)
+        assert path.read_bytes() == b'old'
+        assert [p.name for p in tmp_path.iterdir()] == ['out.bin']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,141 @@
+"""
+Tests for the in-process pipeline DAG runner (scripts/pipeline_runner.py).
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+from pipeline_runner import PipelineError, Stage, run_pipeline, stale_reason
+
+
+def _write(path, text='x', mtime=None):
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestStaleness:
+    """Test make-style up-to-date checks."""
+
+    def test_up_to_date_outputs_skip(self, tmp_path):
+        """Outputs newer than every input should make the stage up to date."""
+        source = _write(tmp_path / 'in.csv', mtime=1_000)
+        target = _write(tmp_path / 'out.json', mtime=2_000)
+        stage = Stage('s', lambda up: None, inputs=lambda: [source], outputs=lambda: [target])
+
+        assert stale_reason(stage) is None
+
+    def test_newer_input_runs(self, tmp_path):
+        """An input newer than an output should be named as the reason to run."""
+        source = _write(tmp_path / 'in.csv', mtime=3_000)
+        target = _write(tmp_path / 'out.json', mtime=2_000)
+        stage = Stage('s', lambda up: None, inputs=lambda: [source], outputs=lambda: [target])
+
+        assert stale_reason(stage) == 'in.csv is newer than its outputs'
+
+    def test_missing_output_runs(self, tmp_path):
+        """A missing output should always trigger a run."""
+        stage = Stage('s', lambda up: None, outputs=lambda: [tmp_path / 'out.json'])
+        assert stale_reason(stage) == 'missing output out.json'
+
+    def test_stage_without_outputs_always_runs(self):
+        """Stages that declare no outputs can't be checked, so they run."""
+        assert stale_reason(Stage('s', lambda up: None)) == 'no declared outputs'
+
+
+class TestRunPipeline:
+    """Test scheduling, result passing and failure handling."""
+
+    def test_independent_stages_run_concurrently(self):
+        """Two stages without dependencies should be running at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [
+            Stage('a', lambda up: barrier.wait()),
+            Stage('b', lambda up: barrier.wait()),
+        ]
+        report = run_pipeline(stages, max_workers=2)
+        assert report.ok
+
+    def test_results_passed_in_memory(self, tmp_path):
+        """Dependents should receive upstream return values; skipped stages pass None."""
+        cached = _write(tmp_path / 'cached.json')
+        stages = [
+            Stage('scrape', lambda up: {'records': [1, 2, 3]}),
+            Stage('cached', lambda up: pytest.fail('should be skipped'), outputs=lambda: [cached]),
+            Stage('merge', lambda up: up, deps=['scrape', 'cached']),
+        ]
+        report = run_pipeline(stages)
+
+        assert report.by_name['cached'].status == 'skipped'
+        assert report.by_name['merge'].value == {'scrape': {'records': [1, 2, 3]}, 'cached': None}
+
+    def test_dependencies_finish_first(self):
+        """A stage should only start after everything it depends on."""
+        order = []
+        stages = [
+            Stage('merge', lambda up: order.append('merge'), deps=['a', 'b']),
+            Stage('a', lambda up: order.append('a')),
+            Stage('b', lambda up: order.append('b')),
+        ]
+        run_pipeline(stages)
+        assert order[-1] == 'merge'
+
+    def test_failure_blocks_dependents(self):
+        """A failed stage should block its dependents but not unrelated stages."""
+        def boom(up):
+            raise RuntimeError('boom')
+
+        stages = [
+            Stage('bad', boom),
+            Stage('other', lambda up: 'fine'),
+            Stage('after_bad', lambda up: pytest.fail('should be blocked'), deps=['bad']),
+            Stage('last', lambda up: pytest.fail('should be blocked'), deps=['after_bad']),
+        ]
+        report = run_pipeline(stages)
+
+        statuses = {r.name: r.status for r in report.results}
+        assert statuses == {'bad': 'failed', 'other': 'ran', 'after_bad': 'blocked', 'last': 'blocked'}
+        assert not report.ok
+        with pytest.raises(PipelineError):
+            report.raise_for_failures()
+
+    def test_force_runs_up_to_date_stages(self, tmp_path):
+        """force should run stages whose outputs are current."""
+        target = _write(tmp_path / 'out.json')
+        stages = [Stage('s', lambda up: 'ran', outputs=lambda: [target])]
+
+        assert run_pipeline(stages).by_name['s'].status == 'skipped'
+        assert run_pipeline(stages, force=True).by_name['s'].value == 'ran'
+
+    def test_report_records_time_and_memory(self):
+        """Stages that ran should report wall time and a memory peak."""
+        report = run_pipeline([Stage('s', lambda up: bytearray(10_000_000))])
+        result = report.by_name['s']
+
+        assert result.seconds > 0
+        if sys.platform.startswith('linux'):
+            assert result.peak_bytes > 10_000_000
+        assert 's ' in report.format_table()
+
+    @pytest.mark.parametrize('stages', [
+        [Stage('a', lambda up: None, deps=['b']), Stage('b', lambda up: None, deps=['a'])],
+        [Stage('a', lambda up: None, deps=['missing'])],
+        [Stage('a', lambda up: None), Stage('a', lambda up: None)],
+    ], ids=['cycle', 'unknown-dependency', 'duplicate-name'])
+    def test_invalid_graphs_rejected(self, stages):
+        """Cycles, unknown dependencies and duplicate names should raise ValueError."""
+        with pytest.raises(ValueError):
+            run_pipeline(stages)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
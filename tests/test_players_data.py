@@ -4,6 +4,7 @@ Tests for the player data loading module.
 
 import pytest
 import json
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, mock_open
@@ -12,7 +13,17 @@ from unittest.mock import patch, mock_open
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-from core.players_data import load_players, _fallback_players, _load_from_json, points_system
+import threading
+
+from core.players_data import (
+    LazyPlayers,
+    get_player,
+    load_players,
+    _fallback_players,
+    _load_from_json,
+    points_system,
+)
+from core.dataset_io import write_dataset_json, write_dataset_ndjson
 
 
 class TestLoadPlayers:
@@ -123,6 +134,72 @@ class TestLoadFromJson:
         result = _load_from_json(json_file)
         assert "Test Player" in result
 
+    def test_load_from_gzip_dataset(self, tmp_path):
+        """Should read a gzip-compressed dataset written by the merge step."""
+        players = {"Test Player": {"career_goals": 75, "seasons": []}}
+        json_file = tmp_path / "test_data.json"
+        write_dataset_json(json_file, {"total_players": 1}, players, fmt="gzip")
+
+        result = _load_from_json(json_file)
+        assert result["Test Player"]["career_goals"] == 75
+
+
+class TestGetPlayer:
+    """Test single-player lookups."""
+
+    PLAYERS = {
+        "Test Player": {"career_goals": 75, "seasons": [{"season": "2020-21", "goals": 20}]},
+        "Other Player": {"career_goals": 12, "seasons": []},
+    }
+
+    def test_reads_one_line_via_index(self, tmp_path):
+        """With an NDJSON index, only the indexed line should be parsed."""
+        json_file = tmp_path / "players.json"
+        write_dataset_json(json_file, {}, self.PLAYERS)
+        write_dataset_ndjson(json_file, {}, self.PLAYERS)
+
+        with patch("core.players_data._load_from_json", side_effect=AssertionError("full load")):
+            assert get_player("Test Player", json_file) == self.PLAYERS["Test Player"]
+            assert get_player("Nobody", json_file) is None
+
+    def test_falls_back_to_full_load_without_index(self, tmp_path):
+        """Without an NDJSON copy, the whole JSON dataset should be loaded."""
+        json_file = tmp_path / "players.json"
+        write_dataset_json(json_file, {}, self.PLAYERS)
+
+        assert get_player("Other Player", json_file) == self.PLAYERS["Other Player"]
+
+    def test_stale_index_ignored(self, tmp_path):
+        """A dataset rewritten after its index should be read in full."""
+        json_file = tmp_path / "players.json"
+        write_dataset_json(json_file, {}, self.PLAYERS)
+        write_dataset_ndjson(json_file, {}, self.PLAYERS)
+        assert get_player("Test Player", json_file)["career_goals"] == 75
+
+        updated = {"Test Player": {"career_goals": 80, "seasons": []}}
+        write_dataset_json(json_file, {}, updated)
+        assert get_player("Test Player", json_file)["career_goals"] == 80
+
+    def test_same_size_edit_not_served_from_stale_index(self, tmp_path):
+        """A same-length edit of the JSON should be seen by get_player(), not the old NDJSON."""
+        json_file = tmp_path / "players.json"
+        write_dataset_json(json_file, {}, self.PLAYERS)
+        write_dataset_ndjson(json_file, {}, self.PLAYERS)
+        assert get_player("Other Player", json_file)["career_goals"] == 12
+
+        edited = tmp_path / "edited.json"
+        edited.write_text(json_file.read_text(encoding="utf-8").replace('"career_goals": 12', '"career_goals": 13'),
+                          encoding="utf-8")
+        edited.replace(json_file)
+
+        assert get_player("Other Player", json_file)["career_goals"] == 13
+
+    def test_matches_full_load_for_shipped_dataset(self):
+        """Every player in the default dataset should match load_players()."""
+        all_players = load_players()
+        for name, profile in all_players.items():
+            assert get_player(name) == profile
+
 
 class TestPointsSystem:
     """Test points system integrity."""
@@ -151,5 +228,64 @@ class TestPointsSystem:
         assert points_system.get("Champions League Win") == 5
 
 
+class TestLazyPlayers:
+    """Test the lazily loaded module-level players mapping."""
+
+    def test_import_skips_pandas_and_pyarrow(self):
+        """A clean import shouldn't load pandas or pyarrow; only the table loaders need them."""
+        code = (
+            f'import sys; sys.path.insert(0, {str(project_root / "src")!r}); '
+            'import core.players_data; '
+            'print(sorted(m for m in ("pandas", "pyarrow") if m in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == '[]'
+
+    def test_not_loaded_until_accessed(self):
+        """Creating the proxy should not call the loader."""
+        calls = []
+        lazy = LazyPlayers(lambda: calls.append(1) or _fallback_players())
+        assert calls == []
+        assert not lazy.loaded
+        assert 'Lionel Messi' in lazy
+        assert calls == [1]
+        assert lazy.loaded
+
+    def test_behaves_like_dict(self):
+        """The proxy should support the dict operations callers rely on."""
+        lazy = LazyPlayers(_fallback_players)
+        assert len(lazy) == 7
+        assert lazy['Lionel Messi']['career_goals'] == 474
+        assert lazy.get('Nobody') is None
+        assert dict(lazy.items()) == _fallback_players()
+        assert isinstance(lazy.copy(), dict)
+        lazy['New Player'] = {'career_goals': 1}
+        assert 'New Player' in lazy
+        del lazy['New Player']
+        assert 'New Player' not in lazy
+
+    def test_loads_once_across_threads(self):
+        """Concurrent first access should run the loader exactly once."""
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def loader():
+            calls.append(1)
+            return _fallback_players()
+
+        lazy = LazyPlayers(loader)
+
+        def reader():
+            barrier.wait()
+            len(lazy)
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert calls == [1]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,153 @@
+"""
+Tests for the SQLite query engine (src/core/query.py).
+"""
+
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.analysis import score_players
+from core.dataset_io import write_dataset_json
+from core.players_data import _fallback_players, load_players, points_system
+from core.query import (
+    build_database,
+    database_is_current,
+    database_path_for,
+    open_database,
+    players_with_titles_at_clubs,
+    query,
+    score_players_sql,
+    seasons_with_goals,
+)
+
+
+def _season(season, team, goals, assists=0, achievements=()):
+    return {
+        "season": season, "team": team, "goals": goals, "assists": assists,
+        "matches_played": 30, "minutes": 2500, "awards": [],
+        "team_achievements": list(achievements), "cup_final_winner": False, "cl_achievements": [],
+    }
+
+
+PLAYERS = {
+    "Samuel Eto'o": {
+        "career_goals": 130, "team": "Barcelona", "seasons": [
+            _season("2003–04", "Mallorca", 17),
+            _season("2005–06", "Barcelona", 26, achievements=["La Liga Title"]),
+            _season("2008–09", "Barcelona", 30, achievements=["La Liga Title", "Copa del Rey"]),
+        ],
+    },
+    "David Villa": {
+        "career_goals": 186, "team": "Valencia", "seasons": [
+            _season("2009–10", "Valencia", 21),
+            _season("2010–11", "Barcelona", 18, achievements=["La Liga Title"]),
+            _season("2013–14", "Atlético Madrid", 13, achievements=["La Liga Title"]),
+        ],
+    },
+    "Lionel Messi": {
+        "career_goals": 474, "team": "Barcelona", "seasons": [
+            _season("2016–17", "Barcelona", 37, 9),
+        ],
+    },
+}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db_path = build_database(PLAYERS, tmp_path / 'players.sqlite')
+    connection = sqlite3.connect(db_path)
+    yield connection
+    connection.close()
+
+
+class TestQueries:
+    """Test the canned queries and raw SQL access."""
+
+    def test_seasons_filtered_by_team_and_years(self, conn):
+        """Only Barcelona seasons starting 2005-2015 with 20+ goals should match."""
+        result = seasons_with_goals(conn, 20, team='Barcelona', from_year=2005, to_year=2015)
+
+        assert result[['player', 'season']].values.tolist() == [
+            ["Samuel Eto'o", '2008–09'], ["Samuel Eto'o", '2005–06'],
+        ]
+
+    def test_players_with_titles_at_two_clubs(self, conn):
+        """Villa won La Liga with two clubs; Eto'o twice with one."""
+        result = players_with_titles_at_clubs(conn, min_clubs=2)
+
+        assert result['player'].tolist() == ['David Villa']
+        assert result['clubs'].tolist() == [2]
+
+    def test_raw_sql_returns_dataframe(self, conn):
+        """query() should return any SQL result as a DataFrame."""
+        result = query(conn, "SELECT COUNT(*) AS n FROM titles WHERE title = ?", ['La Liga Title'])
+        assert result['n'].tolist() == [4]
+
+
+class TestScoring:
+    """The SQL aggregation must match the Python scoring engine."""
+
+    @pytest.mark.parametrize('players', [PLAYERS, _fallback_players()], ids=['sample', 'fallback'])
+    def test_matches_score_players(self, tmp_path, players):
+        """Every player's SQL score should equal analysis.score_players()."""
+        db_path = build_database(players, tmp_path / 'players.sqlite')
+        with sqlite3.connect(db_path) as connection:
+            scores = score_players_sql(connection, points_system)
+
+        assert scores['Player'].tolist() == list(players)
+        assert scores['Score'].tolist() == score_players(players, points_system).tolist()
+
+    def test_matches_score_players_for_shipped_dataset(self, tmp_path):
+        """The default dataset should score identically through SQL."""
+        source = tmp_path / 'la_liga_all_players.json'
+        shutil.copy(project_root / 'data' / 'processed' / 'la_liga_all_players.json', source)
+        connection = open_database(source)
+        try:
+            scores = score_players_sql(connection, points_system)
+        finally:
+            connection.close()
+
+        assert scores['Score'].tolist() == score_players(load_players(source), points_system).tolist()
+
+
+class TestOpenDatabase:
+    """Test on-demand building and invalidation."""
+
+    def test_builds_and_rebuilds_when_source_changes(self, tmp_path):
+        """A missing or outdated database should be (re)built from the JSON."""
+        source = tmp_path / 'players.json'
+        write_dataset_json(source, {}, PLAYERS)
+        db_path = database_path_for(source)
+
+        open_database(source).close()
+        assert database_is_current(db_path, source)
+
+        write_dataset_json(source, {}, {"David Villa": PLAYERS["David Villa"]})
+        assert not database_is_current(db_path, source)
+        connection = open_database(source)
+        try:
+            assert query(connection, "SELECT name FROM players")['name'].tolist() == ['David Villa']
+        finally:
+            connection.close()
+
+    def test_connection_is_read_only(self, tmp_path):
+        """open_database() should hand out read-only connections."""
+        source = tmp_path / 'players.json'
+        write_dataset_json(source, {}, PLAYERS)
+        connection = open_database(source)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                connection.execute("DELETE FROM players")
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
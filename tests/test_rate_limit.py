@@ -0,0 +1,157 @@
+"""
+Tests for the scraper politeness limits (scripts/rate_limit.py).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+from rate_limit import HostLimiter, TokenBucket
+
+
+def _run_concurrently(limiter, urls):
+    """Enter limiter.slot() for each URL from its own thread; return reserved start times per URL."""
+    starts = {}
+
+    def worker(url):
+        with limiter.slot(url) as start:
+            starts.setdefault(url, []).append(start)
+
+    threads = [threading.Thread(target=worker, args=(u,)) for u in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return starts
+
+
+class TestHostLimiter:
+    """Test per-host spacing and concurrency caps."""
+
+    def test_starts_are_spaced_per_host(self):
+        """Requests to one host should start at least min_interval apart."""
+        starts = _run_concurrently(HostLimiter(max_concurrent=4, min_interval=0.05), ['http://a/x'] * 4)
+        times = sorted(starts['http://a/x'])
+
+        assert all(b - a >= 0.05 - 1e-9 for a, b in zip(times, times[1:]))
+
+    def test_slot_not_entered_before_reserved_start(self):
+        """A request should wait until its reserved start time before running."""
+        limiter = HostLimiter(max_concurrent=4, min_interval=0.05)
+        for _ in range(3):
+            with limiter.slot('http://a/x') as start:
+                assert time.monotonic() >= start
+
+    def test_hosts_are_independent(self):
+        """Different hosts shouldn't wait for each other's interval."""
+        limiter = HostLimiter(max_concurrent=1, min_interval=0.5)
+        started = time.monotonic()
+        _run_concurrently(limiter, ['http://a/x', 'http://b/x', 'http://c/x'])
+
+        assert time.monotonic() - started < 0.3
+
+    def test_concurrency_is_capped(self):
+        """At most max_concurrent slots to one host should be held at once."""
+        limiter = HostLimiter(max_concurrent=2)
+        held, peak, lock = [0], [0], threading.Lock()
+
+        def worker():
+            with limiter.slot('http://a/x'):
+                with lock:
+                    held[0] += 1
+                    peak[0] = max(peak[0], held[0])
+                time.sleep(0.05)
+                with lock:
+                    held[0] -= 1
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak[0] == 2
+
+    def test_invalid_limit_rejected(self):
+        with pytest.raises(ValueError):
+            HostLimiter(max_concurrent=0)
+
+
+class FakeClock:
+    """A clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test the requests-per-minute budget."""
+
+    def test_sustained_rate(self):
+        """After the burst is spent, acquisitions should be 60/rate seconds apart."""
+        clock = FakeClock()
+        bucket = TokenBucket(30, capacity=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 2.0, 2.0, 2.0]
+        assert clock.now == 6.0
+
+    def test_idle_time_refills_up_to_capacity(self):
+        """Tokens saved while idle should allow a burst no larger than capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+
+        clock.now += 100
+        assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
+
+    def test_budget_holds_across_threads(self):
+        """Concurrent callers together shouldn't exceed the rate."""
+        # acquire() reads the clock under its lock; that reading plus the
+        # returned wait is the time the caller's token was reserved for
+        seen = threading.local()
+
+        def clock():
+            seen.now = time.monotonic()
+            return seen.now
+
+        bucket = TokenBucket(1200, clock=clock)  # one token every 50 ms
+        times, lock = [], threading.Lock()
+
+        def worker():
+            for _ in range(3):
+                wait = bucket.acquire()
+                with lock:
+                    times.append(seen.now + wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        times.sort()
+        assert len(times) == 12
+        assert all(b - a >= 0.05 - 1e-9 for a, b in zip(times, times[1:]))
+
+    @pytest.mark.parametrize('rate, capacity', [(0, 1), (10, 0.5)])
+    def test_invalid_settings_rejected(self, rate, capacity):
+        with pytest.raises(ValueError):
+            TokenBucket(rate, capacity)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
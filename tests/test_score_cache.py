@@ -0,0 +1,94 @@
+"""
+Tests for the fingerprint-keyed score cache.
+"""
+
+import pytest
+import copy
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.dataset import PlayerDataset
+from core.players_data import _fallback_players, points_system
+import core.score_cache as score_cache
+from core.score_cache import LRUCache, fingerprint_players
+
+
+class TestFingerprint:
+    """Test content fingerprints of player data."""
+
+    def test_equal_content_equal_fingerprint(self):
+        """Separately built but identical datasets should share a fingerprint."""
+        assert fingerprint_players(_fallback_players(), points_system) == \
+            fingerprint_players(_fallback_players(), points_system)
+
+    def test_data_change_changes_fingerprint(self):
+        """Editing any season value should produce a new fingerprint."""
+        players = _fallback_players()
+        edited = copy.deepcopy(players)
+        edited['Lionel Messi']['seasons'][0]['goals'] += 1
+        assert fingerprint_players(players, points_system) != \
+            fingerprint_players(edited, points_system)
+
+    def test_points_change_changes_fingerprint(self):
+        """A different points system should produce a new fingerprint."""
+        players = _fallback_players()
+        other_points = {**points_system, 'La Liga Title': 2}
+        assert fingerprint_players(players, points_system) != \
+            fingerprint_players(players, other_points)
+
+    def test_dataset_fingerprint(self):
+        """Columnar datasets should fingerprint by content as well."""
+        first = PlayerDataset.from_players(_fallback_players())
+        second = PlayerDataset.from_players(_fallback_players())
+        assert fingerprint_players(first, points_system) == \
+            fingerprint_players(second, points_system)
+
+    def test_dict_fingerprint_memoised_per_object(self):
+        """Re-fingerprinting the same dict (a widget rerun) shouldn't re-serialise it."""
+        players = _fallback_players()
+        with patch.object(score_cache, '_dict_digest', wraps=score_cache._dict_digest) as digest:
+            first = fingerprint_players(players, points_system)
+            assert fingerprint_players(players, points_system) == first
+            assert fingerprint_players(players, {**points_system, 'La Liga Title': 2}) != first
+            assert digest.call_count == 1
+
+            assert fingerprint_players(_fallback_players(), points_system) == first
+            assert digest.call_count == 2
+
+
+class TestLRUCache:
+    """Test bounded LRU caching behaviour."""
+
+    def test_hit_skips_compute(self):
+        """A second lookup of the same key should not recompute."""
+        cache = LRUCache(max_entries=2)
+        calls = []
+        assert cache.get_or_compute('a', lambda: calls.append(1) or 'A') == 'A'
+        assert cache.get_or_compute('a', lambda: calls.append(1) or 'B') == 'A'
+        assert calls == [1]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry should be evicted when full."""
+        cache = LRUCache(max_entries=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('a', lambda: 1)  # 'a' is now most recent
+        cache.get_or_compute('c', lambda: 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+    def test_rejects_non_positive_size(self):
+        """A cache must hold at least one entry."""
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,200 @@
+"""
+Tests for the rate-limited FBref season fetcher (scripts/scrape_fbref.py),
+against a local stand-in HTTP server.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import scrape_fbref
+from config import MAX_RETRIES
+
+PAGE = (project_root / 'tests' / 'fixtures' / 'fbref_season.html').read_bytes()
+PAGE_DELAY = 0.3
+SEASONS = [f'{y}-{y + 1}' for y in range(2010, 2016)]
+
+
+class FBrefStandIn(ThreadingHTTPServer):
+    """Serves the fixture season page after PAGE_DELAY; paths in ``missing`` get a 404."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.starts = []
+        self.paths = []
+        self.missing = set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.starts.append(time.monotonic())
+            self.server.paths.append(self.path)
+        time.sleep(PAGE_DELAY)
+        status, body = (404, b'') if self.path.strip('/') in self.server.missing else (200, PAGE)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FBrefStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    monkeypatch.setattr(scrape_fbref, 'fbref_season_stats_url', lambda season: f'{base}/{season}')
+    monkeypatch.setattr(scrape_fbref, 'REQUEST_DELAY_SECONDS', 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _scrape(tmp_path, seasons=SEASONS, **kwargs):
+    kwargs.setdefault('workers', 3)
+    kwargs.setdefault('requests_per_minute', 600)  # one request every 100 ms
+    return scrape_fbref.scrape_seasons(seasons, browser=False, out_dir=tmp_path, **kwargs)
+
+
+class TestScrapeSeasons:
+    """Test concurrent fetching, the request budget and the saved CSVs."""
+
+    def test_workers_overlap_within_budget(self, server, tmp_path):
+        """Several workers should beat serial fetching without exceeding the rate."""
+        started = time.perf_counter()
+        results = _scrape(tmp_path)
+        elapsed = time.perf_counter() - started
+
+        assert list(results) == SEASONS
+        # At 10 requests/s, no 0.5 s window may see more than 5 (+1 for the initial token)
+        starts = sorted(server.starts)
+        assert max(sum(t <= u < t + 0.5 for u in starts) for t in starts) <= 6
+        assert elapsed < len(SEASONS) * PAGE_DELAY
+
+    @pytest.mark.skipif(os.name != 'posix', reason='needs the POSIX C locale')
+    def test_saved_csv_is_utf8_under_ascii_locale(self, tmp_path):
+        """Accented names should be written as UTF-8 even when the locale codec can't encode them."""
+        out = tmp_path / '2016-2017.csv'
+        code = (
+            'import sys; sys.path.insert(0, sys.argv[1]); import scrape_fbref; '
+            'from pathlib import Path; '
+            'page = Path(sys.argv[2]).read_text(encoding="utf-8"); '
+            'scrape_fbref._save_season(page, "2016-2017", Path(sys.argv[3]))'
+        )
+        env = {**os.environ, 'LC_ALL': 'C', 'PYTHONCOERCECLOCALE': '0', 'PYTHONUTF8': '0'}
+        subprocess.run(
+            [sys.executable, '-c', code, str(project_root / 'scripts'),
+             str(project_root / 'tests' / 'fixtures' / 'fbref_season.html'), str(out)],
+            env=env, check=True, capture_output=True,
+        )
+
+        assert 'Luis Suárez' in out.read_bytes().decode('utf-8')
+
+    def test_saved_csv_is_cleaned(self, server, tmp_path):
+        """Each season should be saved in the cleaned schema, without repeated header rows."""
+        _scrape(tmp_path, seasons=['2016-2017'])
+        df = pd.read_csv(tmp_path / '2016-2017.csv')
+
+        assert len(df) == 7
+        assert {'player', 'team', 'position', 'goals', 'assists', 'matches_played', 'season'} <= set(df.columns)
+        messi = df[df['player'] == 'Lionel Messi'].iloc[0]
+        assert (messi['goals'], messi['assists'], messi['season']) == (37, 9, '2016-2017')
+
+    def test_failed_season_retried_then_skipped(self, server, tmp_path):
+        """A season that keeps failing should use MAX_RETRIES requests and not stop the others."""
+        server.missing.add('2012-2013')
+        results = _scrape(tmp_path)
+
+        assert '2012-2013' not in results
+        assert len(results) == len(SEASONS) - 1
+        assert server.paths.count('/2012-2013') == MAX_RETRIES
+        assert not (tmp_path / '2012-2013.csv').exists()
+
+    def test_existing_csvs_skipped_without_requests(self, server, tmp_path):
+        """Seasons already on disk shouldn't be fetched unless forced."""
+        (tmp_path / '2010-2011.csv').write_text('player\nX\n')
+        _scrape(tmp_path, seasons=SEASONS[:2])
+
+        assert server.paths == ['/2011-2012']
+
+
+class TestCheckpointJournal:
+    """Test resuming interrupted backfills from the journal."""
+
+    def test_interrupted_run_resumes(self, server, tmp_path, monkeypatch):
+        """After a crash, a forced rerun should only fetch the seasons that didn't finish."""
+        real_save = scrape_fbref._save_season
+
+        def crash_on(table_html, season, out_path):
+            if season == '2012-2013':
+                raise KeyboardInterrupt
+            return real_save(table_html, season, out_path)
+
+        monkeypatch.setattr(scrape_fbref, '_save_season', crash_on)
+        with pytest.raises(KeyboardInterrupt):
+            _scrape(tmp_path, force=True)
+        monkeypatch.setattr(scrape_fbref, '_save_season', real_save)
+        server.paths.clear()
+
+        results = _scrape(tmp_path, force=True)
+
+        assert server.paths == ['/2012-2013']
+        assert list(results) == SEASONS
+
+    def test_in_flight_seasons_go_first(self, server, tmp_path):
+        """Seasons that were in flight when the run stopped should be fetched first."""
+        journal = scrape_fbref.ScrapeJournal(tmp_path / scrape_fbref.JOURNAL_NAME)
+        journal.begin(SEASONS, force=True)
+        journal.record('started', '2010-2011')
+        (tmp_path / '2010-2011.csv').write_text('player\nX\n')
+        journal.record('done', '2010-2011')
+        journal.record('started', '2014-2015')
+        with open(journal.path, 'a') as f:
+            f.write('{"event": "sta')  # torn line from the crash
+
+        _scrape(tmp_path, force=True, workers=1)
+
+        assert server.paths[0] == '/2014-2015'
+        assert '/2010-2011' not in server.paths
+        assert len(server.paths) == len(SEASONS) - 1
+
+    def test_finished_run_starts_over(self, server, tmp_path):
+        """Once a run finished, a new forced run should fetch every season again."""
+        _scrape(tmp_path, seasons=SEASONS[:2], force=True)
+        _scrape(tmp_path, seasons=SEASONS[:2], force=True)
+
+        assert len(server.paths) == 4
+
+    def test_different_seasons_start_a_new_run(self, tmp_path):
+        """A journal for another season list shouldn't be resumed."""
+        journal = scrape_fbref.ScrapeJournal(tmp_path / 'journal.jsonl')
+        journal.begin(SEASONS, force=True)
+        journal.record('done', '2010-2011')
+
+        assert journal.unfinished_run(SEASONS) == ({'2010-2011'}, [])
+        assert journal.unfinished_run(SEASONS[:3]) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,114 @@
+"""
+Tests for concurrent Wikipedia scraping (scripts/scrape_wikipedia.py),
+against a local stand-in HTTP server.
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import scrape_wikipedia
+from http_cache import HttpCache
+from rate_limit import HostLimiter
+
+PAGE_DELAY = 0.4
+
+PAGE = b"""<html><body><table class="wikitable">
+<tr><th>Season</th><th>Player</th><th>Club</th><th>Apps</th><th>Goals</th><th>Ratio</th></tr>
+<tr><td>2016-17</td><td>Lionel Messi</td><td>Barcelona</td><td>34</td><td>37</td><td>1.09</td></tr>
+</table></body></html>"""
+
+
+class SlowServer(ThreadingHTTPServer):
+    """Serves PAGE after PAGE_DELAY seconds, recording peak concurrency and connections."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+        self.connections = set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.requests += 1
+            server.peak = max(server.peak, server.in_flight)
+            server.connections.add(self.client_address)
+        time.sleep(PAGE_DELAY)
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    server = SlowServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    for category in scrape_wikipedia.SCRAPERS:
+        monkeypatch.setitem(scrape_wikipedia.WIKI_URLS, category, f'{base}/{category}')
+    monkeypatch.setattr(scrape_wikipedia, 'HTTP_CACHE', HttpCache(tmp_path / 'http'))
+    monkeypatch.setattr(scrape_wikipedia, 'SESSION', scrape_wikipedia._make_session())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestConcurrentScrape:
+    """Test that all categories are fetched at once within the host limit."""
+
+    @pytest.mark.parametrize('parse_workers', [0, 2], ids=['inline-parse', 'process-parse'])
+    def test_refresh_takes_about_one_page(self, server, tmp_path, parse_workers):
+        """A forced refresh of every category should take about as long as one page."""
+        started = time.perf_counter()
+        data = scrape_wikipedia.scrape_categories(force=True, wiki_dir=tmp_path, parse_workers=parse_workers)
+        elapsed = time.perf_counter() - started
+
+        assert server.requests == len(scrape_wikipedia.SCRAPERS)
+        assert elapsed < PAGE_DELAY * 2.5
+        assert data['pichichi'][0]['player'] == 'Lionel Messi'
+        assert sorted(data) == sorted(scrape_wikipedia.SCRAPERS)
+
+    def test_host_limit_caps_concurrency(self, server, tmp_path, monkeypatch):
+        """No more than the limiter's max_concurrent requests should hit the host at once."""
+        monkeypatch.setattr(scrape_wikipedia, 'LIMITER', HostLimiter(max_concurrent=2))
+        scrape_wikipedia.scrape_categories(force=True, wiki_dir=tmp_path, parse_workers=0)
+
+        assert server.peak == 2
+
+    def test_connections_are_reused(self, server, tmp_path):
+        """A second refresh should go over the session's existing keep-alive connections."""
+        scrape_wikipedia.scrape_categories(force=True, wiki_dir=tmp_path, parse_workers=0)
+        first = len(server.connections)
+        scrape_wikipedia.scrape_categories(force=True, wiki_dir=tmp_path, parse_workers=0)
+
+        assert len(server.connections) == first
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,229 @@
+"""
+Tests for the content-addressed stage cache (scripts/stage_cache.py).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'scripts'))
+
+from pipeline_runner import Stage, run_pipeline
+from stage_cache import StageCache, python_sources
+
+
+class Workspace:
+    """A tiny two-file pipeline: source.txt -> out.txt, uppercased with a suffix from config."""
+
+    def __init__(self, root):
+        self.root = root
+        self.source = root / 'source.txt'
+        self.output = root / 'out.txt'
+        self.code = root / 'stage_code.py'
+        self.source.write_text('hello')
+        self.code.write_text('# v1')
+        self.suffix = '!'
+        self.calls = 0
+        self.cache = StageCache(root / 'cache', root)
+
+    def _run(self, upstream):
+        self.calls += 1
+        self.output.write_text(self.source.read_text().upper() + self.suffix)
+        return upstream.changed
+
+    def stages(self):
+        return [Stage(
+            'build', self._run,
+            inputs=lambda: [self.source],
+            outputs=lambda: [self.output],
+            code=[self.code],
+            config={'suffix': self.suffix},
+        )]
+
+    def run(self, **kwargs):
+        return run_pipeline(self.stages(), cache=self.cache, trace_memory=False, **kwargs).by_name['build']
+
+
+@pytest.fixture
+def ws(tmp_path):
+    return Workspace(tmp_path)
+
+
+class TestDecisions:
+    """Test when stages run, get restored or are skipped."""
+
+    def test_unchanged_rerun_is_cache_hit(self, ws):
+        """A second run with nothing changed should skip the stage."""
+        assert ws.run().status == 'ran'
+        result = ws.run()
+
+        assert result.status == 'skipped'
+        assert result.reason.startswith('cache hit')
+        assert ws.calls == 1
+
+    @pytest.mark.parametrize('change, expected', [
+        (lambda ws: ws.source.write_text('bye'), 'input source.txt changed'),
+        (lambda ws: ws.code.write_text('# v2'), 'code stage_code.py changed'),
+        (lambda ws: setattr(ws, 'suffix', '?'), 'config suffix changed'),
+    ], ids=['input', 'code', 'config'])
+    def test_changes_rerun_with_explanation(self, ws, change, expected):
+        """Changing an input, the code or a config value should rerun and say which."""
+        ws.run()
+        change(ws)
+        result = ws.run()
+
+        assert result.status == 'ran'
+        assert result.details == [expected]
+
+    def test_touch_without_content_change_is_hit(self, ws):
+        """Rewriting an input with the same content shouldn't invalidate the key."""
+        ws.run()
+        ws.source.write_text('hello')
+        assert ws.run().status == 'skipped'
+
+    def test_missing_output_restored_from_cache(self, ws):
+        """A deleted output should come back from the blob store without running."""
+        ws.run()
+        ws.output.unlink()
+        result = ws.run()
+
+        assert result.status == 'restored'
+        assert ws.output.read_text() == 'HELLO!'
+        assert ws.calls == 1
+
+    def test_reverted_config_restores_earlier_outputs(self, ws):
+        """Going back to a previously seen key should restore its outputs."""
+        ws.run()
+        ws.suffix = '?'
+        ws.run()
+        ws.suffix = '!'
+        result = ws.run()
+
+        assert result.status == 'restored'
+        assert ws.output.read_text() == 'HELLO!'
+        assert ws.calls == 2
+
+    def test_hand_edited_output_reruns(self, ws):
+        """Outputs changed outside the pipeline should be rebuilt, not overwritten from cache."""
+        ws.run()
+        ws.output.write_text('edited')
+        result = ws.run()
+
+        assert result.status == 'ran'
+        assert 'differs from the cached result' in result.reason
+        assert ws.output.read_text() == 'HELLO!'
+
+    def test_force_runs_and_reports_changed(self, ws):
+        """force should run a cached stage and tell it why."""
+        ws.run()
+        result = ws.run(force=True)
+
+        assert result.status == 'ran'
+        assert result.value == {'forced'}
+
+    def test_stage_rewriting_its_inputs_converges(self, ws):
+        """A stage that normalises its input in place should be a hit on the next run."""
+        def normalise(upstream):
+            ws.source.write_text(ws.source.read_text().strip())
+            ws.output.write_text('done')
+
+        ws._run = normalise
+        ws.source.write_text('  padded  ')
+        assert ws.run().status == 'ran'
+        assert ws.run().status == 'skipped'
+
+    @pytest.mark.parametrize('step', ['decide', 'restore'])
+    def test_cache_error_fails_stage_and_blocks_dependents(self, ws, monkeypatch, step):
+        """An error from the cache should be reported like a stage error, not abort the run."""
+        ws.run()
+        ws.output.unlink()
+
+        def broken(*args, **kwargs):
+            raise OSError('disk error')
+
+        monkeypatch.setattr(ws.cache, step, broken)
+        stages = ws.stages() + [Stage('after', lambda up: pytest.fail('should be blocked'), deps=['build'])]
+        report = run_pipeline(stages, cache=ws.cache, trace_memory=False)
+
+        assert {r.name: r.status for r in report.results} == {'build': 'failed', 'after': 'blocked'}
+        assert isinstance(report.by_name['build'].error, OSError)
+        assert ws.calls == 1
+
+
+class TestExplanation:
+    """Test the --explain report."""
+
+    def test_explanation_lists_every_stage(self, ws):
+        """format_explanation() should give each stage's status and reasons."""
+        ws.run()
+        ws.source.write_text('bye')
+        report = run_pipeline(ws.stages(), cache=ws.cache, trace_memory=False)
+
+        assert report.format_explanation() == 'build: ran\n  - input source.txt changed'
+
+
+
+class TestPythonSources:
+    """Test the import closure used as a stage's code version."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        files = {
+            'scripts/entry.py': 'import json\nfrom helper import run\nfrom src.core import lib\n',
+            'scripts/helper.py': 'import pandas as pd\n',
+            'scripts/unused.py': '',
+            'src/__init__.py': '',
+            'src/core/__init__.py': '',
+            'src/core/lib.py': 'def load():\n    from .inner import value\n    return value\n',
+            'src/core/inner.py': 'value = 1\n',
+        }
+        for name, text in files.items():
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(text)
+        return tmp_path
+
+    def test_closure_follows_project_imports(self, project):
+        """Direct, package, submodule and lazy relative imports should all be followed."""
+        sources = python_sources(project / 'scripts' / 'entry.py', project_root=project)
+
+        assert [p.relative_to(project.resolve()).as_posix() for p in sources] == [
+            'scripts/entry.py', 'scripts/helper.py',
+            'src/__init__.py', 'src/core/__init__.py', 'src/core/inner.py', 'src/core/lib.py',
+        ]
+
+    def test_editing_a_dependency_reruns_the_stage(self, project):
+        """A change to a module the stage only imports indirectly should invalidate it."""
+        output = project / 'out.txt'
+        stage = Stage('build', lambda up: output.write_text('built'), outputs=lambda: [output],
+                      code=python_sources(project / 'scripts' / 'entry.py', project_root=project))
+        cache = StageCache(project / 'cache', project)
+
+        def run():
+            return run_pipeline([stage], cache=cache, trace_memory=False).by_name['build']
+
+        assert run().status == 'ran'
+        assert run().status == 'skipped'
+        (project / 'src' / 'core' / 'inner.py').write_text('value = 2\n')
+        result = run()
+
+        assert result.status == 'ran'
+        assert result.reason == 'code src/core/inner.py changed'
+
+    def test_merge_stage_covers_its_imports(self):
+        """The pipeline's merge stage should be keyed on the modules its output depends on."""
+        from main import build_stages
+        merge = next(s for s in build_stages(skip_fbref=True) if s.name == 'merge')
+        code = {p.relative_to(project_root.resolve()).as_posix() for p in merge.code}
+
+        assert {
+            'scripts/merge_data.py', 'scripts/config.py', 'scripts/pipeline_cache.py',
+            'src/core/dataset.py', 'src/core/dataset_io.py', 'src/core/dataset_tables.py',
+            'src/core/file_utils.py', 'src/core/query.py',
+        } <= code
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])